@@ -0,0 +1,197 @@
+import asyncio
+import time
+
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.metrics import METRICS
+
+logger = get_logger(__name__)
+
+REJECTION_REASON_QUEUE_FULL = "queue_full"
+REJECTION_REASON_TENANT_QUEUE_FULL = "tenant_queue_full"
+REJECTION_REASON_QUEUE_TIMEOUT = "queue_timeout"
+
+
+class AdmissionRejectedError(Exception):
+    reason: str
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Limits the concurrent database calls, globally and per tenant (DB URL hash). Calls beyond the limits wait in a
+    bounded queue served round-robin between the tenants, so a tenant flooding the server only delays its own calls.
+    Once the queue is full calls are rejected immediately instead of piling up.
+    """
+    _max_concurrency: int
+    _max_tenant_concurrency: int
+    _max_queue_size: int
+    _max_tenant_queue_size: int
+    _queue_timeout: float
+    _active: int
+    _tenant_active: dict[str, int]
+    _queues: OrderedDict[str, deque[asyncio.Future]]
+    _queued: int
+
+    def __init__(self, max_concurrency: int, max_tenant_concurrency: int, max_queue_size: int,
+                 max_tenant_queue_size: int, queue_timeout: float):
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_tenant_concurrency = max(1, min(max_tenant_concurrency, self._max_concurrency))
+        self._max_queue_size = max(0, max_queue_size)
+        self._max_tenant_queue_size = max(0, min(max_tenant_queue_size, self._max_queue_size))
+        self._queue_timeout = queue_timeout
+
+        self._active = 0
+        self._tenant_active = {}
+        self._queues = OrderedDict()
+        self._queued = 0
+
+    @property
+    def max_tenant_concurrency(self) -> int:
+        return self._max_tenant_concurrency
+
+    def get_active_calls(self) -> dict[str, int]:
+        return dict(self._tenant_active)
+
+    def get_queue_depth(self) -> dict[str, int]:
+        return {tenant_id: len(queue) for tenant_id, queue in self._queues.items()}
+
+    @asynccontextmanager
+    async def admit(self, tenant_id: str):
+        """Wait for a free slot of the tenant, raises AdmissionRejectedError when the call can't be queued in time"""
+        await self._acquire(tenant_id)
+
+        try:
+            yield
+
+        finally:
+            self._release(tenant_id)
+
+    async def _acquire(self, tenant_id: str):
+        # Slots are handed to the queued calls as soon as released, when one is free nobody eligible is waiting
+        if self._can_run(tenant_id):
+            self._grant(tenant_id)
+
+            METRICS.admission_queue_wait.observe((tenant_id,), 0)
+
+            return
+
+        queue = self._queues.get(tenant_id)
+        tenant_queued = 0 if queue is None else len(queue)
+
+        if self._queued >= self._max_queue_size:
+            self._reject(tenant_id, REJECTION_REASON_QUEUE_FULL,
+                         f"The server is busy, {self._queued:,.0f} calls are waiting, try again later")
+
+        if tenant_queued >= self._max_tenant_queue_size:
+            self._reject(tenant_id, REJECTION_REASON_TENANT_QUEUE_FULL,
+                         f"Too many concurrent calls for this database, {tenant_queued:,.0f} calls are waiting, "
+                         f"try again later")
+
+        if queue is None:
+            queue = deque()
+
+            self._queues[tenant_id] = queue
+
+        waiter = asyncio.get_running_loop().create_future()
+
+        queue.append(waiter)
+        self._queued += 1
+
+        started = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(waiter, self._queue_timeout if self._queue_timeout > 0 else None)
+
+        except (asyncio.TimeoutError, asyncio.CancelledError) as ex:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted while timing out or being cancelled, hand it to the next call
+                self._release(tenant_id)
+
+            else:
+                self._remove_waiter(tenant_id, waiter)
+
+            if isinstance(ex, asyncio.CancelledError):
+                raise
+
+            self._reject(tenant_id, REJECTION_REASON_QUEUE_TIMEOUT,
+                         f"The server is busy, the call waited {self._queue_timeout:g} seconds, try again later")
+
+        finally:
+            METRICS.admission_queue_wait.observe((tenant_id,), time.perf_counter() - started)
+
+    def _release(self, tenant_id: str):
+        self._active -= 1
+
+        tenant_active = self._tenant_active[tenant_id] - 1
+
+        if tenant_active > 0:
+            self._tenant_active[tenant_id] = tenant_active
+
+        else:
+            self._tenant_active.pop(tenant_id)
+
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to the queued calls, round-robin between the tenants"""
+        while self._active < self._max_concurrency:
+            tenant_id = next((key for key in self._queues if self._can_run(key)), None)
+
+            if tenant_id is None:
+                break
+
+            queue = self._queues[tenant_id]
+            waiter = queue.popleft()
+            self._queued -= 1
+
+            if queue:
+                # Served tenants move to the end, the others go first next time
+                self._queues.move_to_end(tenant_id)
+
+            else:
+                self._queues.pop(tenant_id)
+
+            # Cancelled (or timed out) while its task did not resume yet
+            if waiter.done():
+                continue
+
+            self._grant(tenant_id)
+
+            waiter.set_result(None)
+
+    def _can_run(self, tenant_id: str) -> bool:
+        return (
+            self._active < self._max_concurrency and
+            self._tenant_active.get(tenant_id, 0) < self._max_tenant_concurrency
+        )
+
+    def _grant(self, tenant_id: str):
+        self._active += 1
+        self._tenant_active[tenant_id] = self._tenant_active.get(tenant_id, 0) + 1
+
+    def _remove_waiter(self, tenant_id: str, waiter: asyncio.Future):
+        queue = self._queues.get(tenant_id)
+
+        if queue is None or waiter not in queue:
+            return
+
+        queue.remove(waiter)
+        self._queued -= 1
+
+        if not queue:
+            self._queues.pop(tenant_id)
+
+    def _reject(self, tenant_id: str, reason: str, message: str):
+        METRICS.admission_rejections.inc((tenant_id, reason))
+
+        logger.warning(f"Rejected database call of tenant {tenant_id}, Reason: {reason}")
+
+        raise AdmissionRejectedError(message, reason)
@@ -0,0 +1,9 @@
+import runpy
+
+
+def main():
+    """
+    Entry point of the mcp-alchemy console script (e.g. uvx, Claude Desktop). The server reads its command line
+    arguments only when it runs as the main module, the script runs it the same way as python -m mcp_alchemy.server
+    """
+    runpy.run_module("mcp_alchemy.server", run_name="__main__", alter_sys=True)
@@ -0,0 +1,215 @@
+import secrets
+import threading
+import time
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection, CursorResult
+
+logger = get_logger(__name__)
+
+# Disabled unless configured, each open cursor holds a pooled connection and its read (e.g. SQLite's shared lock
+# blocking writers of other processes, a PostgreSQL transaction blocking DDL and VACUUM)
+DEFAULT_CURSOR_TTL = 0
+DEFAULT_MAX_OPEN_CURSORS = 32
+# Each open cursor holds a pooled connection, the default pool has 1 connection and 2 more for bursts
+DEFAULT_MAX_OPEN_CURSORS_PER_TENANT = 1
+
+# Set by the worker router for each worker process, the continuation tokens name the worker holding their cursor
+WORKER_INDEX_ENV_VAR = "MCP_ALCHEMY_WORKER_INDEX"
+TOKEN_WORKER_SEPARATOR = "."
+
+
+class OpenCursor:
+    """A truncated query result kept open, together with the pooled connection it runs on"""
+    connection_id: str
+    connection: "Connection"
+    cursor: "CursorResult"
+    pending_rows: list
+    row_offset: int
+    output_format: str
+    expires_at: float
+
+    def __init__(self, connection_id: str, connection: "Connection", cursor: "CursorResult", pending_rows: list,
+                 row_offset: int, output_format: str):
+        self.connection_id = connection_id
+        self.connection = connection
+        self.cursor = cursor
+        self.pending_rows = pending_rows
+        self.row_offset = row_offset
+        self.output_format = output_format
+        self.expires_at = 0
+
+    def close(self):
+        from mcp_alchemy.database_context import DatabaseContext
+
+        try:
+            self.cursor.close()
+
+            DatabaseContext.close_connection(self.connection)
+
+        except Exception as ex:
+            logger.warning(f"Failed to close cursor, Error: {ex}")
+
+
+class CursorStore:
+    """
+    Keeps truncated results open for a short time so the next rows can be fetched without running the query again,
+    the least recently used cursors are closed once the limit of open cursors (and pooled connections held) is reached
+    """
+    _lock: threading.Lock
+    _open_cursors: OrderedDict[str, OpenCursor]
+    ttl: int
+    max_open_cursors: int
+    max_open_cursors_per_tenant: int
+    token_prefix: str
+
+    def __init__(self,
+                 ttl: int = DEFAULT_CURSOR_TTL,
+                 max_open_cursors: int = DEFAULT_MAX_OPEN_CURSORS,
+                 max_open_cursors_per_tenant: int = DEFAULT_MAX_OPEN_CURSORS_PER_TENANT):
+        self._lock = threading.Lock()
+        self._open_cursors = OrderedDict()
+
+        self.ttl = ttl
+        self.max_open_cursors = max_open_cursors
+        self.max_open_cursors_per_tenant = max_open_cursors_per_tenant
+        self.token_prefix = ""
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.ttl > 0 and self.max_open_cursors > 0 and self.max_open_cursors_per_tenant > 0
+
+    def configure(self, ttl: int, max_open_cursors: int, max_open_cursors_per_tenant: int,
+                  worker_index: str | None = None):
+        self.ttl = ttl
+        self.max_open_cursors = max_open_cursors
+        self.max_open_cursors_per_tenant = max_open_cursors_per_tenant
+        self.token_prefix = "" if worker_index is None else f"{int(worker_index)}{TOKEN_WORKER_SEPARATOR}"
+
+    def add(self, open_cursor: OpenCursor, token: str | None = None) -> str:
+        """Store an open cursor, returns the continuation token to fetch more rows with"""
+        token = f"{self.token_prefix}{secrets.token_urlsafe(16)}" if token is None else token
+
+        open_cursor.expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._open_cursors[token] = open_cursor
+
+            tenant_tokens = [
+                tenant_token
+                for tenant_token, tenant_cursor in self._open_cursors.items()
+                if tenant_cursor.connection_id == open_cursor.connection_id
+            ]
+
+            evicted_tokens = tenant_tokens[:max(len(tenant_tokens) - self.max_open_cursors_per_tenant, 0)]
+
+            evicted_cursors = [
+                self._open_cursors.pop(evicted_token)
+                for evicted_token in evicted_tokens
+            ]
+
+            while len(self._open_cursors) > self.max_open_cursors:
+                _, evicted_cursor = self._open_cursors.popitem(last=False)
+
+                evicted_cursors.append(evicted_cursor)
+
+        for evicted_cursor in evicted_cursors:
+            evicted_cursor.close()
+
+        if evicted_cursors:
+            logger.info(f"Closed {len(evicted_cursors):,.0f} least recently used cursors, open cursors limit reached")
+
+        return token
+
+    def pop(self, token: str, connection_id: str) -> OpenCursor | None:
+        """Take an open cursor out of the store, only the tenant that opened it can use it"""
+        with self._lock:
+            open_cursor = self._open_cursors.get(token)
+
+            if open_cursor is None or open_cursor.connection_id != connection_id:
+                return None
+
+            del self._open_cursors[token]
+
+        if open_cursor.expires_at <= time.monotonic():
+            open_cursor.close()
+
+            return None
+
+        return open_cursor
+
+    def close_tenant(self, connection_id: str) -> int:
+        """Close the open cursors of a tenant, their reads would block its writes (e.g. SQLite locks, DDL locks)"""
+        with self._lock:
+            tenant_tokens = [
+                token
+                for token, open_cursor in self._open_cursors.items()
+                if open_cursor.connection_id == connection_id
+            ]
+
+            tenant_cursors = [
+                self._open_cursors.pop(token)
+                for token in tenant_tokens
+            ]
+
+        for open_cursor in tenant_cursors:
+            open_cursor.close()
+
+        return len(tenant_cursors)
+
+    def close_expired(self) -> int:
+        now = time.monotonic()
+
+        with self._lock:
+            expired_tokens = [
+                token
+                for token, open_cursor in self._open_cursors.items()
+                if open_cursor.expires_at <= now
+            ]
+
+            expired_cursors = [
+                self._open_cursors.pop(token)
+                for token in expired_tokens
+            ]
+
+        for open_cursor in expired_cursors:
+            open_cursor.close()
+
+        return len(expired_cursors)
+
+    def close_all(self):
+        with self._lock:
+            open_cursors = list(self._open_cursors.values())
+
+            self._open_cursors.clear()
+
+        for open_cursor in open_cursors:
+            open_cursor.close()
+
+    def run_expiry(self, stop_event: threading.Event):
+        """Close expired cursors so their connections return to the pool, even when no more requests arrive"""
+        while not stop_event.wait(max(1, self.ttl // 4)):
+            expired = self.close_expired()
+
+            if expired:
+                logger.info(f"Closed {expired:,.0f} expired cursors")
+
+        self.close_all()
+
+
+def get_token_worker_index(token: str) -> int | None:
+    """Index of the worker process holding the cursor of a continuation token, None for a single process server"""
+    worker_index, separator, _ = token.partition(TOKEN_WORKER_SEPARATOR)
+
+    if not separator or not worker_index.isdigit():
+        return None
+
+    return int(worker_index)
+
+
+CURSOR_STORE = CursorStore()
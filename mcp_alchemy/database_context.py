@@ -1,67 +1,229 @@
-import re
+import hashlib
+import threading
 import time
 
 from mcp.server.fastmcp.utilities.logging import get_logger
-from sqlalchemy import Connection, create_engine, text, inspect
-from sqlalchemy.engine import make_url
+from sqlalchemy import Connection, Engine, create_engine, func, inspect, select, text
+from sqlalchemy.engine import Inspector, make_url
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.exc import NoSuchTableError
+
+from mcp_alchemy.foreign_key_graph import ForeignKeyGraph
+from mcp_alchemy.metadata_cache import MetadataCache
+from mcp_alchemy.pool_manager import POOL_MANAGER, ManagedPool
+from mcp_alchemy.query_classifier import is_read_only_query
+from mcp_alchemy.schema_change_tracker import SchemaChangeTracker
+from mcp_alchemy.schema_snapshot import (
+    SCHEMA_SNAPSHOT_STORE,
+    SNAPSHOT_KEY_TABLE_CATALOG,
+    SNAPSHOT_KEY_TABLE_NAMES,
+    SchemaSnapshot,
+    get_table_schema_key,
+    get_table_stamp_key
+)
+from mcp_alchemy.serialization import dumps
+from mcp_alchemy.table_catalog import TableCatalog, get_qualified_name
 
 logger = get_logger(__name__)
 
-DISPOSE_UNUSED_CONNECTION_INTERVAL = 60 * 10
+CACHE_KEY_TABLE_NAMES = "table_names"
+CACHE_KEY_TABLE_SCHEMA = "table_schema"
+CACHE_KEY_FOREIGN_KEY_GRAPH = "foreign_key_graph"
+
+# Set on connections of autocommit tenants that stream in a transaction, committed before they are returned
+CONNECTION_INFO_STREAMING_TRANSACTION = "mcp_alchemy_streaming_transaction"
+
+# Tables reflected at once while validating a schema snapshot
+SNAPSHOT_VALIDATION_BATCH_SIZE = 500
+
+# Schemas of the database itself, not part of the table catalog
+SYSTEM_SCHEMAS = {
+    "information_schema", "pg_catalog", "pg_toast", "mysql", "performance_schema", "sys", "sysibm", "syscat",
+    "sysstat", "system", "ctxsys", "mdsys", "olapsys", "ordsys", "outln", "xdb", "wmsys", "dbsnmp", "appqossys",
+    "audsys", "gsmadmin_internal", "lbacsys", "ojvmsys", "dvsys", "anonymous", "db_accessadmin", "db_backupoperator",
+    "db_datareader", "db_datawriter", "db_ddladmin", "db_denydatareader", "db_denydatawriter", "db_owner",
+    "db_securityadmin", "guest"
+}
 
 
 class DatabaseContext:
-    connection: Connection | None
+    engine: Engine
+    metadata_cache: MetadataCache
+    table_catalog: TableCatalog
+    schema_change_tracker: SchemaChangeTracker
+    connection_id: str
+    schema_snapshot: SchemaSnapshot | None
+    managed_pool: ManagedPool | None
 
-    def __init__(self, db_url: str, db_engine_options: dict):
+    def __init__(self, db_url: str, db_engine_options: dict, metadata_cache: MetadataCache | None = None):
         self._db_url = db_url
         self._db_engine_options = db_engine_options
 
-        self.connection = self._get_connection()
-        self.last_used = 0
+        self.connection_id = str(hashlib.md5(db_url.encode()).hexdigest())
+
+        self.metadata_cache = MetadataCache() if metadata_cache is None else metadata_cache
+
+        self.table_catalog = TableCatalog(self._load_table_catalog, self.metadata_cache.ttl)
+        self.schema_change_tracker = SchemaChangeTracker()
+
+        self.schema_snapshot = None
+        self._schema_snapshot_lock = threading.Lock()
+        self._schema_snapshot_loaded = False
+
+        self.engine = self._create_engine()
+        self.managed_pool = POOL_MANAGER.register(self.connection_id, self.engine)
+        self.last_used = time.monotonic()
 
     def mark_as_used(self):
-        self.last_used = time.time()
+        self.last_used = time.monotonic()
+
+    def get_idle_deadline(self, idle_timeout: int) -> float:
+        return self.last_used + idle_timeout
+
+    def is_in_use(self) -> bool:
+        # Not all pool implementations (e.g. NullPool, StaticPool) track checked out connections
+        checked_out = getattr(self.engine.pool, "checkedout", None)
 
-    def should_close(self):
-        now = time.time()
+        return checked_out is not None and checked_out() > 0
 
-        should_close_connection = now - self.last_used >= DISPOSE_UNUSED_CONNECTION_INTERVAL
+    def get_pool_statistics(self) -> dict:
+        pool = self.engine.pool
 
-        return should_close_connection
+        # Not all pool implementations (e.g. NullPool, StaticPool) have a size
+        checked_out = getattr(pool, "checkedout", None)
+        size = getattr(pool, "size", None)
 
-    def _get_connection(self) -> Connection:
+        pool_statistics = {
+            "checked_out": 0 if checked_out is None else checked_out(),
+            "size": 0 if size is None else size()
+        }
+
+        return pool_statistics
+
+    def _create_engine(self) -> Engine:
         try:
             db_conn_str = make_url(self._db_url)
-            
+
             masked_db_url = str(db_conn_str.set(password="********"))
-            
-            logger.info(f"Creating connection to: {masked_db_url}, Options: {self._db_engine_options}")
-                
-            engine = create_engine(self._db_url, **self._db_engine_options)
-            connection = engine.connect()
 
-            logger.info("Connected")
+            engine_options = POOL_MANAGER.get_engine_options(self._db_engine_options)
 
-            return connection
+            logger.info(f"Creating engine for: {masked_db_url}, Options: {engine_options}")
+
+            engine = create_engine(self._db_url, **engine_options)
+
+            return engine
 
         except Exception as ex:
-            logger.error(f"Failed to get database connection, Error: {ex}")
+            logger.error(f"Failed to create database engine, Error: {ex}")
 
             raise ex
 
-    def is_connected(self):
-        return self.connection and not self.connection.closed and self.connection.connection.is_valid
+    def connect(self) -> Connection:
+        """Check out a pooled connection, should be used as a context manager to return it to the pool"""
+        if self.managed_pool is None:
+            return self.engine.connect()
+
+        # The pool manager sizes the pool from the checkouts that had to wait
+        saturated = self.managed_pool.is_saturated()
+        started = time.perf_counter()
+
+        try:
+            return self.engine.connect()
+
+        finally:
+            self.managed_pool.record_checkout(time.perf_counter() - started, saturated)
+
+    def dispose(self):
+        POOL_MANAGER.unregister(self.managed_pool)
 
-    def execute_query(self, query, params):
-        cursor = self.connection.execute(text(query), params)
+        self.engine.dispose()
+
+    @staticmethod
+    def execute_query(connection: Connection, query, params, batch_size: int | None = None,
+                      is_shared_connection: bool = False):
+        execution_options = {}
+
+        # Server side cursors keep the memory flat, only a batch of rows is loaded into the client at once
+        if batch_size is not None and DatabaseContext._prepare_streaming(connection, query, is_shared_connection):
+            execution_options = {
+                "stream_results": True,
+                "yield_per": batch_size
+            }
+
+        cursor = connection.execute(text(query), params, execution_options=execution_options)
 
         return cursor
 
+    @staticmethod
+    def _prepare_streaming(connection: Connection, query, is_shared_connection: bool) -> bool:
+        """
+        Whether the rows of the query can be streamed through a server side cursor, only read-only queries are.
+        PostgreSQL declares the cursor within a transaction block, an autocommit connection (the default isolation
+        level) reads in a transaction that close_connection commits, functions called by the query might write.
+        """
+        if not connection.dialect.supports_server_side_cursors or not is_read_only_query(query):
+            return False
+
+        if connection.dialect.name != "postgresql":
+            return True
+
+        # psycopg2, psycopg and pg8000 connections report their autocommit mode
+        if not getattr(connection.connection.dbapi_connection, "autocommit", False):
+            return True
+
+        # The statements of a batch share the connection, the ones following the query must still be committed
+        if is_shared_connection:
+            return False
+
+        # Nothing was written in autocommit mode, it only ends the transaction SQLAlchemy began (e.g. SET statements)
+        if connection.in_transaction():
+            connection.commit()
+
+        connection.execution_options(isolation_level=connection.default_isolation_level or "READ COMMITTED")
+
+        connection.info[CONNECTION_INFO_STREAMING_TRANSACTION] = True
+
+        return True
+
+    @staticmethod
+    def close_connection(connection: Connection):
+        """
+        Return a connection to the pool, the transaction of a streamed query of an autocommit tenant is committed
+        rather than rolled back, as the query would have been without streaming
+        """
+        try:
+            if connection.info.pop(CONNECTION_INFO_STREAMING_TRANSACTION, False) and connection.in_transaction():
+                connection.commit()
+
+        finally:
+            connection.close()
+
+    @staticmethod
+    def count_query_rows(connection: Connection, query, params) -> int:
+        """Count the rows of a query by wrapping it as a subquery, compiled per dialect"""
+        subquery = text(query.strip().rstrip(";")).columns().subquery()
+
+        count_statement = select(func.count()).select_from(subquery)
+
+        total_rows = connection.execute(count_statement, params).scalar_one()
+
+        return total_rows
+
     def get_tables(self, filter_query: str | None = None) -> list[str]:
-        inspector = inspect(self.connection)
+        self._load_schema_snapshot()
 
-        all_tables = inspector.get_table_names()
+        all_tables = self.metadata_cache.get(CACHE_KEY_TABLE_NAMES)
+
+        if all_tables is None:
+            with self.connect() as connection:
+                inspector = inspect(connection)
+
+                all_tables = inspector.get_table_names()
+
+            self.metadata_cache.set(CACHE_KEY_TABLE_NAMES, all_tables)
+
+            self._save_schema_snapshot({SNAPSHOT_KEY_TABLE_NAMES: all_tables})
 
         filtered_tables = [
             table_name
@@ -71,31 +233,517 @@ class DatabaseContext:
 
         return filtered_tables
 
+    def search_tables(self, query: str, limit: int | None = None, fuzzy: bool = False) -> tuple[list[str], int]:
+        """Tables of all schemas containing the query, and the number of matches before the limit"""
+        self._load_schema_snapshot()
+
+        return self.table_catalog.search(query, limit, fuzzy)
+
+    def invalidate_metadata(self):
+        self.metadata_cache.invalidate()
+        self.table_catalog.invalidate()
+        self.schema_change_tracker.clear()
+
+        if self.schema_snapshot is not None:
+            self.schema_snapshot.clear()
+
+    def _load_schema_snapshot(self):
+        """Serve the metadata of the snapshot saved by a previous process, validated in the background"""
+        if self._schema_snapshot_loaded:
+            return
+
+        with self._schema_snapshot_lock:
+            if self._schema_snapshot_loaded:
+                return
+
+            self._schema_snapshot_loaded = True
+
+            # Without the metadata cache all metadata is reflected on every call, the snapshot would never be used
+            if not self.metadata_cache.is_enabled:
+                return
+
+            self.schema_snapshot = SCHEMA_SNAPSHOT_STORE.get_snapshot(self.connection_id)
+
+            if self.schema_snapshot is None:
+                return
+
+            try:
+                table_names = self.schema_snapshot.get(SNAPSHOT_KEY_TABLE_NAMES)
+                tables = self.schema_snapshot.get(SNAPSHOT_KEY_TABLE_CATALOG)
+
+                # The newest entry of the metadata cache is kept for the table names
+                table_schemas = self.schema_snapshot.get_table_schemas(self.metadata_cache.max_size - 1)
+                table_stamps = self.schema_snapshot.get_table_stamps(list(table_schemas.keys()))
+
+            except Exception as ex:
+                logger.warning(f"Failed to load the schema snapshot {self.schema_snapshot.path}, Error: {ex}")
+
+                return
+
+        if table_names is not None:
+            self.metadata_cache.set(CACHE_KEY_TABLE_NAMES, table_names)
+
+        if tables is not None:
+            self.table_catalog.seed([(schema, table_name) for schema, table_name in tables])
+
+        table_schemas = {
+            table_name: self._get_loaded_table_schema(table_schema)
+            for table_name, table_schema in table_schemas.items()
+        }
+
+        for table_name, table_schema in table_schemas.items():
+            self.metadata_cache.set((CACHE_KEY_TABLE_SCHEMA, table_name), table_schema)
+
+        logger.info(f"Schema snapshot loaded, Tables: {len(table_schemas):,.0f}, Path: {self.schema_snapshot.path}")
+
+        if table_names is not None or table_schemas:
+            threading.Thread(
+                target=self._validate_schema_snapshot,
+                args=(table_names, table_schemas, table_stamps),
+                daemon=True,
+                name="mcp-alchemy-schema-snapshot"
+            ).start()
+
+    def _validate_schema_snapshot(self, table_names: list[str] | None, table_schemas: dict[str, dict],
+                                  table_stamps: dict[str, str]):
+        """
+        Compare the snapshot with the database, changed metadata replaces the one served from the snapshot.
+        Tables whose change stamp is the one saved with their schema are not reflected again.
+        """
+        started = time.perf_counter()
+
+        changed_entries = {}
+        stamp_entries = {}
+        reflected_count = 0
+
+        try:
+            with self.connect() as connection:
+                inspector = inspect(connection)
+
+                if table_names is not None:
+                    live_table_names = inspector.get_table_names()
+
+                    if live_table_names != table_names:
+                        self.metadata_cache.set(CACHE_KEY_TABLE_NAMES, live_table_names)
+
+                        changed_entries[SNAPSHOT_KEY_TABLE_NAMES] = live_table_names
+
+                snapshot_table_names = list(table_schemas.keys())
+
+                for index in range(0, len(snapshot_table_names), SNAPSHOT_VALIDATION_BATCH_SIZE):
+                    batch_table_names = snapshot_table_names[index:index + SNAPSHOT_VALIDATION_BATCH_SIZE]
+
+                    table_keys = {
+                        table_name: self._get_table_key(table_name)
+                        for table_name in batch_table_names
+                    }
+
+                    live_stamps = self.schema_change_tracker.get_stamps(connection, table_keys) or {}
+
+                    changed_table_keys = {
+                        table_name: table_key
+                        for table_name, table_key in table_keys.items()
+                        if table_name not in live_stamps or live_stamps[table_name] != table_stamps.get(table_name)
+                    }
+
+                    self.schema_change_tracker.record(live_stamps)
+
+                    stamp_entries.update({
+                        get_table_stamp_key(table_name): live_stamps[table_name]
+                        for table_name in changed_table_keys
+                        if table_name in live_stamps
+                    })
+
+                    if not changed_table_keys:
+                        continue
+
+                    live_table_schemas = self._reflect_table_schemas(inspector, changed_table_keys)
+
+                    reflected_count += len(live_table_schemas)
+
+                    for table_name, live_table_schema in live_table_schemas.items():
+                        snapshot_table_schema = self._get_snapshot_table_schema(live_table_schema)
+
+                        if dumps(snapshot_table_schema, sort_keys=True) == dumps(
+                            self._get_snapshot_table_schema(table_schemas[table_name]), sort_keys=True
+                        ):
+                            continue
+
+                        self.metadata_cache.set((CACHE_KEY_TABLE_SCHEMA, table_name), live_table_schema)
+
+                        changed_entries[get_table_schema_key(table_name)] = snapshot_table_schema
+
+        except Exception as ex:
+            logger.warning(f"Failed to validate the schema snapshot, Error: {ex}")
+
+            return
+
+        self.schema_snapshot.save({**changed_entries, **stamp_entries})
+
+        duration = time.perf_counter() - started
+
+        logger.info(f"Schema snapshot validated, Reflected tables: {reflected_count:,.0f}, "
+                    f"Changed entries: {len(changed_entries):,.0f}, Duration (seconds): {duration:,.3f}")
+
+    def _save_schema_snapshot(self, entries: dict):
+        if self.schema_snapshot is not None:
+            self.schema_snapshot.save(entries)
+
+    @staticmethod
+    def _get_snapshot_table_schema(table_schema: dict) -> dict:
+        """Primary keys are a set, sorted they compare equal between processes"""
+        if "primary_keys" not in table_schema:
+            return table_schema
+
+        return {**table_schema, "primary_keys": sorted(table_schema["primary_keys"])}
+
+    @staticmethod
+    def _get_loaded_table_schema(table_schema: dict) -> dict:
+        """Schema of the snapshot in the shape of a reflected one, primary keys are a set again"""
+        if "primary_keys" not in table_schema:
+            return table_schema
+
+        return {**table_schema, "primary_keys": set(table_schema["primary_keys"])}
+
+    def _load_table_catalog(self) -> list[tuple[str | None, str]]:
+        tables = []
+
+        with self.connect() as connection:
+            inspector = inspect(connection)
+
+            default_schema = inspector.default_schema_name
+
+            tables.extend((None, table_name) for table_name in inspector.get_table_names())
+
+            for schema in inspector.get_schema_names():
+                if schema == default_schema or schema.lower() in SYSTEM_SCHEMAS or schema.startswith("pg_"):
+                    continue
+
+                try:
+                    tables.extend((schema, table_name) for table_name in inspector.get_table_names(schema=schema))
+
+                except Exception as ex:
+                    logger.warning(f"Failed to list the tables of schema {schema}, Error: {ex}")
+
+        self._save_schema_snapshot({SNAPSHOT_KEY_TABLE_CATALOG: tables})
+
+        return tables
+
+    def get_foreign_key_graph(self) -> ForeignKeyGraph:
+        self._load_schema_snapshot()
+
+        foreign_key_graph = self.metadata_cache.get(CACHE_KEY_FOREIGN_KEY_GRAPH)
+
+        if foreign_key_graph is None:
+            foreign_key_graph = self._load_foreign_key_graph()
+
+            self.metadata_cache.set(CACHE_KEY_FOREIGN_KEY_GRAPH, foreign_key_graph)
+
+        return foreign_key_graph
+
+    def _load_foreign_key_graph(self) -> ForeignKeyGraph:
+        """Foreign keys of all tables of the catalog, a few catalog queries per schema with bulk reflection"""
+        started = time.perf_counter()
+
+        catalog_index = self.table_catalog.get_index()
+
+        schema_table_names = {}
+
+        for table_name, (schema, name) in catalog_index.tables.items():
+            schema_table_names.setdefault(schema, {})[name] = table_name
+
+        foreign_keys = []
+
+        with self.connect() as connection:
+            inspector = inspect(connection)
+
+            default_schema = inspector.default_schema_name
+
+            for schema, table_names in schema_table_names.items():
+                try:
+                    schema_foreign_keys = self._reflect_foreign_keys(inspector, schema, list(table_names.keys()))
+
+                except Exception as ex:
+                    if schema is None:
+                        raise
+
+                    logger.warning(f"Failed to reflect the foreign keys of schema {schema}, Error: {ex}")
+
+                    continue
+
+                for name, table_foreign_keys in schema_foreign_keys.items():
+                    if name not in table_names:
+                        continue
+
+                    for foreign_key in table_foreign_keys:
+                        referred_schema = foreign_key.get("referred_schema")
+
+                        if referred_schema == default_schema:
+                            referred_schema = None
+
+                        referred_table = get_qualified_name(referred_schema, foreign_key["referred_table"])
+
+                        # Some dialects omit the schema of tables referred within the same schema
+                        if referred_table not in catalog_index.tables and referred_schema is None:
+                            referred_table = get_qualified_name(schema, foreign_key["referred_table"])
+
+                        foreign_keys.append({
+                            "table": table_names[name],
+                            "columns": foreign_key["constrained_columns"],
+                            "referred_table": referred_table,
+                            "referred_columns": foreign_key["referred_columns"]
+                        })
+
+        foreign_key_graph = ForeignKeyGraph(catalog_index.names, foreign_keys)
+
+        duration = time.perf_counter() - started
+
+        logger.info(f"Foreign key graph loaded, Tables: {len(foreign_key_graph.tables):,.0f}, "
+                    f"Foreign keys: {len(foreign_keys):,.0f}, Duration (seconds): {duration:,.3f}")
+
+        return foreign_key_graph
+
+    @staticmethod
+    def _reflect_foreign_keys(inspector: Inspector, schema: str | None, table_names: list[str]) -> dict[str, list]:
+        try:
+            # All tables of the schema, filtering a large catalog would send every name to the database
+            multi_foreign_keys = inspector.get_multi_foreign_keys(schema=schema, kind=ObjectKind.TABLE)
+
+            schema_foreign_keys = {name: foreign_keys for (_, name), foreign_keys in multi_foreign_keys.items()}
+
+        except NotImplementedError:
+            schema_foreign_keys = {
+                table_name: inspector.get_foreign_keys(table_name, schema=schema)
+                for table_name in table_names
+            }
+
+        return schema_foreign_keys
+
+    def _get_table_key(self, table_name: str) -> tuple[str | None, str]:
+        """Schema and name of a table, names of tables beyond the default schema are qualified (schema.table)"""
+        table_key = self.table_catalog.get_table(table_name)
+
+        if table_key is None:
+            schema, separator, name = table_name.partition(".")
+
+            table_key = (schema, name) if separator and schema and name else (None, table_name)
+
+        return table_key
+
     def get_schema_details(self, table_names: list[str]):
-        inspector = inspect(self.connection)
-        table_schema_list = []
-
-        for table_name in table_names:
-            columns = inspector.get_columns(table_name)
-            
-            data = {
-                "name": table_name,
-                "found": len(columns) > 0
+        """
+        Schemas of the tables in the order of their names (name, found, columns, primary_keys, foreign_keys).
+        Column types are their SQL text and primary keys a set, whether reflected or served from the schema snapshot
+        """
+        self._load_schema_snapshot()
+
+        table_schemas = {
+            table_name: self.metadata_cache.get((CACHE_KEY_TABLE_SCHEMA, table_name))
+            for table_name in table_names
+        }
+
+        missing_table_names = [
+            table_name
+            for table_name, table_schema in table_schemas.items()
+            if table_schema is None
+        ]
+
+        if missing_table_names:
+            table_keys = {
+                table_name: self._get_table_key(table_name)
+                for table_name in missing_table_names
+            }
+
+            reflected_table_schemas = {}
+
+            with self.connect() as connection:
+                # Stamps are read before reflecting, a change in between is detected by the next refresh
+                stamps = self.schema_change_tracker.get_stamps(connection, table_keys)
+
+                changed_table_keys = self._renew_unchanged_table_schemas(table_keys, stamps, table_schemas)
+
+                if changed_table_keys:
+                    reflected_table_schemas = self._reflect_table_schemas(inspect(connection), changed_table_keys)
+
+            for table_name, table_schema in reflected_table_schemas.items():
+                self.metadata_cache.set((CACHE_KEY_TABLE_SCHEMA, table_name), table_schema)
+
+                table_schemas[table_name] = table_schema
+
+            snapshot_entries = {
+                get_table_schema_key(table_name): self._get_snapshot_table_schema(table_schema)
+                for table_name, table_schema in reflected_table_schemas.items()
             }
-            
-            if len(columns) > 0:
-                foreign_keys = inspector.get_foreign_keys(table_name)
-                pk_constraint = inspector.get_pk_constraint(table_name)
-                primary_keys = set(pk_constraint["constrained_columns"])
-
-                found_data = {
-                    "columns": columns,
-                    "foreign_keys": foreign_keys,
-                    "primary_keys": primary_keys
-                }
-                
-                data.update(found_data)
-
-            table_schema_list.append(data)
+
+            if stamps is not None:
+                snapshot_entries.update({
+                    get_table_stamp_key(table_name): stamps[table_name]
+                    for table_name in reflected_table_schemas
+                    if table_name in stamps
+                })
+
+            self._save_schema_snapshot(snapshot_entries)
+
+        table_schema_list = [
+            table_schemas[table_name]
+            for table_name in table_names
+        ]
 
         return table_schema_list
+
+    def _renew_unchanged_table_schemas(self, table_keys: dict[str, tuple[str | None, str]],
+                                       stamps: dict[str, str] | None,
+                                       table_schemas: dict[str, dict | None]) -> dict[str, tuple[str | None, str]]:
+        """Renew the expired schemas of tables whose change stamp did not change, returns the tables to reflect"""
+        if stamps is None:
+            return table_keys
+
+        changed_table_keys = {}
+
+        for table_name, table_key in table_keys.items():
+            cache_key = (CACHE_KEY_TABLE_SCHEMA, table_name)
+            stamp = stamps.get(table_name)
+
+            table_schema = None
+
+            if (
+                stamp is not None and
+                stamp == self.schema_change_tracker.get_recorded_stamp(table_name) and
+                self.metadata_cache.get_expired(cache_key) is not None
+            ):
+                # None when evicted meanwhile
+                table_schema = self.metadata_cache.renew(cache_key)
+
+            if table_schema is None:
+                changed_table_keys[table_name] = table_key
+
+            else:
+                table_schemas[table_name] = table_schema
+
+        self.schema_change_tracker.record(stamps)
+
+        renewed_count = len(table_keys) - len(changed_table_keys)
+
+        if renewed_count > 0:
+            logger.info(f"Renewed {renewed_count:,.0f} unchanged table schemas, "
+                        f"Reflecting {len(changed_table_keys):,.0f} tables")
+
+        return changed_table_keys
+
+    @classmethod
+    def _reflect_table_schemas(cls, inspector: Inspector,
+                               table_keys: dict[str, tuple[str | None, str]]) -> dict[str, dict]:
+        try:
+            table_schemas = cls._reflect_table_schemas_bulk(inspector, table_keys)
+
+        except NotImplementedError:
+            logger.debug(f"Bulk reflection is not supported by dialect {inspector.dialect.name}, reflecting per table")
+
+            table_schemas = {
+                table_name: cls._reflect_table_schema(inspector, table_name, table_key)
+                for table_name, table_key in table_keys.items()
+            }
+
+        return table_schemas
+
+    @classmethod
+    def _reflect_table_schemas_bulk(cls, inspector: Inspector,
+                                    table_keys: dict[str, tuple[str | None, str]]) -> dict[str, dict]:
+        """Reflect all tables at once, a few catalog queries per schema on dialects such as PostgreSQL and Oracle"""
+        schema_table_names = {}
+
+        for schema, name in table_keys.values():
+            schema_table_names.setdefault(schema, []).append(name)
+
+        all_columns = {}
+        all_foreign_keys = {}
+        all_pk_constraints = {}
+
+        for schema, names in schema_table_names.items():
+            try:
+                columns = inspector.get_multi_columns(schema=schema, filter_names=names, kind=ObjectKind.ANY)
+                foreign_keys = inspector.get_multi_foreign_keys(schema=schema, filter_names=names, kind=ObjectKind.ANY)
+                pk_constraints = inspector.get_multi_pk_constraint(
+                    schema=schema, filter_names=names, kind=ObjectKind.ANY
+                )
+
+            except NotImplementedError:
+                raise
+
+            # e.g. an unknown schema, its tables are reported as not found
+            except Exception as ex:
+                if schema is None:
+                    raise
+
+                logger.warning(f"Failed to reflect tables of schema {schema}, Error: {ex}")
+
+                continue
+
+            all_columns.update(columns)
+            all_foreign_keys.update(foreign_keys)
+            all_pk_constraints.update(pk_constraints)
+
+        table_schemas = {}
+
+        for table_name, table_key in table_keys.items():
+            table_schemas[table_name] = cls._get_table_schema(
+                table_name,
+                all_columns.get(table_key, []),
+                all_foreign_keys.get(table_key, []),
+                all_pk_constraints.get(table_key, {})
+            )
+
+        return table_schemas
+
+    @classmethod
+    def _reflect_table_schema(cls, inspector: Inspector, table_name: str, table_key: tuple[str | None, str]) -> dict:
+        schema, name = table_key
+
+        try:
+            columns = inspector.get_columns(name, schema=schema)
+
+        except NoSuchTableError:
+            columns = []
+
+        except Exception as ex:
+            # e.g. an unknown schema
+            if schema is None:
+                raise
+
+            logger.warning(f"Failed to reflect table {table_name}, Error: {ex}")
+
+            columns = []
+
+        foreign_keys = []
+        pk_constraint = {}
+
+        if len(columns) > 0:
+            foreign_keys = inspector.get_foreign_keys(name, schema=schema)
+            pk_constraint = inspector.get_pk_constraint(name, schema=schema)
+
+        table_schema = cls._get_table_schema(table_name, columns, foreign_keys, pk_constraint)
+
+        return table_schema
+
+    @staticmethod
+    def _get_table_schema(table_name: str, columns: list, foreign_keys: list, pk_constraint: dict) -> dict:
+        data = {
+            "name": table_name,
+            "found": len(columns) > 0
+        }
+
+        if len(columns) > 0:
+            primary_keys = set(pk_constraint.get("constrained_columns") or [])
+
+            # The SQL text of the types, as the schema snapshot stores them
+            columns = [{**column, "type": str(column["type"])} for column in columns]
+
+            found_data = {
+                "columns": columns,
+                "foreign_keys": foreign_keys,
+                "primary_keys": primary_keys
+            }
+
+            data.update(found_data)
+
+        return data
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.admission_controller import AdmissionController
+
+logger = get_logger(__name__)
+
+
+class DatabaseExecutor:
+    """Runs blocking database work on a bounded thread pool, admitted by the admission controller"""
+    _executor: ThreadPoolExecutor
+    _admission_controller: AdmissionController
+
+    def __init__(self, max_workers: int, admission_controller: AdmissionController):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-alchemy-db")
+        self._admission_controller = admission_controller
+
+    async def run(self, tenant_id: str, func: Callable[..., Any], *args,
+                  on_cancel: Callable[[], None] | None = None, **kwargs) -> Any:
+        """Run func on a worker thread, on_cancel is called when the awaiting task is cancelled (e.g. disconnect)"""
+        async with self._admission_controller.admit(tenant_id):
+            loop = asyncio.get_running_loop()
+
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+            try:
+                result = await asyncio.shield(future)
+
+            except asyncio.CancelledError:
+                # The worker thread can't be interrupted, the work it runs has to be stopped instead. Cancelling
+                # might block (e.g. MySQL kills the statement from another connection), never on the event loop
+                if on_cancel is not None:
+                    threading.Thread(target=on_cancel, name="mcp-alchemy-db-cancel", daemon=True).start()
+
+                # The worker thread runs until the work stopped, its admission slot is only released once it returned
+                await self._wait_for_worker(future)
+
+                raise
+
+        return result
+
+    @staticmethod
+    async def _wait_for_worker(future: asyncio.Future):
+        await asyncio.wait([future])
+
+        # The result of cancelled work is not used, its error (e.g. the cancelled statement) was logged by it
+        if not future.cancelled():
+            future.exception()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
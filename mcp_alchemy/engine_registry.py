@@ -0,0 +1,205 @@
+import hashlib
+import heapq
+import json
+import threading
+import time
+
+from typing import TYPE_CHECKING, Mapping
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.metadata_cache import MetadataCache, DEFAULT_METADATA_CACHE_TTL, DEFAULT_METADATA_CACHE_MAX_SIZE
+
+if TYPE_CHECKING:
+    from mcp_alchemy.database_context import DatabaseContext
+
+logger = get_logger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 600
+
+
+class EngineRegistry:
+    """Keeps a single engine (and its connection pool) per DB URL and engine options"""
+    _lock: threading.Lock
+    _reaper_condition: threading.Condition
+    _database_contexts: dict[str, "DatabaseContext"]
+    _idle_deadlines: list[tuple[float, str]]
+    _hits: int
+    _misses: int
+    _creations: int
+    _disposals: int
+    metadata_cache_ttl: int
+    metadata_cache_max_size: int
+    idle_timeout: int
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reaper_condition = threading.Condition(self._lock)
+        self._database_contexts = {}
+        self._idle_deadlines = []
+
+        self.idle_timeout = DEFAULT_IDLE_TIMEOUT
+
+        self.metadata_cache_ttl = DEFAULT_METADATA_CACHE_TTL
+        self.metadata_cache_max_size = DEFAULT_METADATA_CACHE_MAX_SIZE
+
+        self._hits = 0
+        self._misses = 0
+        self._creations = 0
+        self._disposals = 0
+
+    def configure_metadata_cache(self, ttl: int, max_size: int):
+        self.metadata_cache_ttl = ttl
+        self.metadata_cache_max_size = max_size
+
+    def configure_idle_timeout(self, idle_timeout: int):
+        self.idle_timeout = idle_timeout
+
+        self.wake_reaper()
+
+    @staticmethod
+    def get_registry_key(db_url: str, db_engine_options: Mapping) -> str:
+        normalized_options = json.dumps(dict(db_engine_options), sort_keys=True, default=str)
+
+        registry_key = str(hashlib.md5(f"{db_url}\n{normalized_options}".encode()).hexdigest())
+
+        return registry_key
+
+    def get_database_context(self, db_url: str, db_engine_options: Mapping,
+                             registry_key: str | None = None) -> "DatabaseContext":
+        # SQLAlchemy is only imported once the first engine is needed, it is the bulk of the startup time
+        from mcp_alchemy.database_context import DatabaseContext
+
+        if registry_key is None:
+            registry_key = self.get_registry_key(db_url, db_engine_options)
+
+        with self._lock:
+            db_context = self._database_contexts.get(registry_key)
+
+            if db_context is not None:
+                self._hits += 1
+
+                db_context.mark_as_used()
+
+                return db_context
+
+            self._misses += 1
+
+        # Created outside the lock, the dialect import and engine creation of a tenant must not block the others
+        created_context = DatabaseContext(
+            db_url,
+            db_engine_options,
+            MetadataCache(self.metadata_cache_ttl, self.metadata_cache_max_size)
+        )
+
+        with self._lock:
+            db_context = self._database_contexts.get(registry_key)
+
+            # Another call created the same context meanwhile, the one registered first is kept
+            if db_context is None:
+                db_context = created_context
+
+                self._database_contexts[registry_key] = db_context
+                self._creations += 1
+
+                heapq.heappush(self._idle_deadlines, (db_context.get_idle_deadline(self.idle_timeout), registry_key))
+
+                self._reaper_condition.notify_all()
+
+            db_context.mark_as_used()
+
+        if db_context is not created_context:
+            created_context.dispose()
+
+        return db_context
+
+    def run_reaper(self, stop_event: threading.Event):
+        """Dispose engines idle for longer than the idle timeout, sleeps until the next idle deadline"""
+        logger.info(f"Connection reaper started, Idle timeout (seconds): {self.idle_timeout}")
+
+        while not stop_event.is_set():
+            unused_contexts = self._pop_unused_contexts(stop_event)
+
+            for db_context in unused_contexts:
+                db_context.dispose()
+
+            if unused_contexts:
+                logger.info(f"Reclaimed {len(unused_contexts):,.0f} unused database pools, "
+                            f"Total reclaimed: {self._disposals:,.0f}")
+
+        logger.info("Connection reaper stopped")
+
+    def wake_reaper(self):
+        with self._reaper_condition:
+            self._reaper_condition.notify_all()
+
+    def _pop_unused_contexts(self, stop_event: threading.Event) -> list["DatabaseContext"]:
+        unused_contexts = []
+
+        with self._reaper_condition:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                next_deadline = self._idle_deadlines[0][0] if self._idle_deadlines else None
+
+                if next_deadline is None or next_deadline > now:
+                    # Nothing else is due, hand over what was collected or sleep until the next deadline
+                    if unused_contexts:
+                        break
+
+                    self._reaper_condition.wait(None if next_deadline is None else next_deadline - now)
+                    continue
+
+                _, registry_key = heapq.heappop(self._idle_deadlines)
+
+                db_context = self._database_contexts.get(registry_key)
+
+                if db_context is None:
+                    continue
+
+                # Used since the deadline was scheduled (or still running a query), reschedule it
+                current_deadline = db_context.get_idle_deadline(self.idle_timeout)
+
+                if db_context.is_in_use():
+                    current_deadline = max(current_deadline, now + self.idle_timeout)
+
+                if current_deadline > now:
+                    heapq.heappush(self._idle_deadlines, (current_deadline, registry_key))
+                    continue
+
+                del self._database_contexts[registry_key]
+
+                unused_contexts.append(db_context)
+
+            self._disposals += len(unused_contexts)
+
+        return unused_contexts
+
+    def get_pool_statistics(self) -> dict[str, dict]:
+        """Pool usage per tenant (connection id), tenants with multiple engine options are summed up"""
+        with self._lock:
+            db_contexts = list(self._database_contexts.values())
+
+        pool_statistics = {}
+
+        for db_context in db_contexts:
+            tenant_statistics = pool_statistics.setdefault(db_context.connection_id, {"checked_out": 0, "size": 0})
+
+            for key, value in db_context.get_pool_statistics().items():
+                tenant_statistics[key] += value
+
+        return pool_statistics
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            statistics = {
+                "engines": len(self._database_contexts),
+                "hits": self._hits,
+                "misses": self._misses,
+                "creations": self._creations,
+                "disposals": self._disposals
+            }
+
+        return statistics
+
+
+ENGINE_REGISTRY = EngineRegistry()
@@ -0,0 +1,115 @@
+from collections import deque
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_JOIN_PATH_MAX_HOPS = 4
+DEFAULT_JOIN_PATH_MAX_PATHS = 3
+
+# Pairs of tables looked up per call, the response grows with the square of the tables
+MAX_JOIN_PATH_TABLES = 10
+
+
+class ForeignKeyGraph:
+    """
+    Immutable graph of the tables of a database connected by their foreign keys, built once from the reflected
+    foreign keys of all tables. Joins work in both directions, so each foreign key is an edge of both tables.
+    """
+    tables: set[str]
+    foreign_key_count: int
+    _edges: dict[str, list[tuple[str, dict]]]
+    _lower_tables: dict[str, str]
+
+    def __init__(self, tables: list[str], foreign_keys: list[dict]):
+        self.tables = set(tables)
+        self.foreign_key_count = len(foreign_keys)
+
+        self._edges = {}
+
+        for foreign_key in foreign_keys:
+            table = foreign_key["table"]
+            referred_table = foreign_key["referred_table"]
+
+            self._edges.setdefault(table, []).append((referred_table, foreign_key))
+
+            # Self references join a table to itself, following them never leads anywhere else
+            if referred_table != table:
+                self._edges.setdefault(referred_table, []).append((table, foreign_key))
+
+        # Unique case-insensitive names, e.g. "track" for "Track"
+        lower_tables = {}
+
+        for table in self.tables:
+            lower_tables.setdefault(table.lower(), []).append(table)
+
+        self._lower_tables = {key: names[0] for key, names in lower_tables.items() if len(names) == 1}
+
+    def resolve_table(self, name: str) -> str | None:
+        if name in self.tables:
+            return name
+
+        return self._lower_tables.get(name.lower())
+
+    def get_neighbors(self, table: str) -> list[tuple[str, dict]]:
+        return self._edges.get(table, [])
+
+    def find_paths(self, source: str, target: str, max_hops: int = DEFAULT_JOIN_PATH_MAX_HOPS,
+                   max_paths: int = DEFAULT_JOIN_PATH_MAX_PATHS) -> list[list[tuple[str, str, dict]]]:
+        """
+        Shortest paths between two tables up to max_hops joins, breadth-first. Each path is a list of joins
+        (from table, to table, foreign key), all paths have the same (shortest) length.
+        """
+        if source == target:
+            return [[]]
+
+        distances = {source: 0}
+        predecessors = {}
+
+        queue = deque([source])
+
+        while queue:
+            table = queue.popleft()
+            distance = distances[table]
+
+            # Tables further away than the target are never part of a shortest path
+            if distance >= max_hops or (target in distances and distance >= distances[target]):
+                continue
+
+            for neighbor, foreign_key in self.get_neighbors(table):
+                neighbor_distance = distances.get(neighbor)
+
+                if neighbor_distance is None:
+                    distances[neighbor] = distance + 1
+
+                    queue.append(neighbor)
+
+                elif neighbor_distance != distance + 1:
+                    continue
+
+                predecessors.setdefault(neighbor, []).append((table, foreign_key))
+
+        if target not in distances:
+            return []
+
+        paths = []
+
+        self._collect_paths(target, source, predecessors, [], paths, max_paths)
+
+        return paths
+
+    def _collect_paths(self, table: str, source: str, predecessors: dict, suffix: list, paths: list, max_paths: int):
+        if len(paths) >= max_paths:
+            return
+
+        if table == source:
+            paths.append(suffix)
+
+            return
+
+        for predecessor, foreign_key in predecessors[table]:
+            self._collect_paths(predecessor, source, predecessors, [(predecessor, table, foreign_key), *suffix], paths,
+                                max_paths)
+
+            if len(paths) >= max_paths:
+                return
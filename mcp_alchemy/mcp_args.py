@@ -6,6 +6,23 @@ DEFAULT_MCP_SERVER_PORT = 8000
 DEFAULT_MCP_SERVER_TRANSPORT = "stdio"
 DEFAULT_MCP_SERVER_DEBUG = False
 DEFAULT_MCP_SERVER_CLOSE_UNUSED_INTERVAL = 600
+DEFAULT_MCP_SERVER_MAX_WORKERS = 8
+DEFAULT_MCP_SERVER_MAX_TENANT_CONCURRENCY = 4
+DEFAULT_MCP_SERVER_MAX_QUEUE_SIZE = 64
+DEFAULT_MCP_SERVER_MAX_TENANT_QUEUE_SIZE = 16
+DEFAULT_MCP_SERVER_QUEUE_TIMEOUT = 30
+DEFAULT_MCP_SERVER_METADATA_CACHE_TTL = 300
+DEFAULT_MCP_SERVER_METADATA_CACHE_MAX_SIZE = 1000
+DEFAULT_MCP_SERVER_CURSOR_TTL = 0
+DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS = 32
+DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS_PER_TENANT = 1
+DEFAULT_MCP_SERVER_RESULT_CACHE_TTL = 0
+DEFAULT_MCP_SERVER_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MCP_SERVER_WARM_UP = False
+DEFAULT_MCP_SERVER_WORKERS = 1
+DEFAULT_MCP_SERVER_SCHEMA_SNAPSHOT_DIR = ""
+DEFAULT_MCP_SERVER_MAX_CONNECTIONS = 100
+DEFAULT_MCP_SERVER_MAX_TENANT_CONNECTIONS = 8
 
 
 class MCPServerArguments:
@@ -15,6 +32,23 @@ class MCPServerArguments:
     transport: str
     debug: bool
     close_unused_connections_interval: int
+    max_workers: int
+    max_tenant_concurrency: int
+    max_queue_size: int
+    max_tenant_queue_size: int
+    queue_timeout: float
+    metadata_cache_ttl: int
+    metadata_cache_max_size: int
+    cursor_ttl: int
+    max_open_cursors: int
+    max_open_cursors_per_tenant: int
+    result_cache_ttl: int
+    result_cache_max_bytes: int
+    warm_up: bool
+    workers: int
+    schema_snapshot_dir: str
+    max_connections: int
+    max_tenant_connections: int
     stateless_http: bool
 
     def __init__(self,
@@ -23,7 +57,24 @@ class MCPServerArguments:
                  port: int = DEFAULT_MCP_SERVER_PORT,
                  transport: str = DEFAULT_MCP_SERVER_TRANSPORT,
                  debug: bool = DEFAULT_MCP_SERVER_DEBUG,
-                 close_unused_connections_interval: int = DEFAULT_MCP_SERVER_CLOSE_UNUSED_INTERVAL
+                 close_unused_connections_interval: int = DEFAULT_MCP_SERVER_CLOSE_UNUSED_INTERVAL,
+                 max_workers: int = DEFAULT_MCP_SERVER_MAX_WORKERS,
+                 max_tenant_concurrency: int = DEFAULT_MCP_SERVER_MAX_TENANT_CONCURRENCY,
+                 max_queue_size: int = DEFAULT_MCP_SERVER_MAX_QUEUE_SIZE,
+                 max_tenant_queue_size: int = DEFAULT_MCP_SERVER_MAX_TENANT_QUEUE_SIZE,
+                 queue_timeout: float = DEFAULT_MCP_SERVER_QUEUE_TIMEOUT,
+                 metadata_cache_ttl: int = DEFAULT_MCP_SERVER_METADATA_CACHE_TTL,
+                 metadata_cache_max_size: int = DEFAULT_MCP_SERVER_METADATA_CACHE_MAX_SIZE,
+                 cursor_ttl: int = DEFAULT_MCP_SERVER_CURSOR_TTL,
+                 max_open_cursors: int = DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS,
+                 max_open_cursors_per_tenant: int = DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS_PER_TENANT,
+                 result_cache_ttl: int = DEFAULT_MCP_SERVER_RESULT_CACHE_TTL,
+                 result_cache_max_bytes: int = DEFAULT_MCP_SERVER_RESULT_CACHE_MAX_BYTES,
+                 warm_up: bool = DEFAULT_MCP_SERVER_WARM_UP,
+                 workers: int = DEFAULT_MCP_SERVER_WORKERS,
+                 schema_snapshot_dir: str = DEFAULT_MCP_SERVER_SCHEMA_SNAPSHOT_DIR,
+                 max_connections: int = DEFAULT_MCP_SERVER_MAX_CONNECTIONS,
+                 max_tenant_connections: int = DEFAULT_MCP_SERVER_MAX_TENANT_CONNECTIONS
         ):
 
         self.name = name
@@ -32,6 +83,23 @@ class MCPServerArguments:
         self.transport = transport
         self.debug = debug
         self.close_unused_connections_interval = close_unused_connections_interval
+        self.max_workers = max_workers
+        self.max_tenant_concurrency = max_tenant_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_tenant_queue_size = max_tenant_queue_size
+        self.queue_timeout = queue_timeout
+        self.metadata_cache_ttl = metadata_cache_ttl
+        self.metadata_cache_max_size = metadata_cache_max_size
+        self.cursor_ttl = cursor_ttl
+        self.max_open_cursors = max_open_cursors
+        self.max_open_cursors_per_tenant = max_open_cursors_per_tenant
+        self.result_cache_ttl = result_cache_ttl
+        self.result_cache_max_bytes = result_cache_max_bytes
+        self.warm_up = warm_up
+        self.workers = workers
+        self.schema_snapshot_dir = schema_snapshot_dir
+        self.max_connections = max_connections
+        self.max_tenant_connections = max_tenant_connections
         self.stateless_http = self.transport == "streamable-http"
 
     @staticmethod
@@ -74,16 +142,164 @@ class MCPServerArguments:
                 default=DEFAULT_MCP_SERVER_DEBUG
             )
 
-            # Interval in seconds to check if DB connection is not being used
+            # Seconds a database engine can stay unused before its connection pool is disposed
             p.add_argument(
                 "--close-unused-connections-interval",
                 type=int,
                 default=DEFAULT_MCP_SERVER_CLOSE_UNUSED_INTERVAL
             )
 
+            # Number of worker threads running blocking database work
+            p.add_argument(
+                "--max-workers",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_WORKERS
+            )
+
+            # Maximum number of concurrent database calls per tenant (DB URL),
+            # Prevents a single tenant from occupying all the worker threads
+            p.add_argument(
+                "--max-tenant-concurrency",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_TENANT_CONCURRENCY
+            )
+
+            # Maximum number of database calls waiting for a worker, once full calls are rejected immediately
+            p.add_argument(
+                "--max-queue-size",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_QUEUE_SIZE
+            )
+
+            # Maximum number of database calls of a tenant (DB URL) waiting for a worker,
+            # Prevents a single tenant from filling the queue
+            p.add_argument(
+                "--max-tenant-queue-size",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_TENANT_QUEUE_SIZE
+            )
+
+            # Seconds a database call can wait for a worker before it is rejected, 0 waits without limit
+            p.add_argument(
+                "--queue-timeout",
+                type=float,
+                default=DEFAULT_MCP_SERVER_QUEUE_TIMEOUT
+            )
+
+            # Seconds to keep reflected table names and schemas, 0 disables the metadata cache
+            p.add_argument(
+                "--metadata-cache-ttl",
+                type=int,
+                default=DEFAULT_MCP_SERVER_METADATA_CACHE_TTL
+            )
+
+            # Maximum number of cached metadata entries per database, least recently used are evicted first
+            p.add_argument(
+                "--metadata-cache-max-size",
+                type=int,
+                default=DEFAULT_MCP_SERVER_METADATA_CACHE_MAX_SIZE
+            )
+
+            # Seconds to keep a truncated result open for fetch_more, 0 (default) disables continuation tokens
+            p.add_argument(
+                "--cursor-ttl",
+                type=int,
+                default=DEFAULT_MCP_SERVER_CURSOR_TTL
+            )
+
+            # Maximum number of open cursors (each holding a pooled connection), least recently used are closed first
+            p.add_argument(
+                "--max-open-cursors",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS
+            )
+
+            # Maximum number of open cursors per tenant (DB URL), should be lower than the tenant's pool size
+            p.add_argument(
+                "--max-open-cursors-per-tenant",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_OPEN_CURSORS_PER_TENANT
+            )
+
+            # Seconds to cache results of read-only queries, 0 (default) disables the result cache
+            p.add_argument(
+                "--result-cache-ttl",
+                type=int,
+                default=DEFAULT_MCP_SERVER_RESULT_CACHE_TTL
+            )
+
+            # Maximum size in bytes of all cached query results, least recently used are evicted first
+            p.add_argument(
+                "--result-cache-max-bytes",
+                type=int,
+                default=DEFAULT_MCP_SERVER_RESULT_CACHE_MAX_BYTES
+            )
+
+            # Connect and load the table names and schemas of the DB_URL environment variable in the background
+            # while the client runs the MCP handshake, so the first tool call does not pay for it
+            p.add_argument(
+                "--warm-up",
+                action="store_true",
+                default=DEFAULT_MCP_SERVER_WARM_UP
+            )
+
+            # Number of server processes behind the listener, relevant for Streamable-HTTP,
+            # Requests of a tenant (DB URL) are routed to the same process unless it is saturated
+            p.add_argument(
+                "--workers",
+                type=int,
+                default=DEFAULT_MCP_SERVER_WORKERS
+            )
+
+            # Directory of the persisted table names and schemas, a new process (e.g. a stdio session) starts with
+            # the metadata of the previous one and validates it in the background, empty disables the snapshots
+            p.add_argument(
+                "--schema-snapshot-dir",
+                type=str,
+                default=DEFAULT_MCP_SERVER_SCHEMA_SNAPSHOT_DIR
+            )
+
+            # Open database connections of all tenants together, pools of idle tenants are closed first once reached
+            p.add_argument(
+                "--max-connections",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_CONNECTIONS
+            )
+
+            # Open database connections per tenant, pools grow up to it and DB_ENGINE_OPTIONS are capped to it
+            p.add_argument(
+                "--max-tenant-connections",
+                type=int,
+                default=DEFAULT_MCP_SERVER_MAX_TENANT_CONNECTIONS
+            )
+
             args = p.parse_args()
 
-            mcp_args = MCPServerArguments(args.name, args.host, args.port, args.transport, args.debug, args.close_unused_connections_interval)
+            mcp_args = MCPServerArguments(
+                args.name,
+                args.host,
+                args.port,
+                args.transport,
+                args.debug,
+                args.close_unused_connections_interval,
+                args.max_workers,
+                args.max_tenant_concurrency,
+                args.max_queue_size,
+                args.max_tenant_queue_size,
+                args.queue_timeout,
+                args.metadata_cache_ttl,
+                args.metadata_cache_max_size,
+                args.cursor_ttl,
+                args.max_open_cursors,
+                args.max_open_cursors_per_tenant,
+                args.result_cache_ttl,
+                args.result_cache_max_bytes,
+                args.warm_up,
+                args.workers,
+                args.schema_snapshot_dir,
+                args.max_connections,
+                args.max_tenant_connections
+            )
 
         else:
             mcp_args = MCPServerArguments()
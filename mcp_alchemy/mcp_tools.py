@@ -7,6 +7,10 @@ class MCPTool(StrEnum):
     filter_table_names = "filter_table_names"
     schema_definitions = "schema_definitions"
     execute_query = "execute_query"
+    invalidate_metadata_cache = "invalidate_metadata_cache"
+    fetch_more = "fetch_more"
+    execute_batch = "execute_batch"
+    join_path = "join_path"
 
     def to_description(self) -> str | None:
         description: str | None = None
@@ -15,7 +19,12 @@ class MCPTool(StrEnum):
             description = "Return all table names in the database separated by comma."
 
         elif self == MCPTool.filter_table_names:
-            description = "Return all table names in the database containing the substring 'q' separated by comma."
+            description = (
+                "Return the table names of all schemas containing the substring 'q' (case-insensitive), "
+                "exact and prefix matches first, up to limit names.\n"
+                "Tables beyond the default schema are named schema.table, use these names with schema_definitions.\n"
+                "Set fuzzy=true to also get similarly named tables, e.g. when unsure about the spelling."
+            )
 
         elif self == MCPTool.schema_definitions:
             description = "Returns schema and relation information for the given tables."
@@ -24,10 +33,48 @@ class MCPTool(StrEnum):
             description = (
                 "Execute a SQL query and return results in a readable format.\n"
                 "Results will be truncated after characters as configured in the parameter.\n"
+                "Truncated results might include a continuation_token, use the fetch_more tool to get the next rows.\n"
+                "Set output_format='columnar' to get the column names once and each row as an array of values, "
+                "it fits several times more rows within the limit (default 'rows', each row as an object).\n"
+                "Set timeout (seconds) to cancel a query running longer, e.g. while exploring large tables.\n"
                 "IMPORTANT: \n"
                 "1. You MUST use the params parameter for query parameter substitution to prevent SQL injection.\n"
                 "\tExample: 'WHERE id = :id' with params={'id': 123}\n"
                 "2. Direct string concatenation is a serious security risk."
             )
 
+        elif self == MCPTool.invalidate_metadata_cache:
+            description = (
+                "Clear the cached table names and schema definitions of the database and return cache statistics.\n"
+                "Schema changes made through execute_query are detected automatically, "
+                "use this tool after the schema was changed by other clients."
+            )
+
+        elif self == MCPTool.fetch_more:
+            description = (
+                "Return the next rows of a truncated execute_query result without executing the query again.\n"
+                "Input is the continuation_token of the previous response, "
+                "the response includes the token again as long as more rows are available.\n"
+                "Tokens expire after a short time, execute the query again when a token expired."
+            )
+
+        elif self == MCPTool.execute_batch:
+            description = (
+                "Execute multiple SQL queries in one call and return the result and duration of each query.\n"
+                "statements is a list of queries, or of objects with query and params (same as execute_query).\n"
+                "Queries run one after another on the same connection, set parallel=true to run independent "
+                "read-only queries (SELECT) at the same time.\n"
+                "The output limit is shared by all queries, results are not continued with fetch_more.\n"
+                "timeout (seconds) limits the duration of each query.\n"
+                "You MUST use params for query parameter substitution to prevent SQL injection."
+            )
+
+        elif self == MCPTool.join_path:
+            description = (
+                "Return the shortest join paths between each pair of the given tables, following foreign keys.\n"
+                "Each path lists the tables to join and the ON condition of each join, "
+                "use it instead of following the relationships of schema_definitions table by table.\n"
+                "max_hops limits the joins of a path, max_paths the alternative paths of the same length per pair."
+            )
+
         return description
\ No newline at end of file
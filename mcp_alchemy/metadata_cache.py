@@ -0,0 +1,120 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_METADATA_CACHE_TTL = 300
+DEFAULT_METADATA_CACHE_MAX_SIZE = 1000
+
+
+class MetadataCache:
+    """Per-database LRU cache of reflected metadata (table names, table schemas) with a TTL"""
+    _lock: threading.Lock
+    _entries: OrderedDict[Hashable, tuple[float, Any]]
+    ttl: int
+    max_size: int
+    _hits: int
+    _misses: int
+    _evictions: int
+    _invalidations: int
+    _renewals: int
+
+    def __init__(self, ttl: int = DEFAULT_METADATA_CACHE_TTL, max_size: int = DEFAULT_METADATA_CACHE_MAX_SIZE):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._renewals = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expires_at, value = entry
+
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+
+                    return value
+
+            # Expired entries are kept until evicted, so they can be renewed once found unchanged
+            self._misses += 1
+
+        return default
+
+    def get_expired(self, key: Hashable) -> Any:
+        """Value of an expired entry, None when the entry is valid or missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] > time.monotonic():
+                return None
+
+            return entry[1]
+
+    def renew(self, key: Hashable) -> Any:
+        """Extend an entry by the TTL without loading it again, e.g. metadata that did not change"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            value = entry[1]
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._renewals += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if not self.is_enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+        logger.info("Metadata cache invalidated")
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            statistics = {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "renewals": self._renewals
+            }
+
+        return statistics
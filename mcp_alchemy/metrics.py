@@ -0,0 +1,322 @@
+import threading
+import time
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PHASE_CONNECT = "connect"
+PHASE_EXECUTE = "execute"
+PHASE_FETCH = "fetch"
+PHASE_FORMAT = "format"
+PHASE_SERIALIZE = "serialize"
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(label_names: tuple, label_values: tuple, extra: str | None = None) -> str:
+    labels = [
+        f'{label_name}="{_escape_label_value(label_value)}"'
+        for label_name, label_value in zip(label_names, label_values)
+    ]
+
+    if extra is not None:
+        labels.append(extra)
+
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Metric:
+    name: str
+    description: str
+    metric_type: str
+    label_names: tuple
+
+    def __init__(self, name: str, description: str, metric_type: str, label_names: tuple = ()):
+        self.name = name
+        self.description = description
+        self.metric_type = metric_type
+        self.label_names = label_names
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+
+        lines.extend(self._render_samples())
+
+        return lines
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    _lock: threading.Lock
+    _values: dict[tuple, float]
+
+    def __init__(self, name: str, description: str, label_names: tuple = ()):
+        super().__init__(name, description, "counter", label_names)
+
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, label_values: tuple = (), value: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + value
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+
+        return [
+            f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+            for label_values, value in values
+        ]
+
+
+class Histogram(Metric):
+    _lock: threading.Lock
+    _buckets: tuple
+    _series: dict[tuple, list]
+
+    def __init__(self, name: str, description: str, label_names: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, description, "histogram", label_names)
+
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._series = {}
+
+    def observe(self, label_values: tuple, value: float):
+        # Bucket counts are kept per bucket and only accumulated when rendered
+        bucket_index = bisect_left(self._buckets, value)
+
+        with self._lock:
+            series = self._series.get(label_values)
+
+            if series is None:
+                series = [[0] * (len(self._buckets) + 1), 0.0, 0]
+
+                self._series[label_values] = series
+
+            series[0][bucket_index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            all_series = [
+                (label_values, list(bucket_counts), total, count)
+                for label_values, (bucket_counts, total, count) in self._series.items()
+            ]
+
+        lines = []
+
+        for label_values, bucket_counts, total, count in all_series:
+            cumulative_count = 0
+
+            for bucket, bucket_count in zip(self._buckets + ("+Inf",), bucket_counts):
+                cumulative_count += bucket_count
+
+                labels = _format_labels(self.label_names, label_values, f'le="{bucket}"')
+
+                lines.append(f"{self.name}_bucket{labels} {cumulative_count}")
+
+            labels = _format_labels(self.label_names, label_values)
+
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+
+class CallbackGauge(Metric):
+    """Gauge collected when rendered, the callback returns the value per label values"""
+    _callback: Callable[[], dict[tuple, float]]
+
+    def __init__(self, name: str, description: str, label_names: tuple, callback: Callable[[], dict[tuple, float]],
+                 metric_type: str = "gauge"):
+        super().__init__(name, description, metric_type, label_names)
+
+        self._callback = callback
+
+    def _render_samples(self) -> list[str]:
+        try:
+            values = self._callback()
+
+        except Exception as ex:
+            logger.warning(f"Failed to collect metric {self.name}, Error: {ex}")
+
+            values = {}
+
+        return [
+            f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+            for label_values, value in values.items()
+        ]
+
+
+class MetricsRegistry:
+    _metrics: list[Metric]
+
+    def __init__(self):
+        self._metrics = []
+
+        self.tool_duration = self.register(Histogram(
+            "mcp_alchemy_tool_duration_seconds",
+            "Duration of tool calls",
+            ("tool", "tenant", "status")
+        ))
+
+        self.tool_phase_duration = self.register(Histogram(
+            "mcp_alchemy_tool_phase_duration_seconds",
+            "Duration of the phases (connect, execute, fetch, format, serialize) of tool calls",
+            ("tool", "tenant", "phase")
+        ))
+
+        self.pool_checkout_wait = self.register(Histogram(
+            "mcp_alchemy_pool_checkout_wait_seconds",
+            "Time waiting to check out a pooled connection",
+            ("tenant",)
+        ))
+
+        self.pool_resizes = self.register(Counter(
+            "mcp_alchemy_pool_resizes_total",
+            "Connection pools resized by the pool manager, by reason (grow, shrink, evict)",
+            ("tenant", "reason")
+        ))
+
+        self.rows_fetched = self.register(Counter(
+            "mcp_alchemy_rows_fetched_total",
+            "Rows fetched from the database",
+            ("tool", "tenant")
+        ))
+
+        self.rows_returned = self.register(Counter(
+            "mcp_alchemy_rows_returned_total",
+            "Rows returned to clients",
+            ("tool", "tenant")
+        ))
+
+        self.bytes_returned = self.register(Counter(
+            "mcp_alchemy_bytes_returned_total",
+            "Size of tool responses",
+            ("tool", "tenant")
+        ))
+
+        self.admission_queue_wait = self.register(Histogram(
+            "mcp_alchemy_admission_queue_wait_seconds",
+            "Time database calls waited in the admission queue",
+            ("tenant",)
+        ))
+
+        self.admission_rejections = self.register(Counter(
+            "mcp_alchemy_admission_rejections_total",
+            "Database calls rejected by the admission control",
+            ("tenant", "reason")
+        ))
+
+    def register(self, metric: Metric):
+        self._metrics.append(metric)
+
+        return metric
+
+    def render(self) -> str:
+        lines = []
+
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+    def start_call(self, tool: str, tenant: str) -> "CallMetrics":
+        return CallMetrics(self, tool, tenant)
+
+
+class CallMetrics:
+    """
+    Measurements of a single tool call, recorded into the registry once the call finishes,
+    a call might run statements on multiple worker threads (execute_batch)
+    """
+    _registry: MetricsRegistry
+    _lock: threading.Lock
+    tool: str
+    tenant: str
+    _started: float
+    _phases: dict[str, float]
+    rows_fetched: int
+    rows_returned: int
+    response_size: int
+    failed: bool
+
+    def __init__(self, registry: MetricsRegistry, tool: str, tenant: str):
+        self._registry = registry
+        self._lock = threading.Lock()
+        self.tool = tool
+        self.tenant = tenant
+
+        self._started = time.perf_counter()
+        self._phases = {}
+
+        self.rows_fetched = 0
+        self.rows_returned = 0
+        self.response_size = 0
+        self.failed = False
+
+    def __enter__(self) -> "CallMetrics":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish("error" if exc_type is not None or self.failed else "success")
+
+    def add_phase(self, phase: str, seconds: float):
+        with self._lock:
+            self._phases[phase] = self._phases.get(phase, 0) + seconds
+
+    def add_rows(self, rows_fetched: int, rows_returned: int):
+        with self._lock:
+            self.rows_fetched += rows_fetched
+            self.rows_returned += rows_returned
+
+    @contextmanager
+    def measure(self, phase: str):
+        started = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.add_phase(phase, time.perf_counter() - started)
+
+    def finish(self, status: str = "success"):
+        registry = self._registry
+        tool_labels = (self.tool, self.tenant)
+
+        registry.tool_duration.observe((self.tool, self.tenant, status), time.perf_counter() - self._started)
+
+        for phase, seconds in self._phases.items():
+            registry.tool_phase_duration.observe((self.tool, self.tenant, phase), seconds)
+
+        if PHASE_CONNECT in self._phases:
+            registry.pool_checkout_wait.observe((self.tenant,), self._phases[PHASE_CONNECT])
+
+        if self.rows_fetched:
+            registry.rows_fetched.inc(tool_labels, self.rows_fetched)
+
+        if self.rows_returned:
+            registry.rows_returned.inc(tool_labels, self.rows_returned)
+
+        registry.bytes_returned.inc(tool_labels, self.response_size)
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,378 @@
+import threading
+import time
+
+from typing import TYPE_CHECKING, Mapping
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.metrics import METRICS
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.pool import QueuePool
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_TENANT_CONNECTIONS = 8
+
+# Seconds between pool adjustments, the usage of a pool is observed over this window
+POOL_ADJUST_INTERVAL = 5
+
+# Windows without saturated checkouts before a grown pool shrinks by a connection
+SHRINK_AFTER_WINDOWS = 6
+
+# Checkouts waiting longer are counted as saturated, even when the pool was not full when they started
+SATURATED_CHECKOUT_WAIT = 0.05
+
+# Internals of QueuePool that are resized in place, checked before a pool is managed (see ManagedPool.resize)
+QUEUE_POOL_INTERNALS = ("_pool", "_overflow", "_max_overflow", "_overflow_lock", "_dec_overflow")
+
+RESIZE_REASON_GROW = "grow"
+RESIZE_REASON_SHRINK = "shrink"
+RESIZE_REASON_EVICT = "evict"
+
+
+def has_resizable_internals(pool: "QueuePool") -> bool:
+    """Whether a QueuePool has the internals ManagedPool.resize changes"""
+    return all(hasattr(pool, name) for name in QUEUE_POOL_INTERNALS) and hasattr(pool._pool, "mutex")
+
+
+class ManagedPool:
+    """
+    Connection pool of a tenant (engine) sized by the pool manager. The capacity is the maximum of open connections,
+    the pool keeps all but the tenant's overflow open once returned, the overflow is closed.
+    """
+    tenant_id: str
+    baseline_capacity: int
+    baseline_overflow: int
+    capacity: int
+    last_used: float
+    _engine: "Engine"
+    _lock: threading.Lock
+    _checkouts: int
+    _saturated_checkouts: int
+    _peak_checked_out: int
+    _quiet_windows: int
+
+    def __init__(self, tenant_id: str, engine: "Engine", capacity: int):
+        pool = engine.pool
+
+        self.tenant_id = tenant_id
+        self.baseline_capacity = pool.size() + pool._max_overflow
+        self.baseline_overflow = pool._max_overflow
+        self.capacity = self.baseline_capacity
+        self.last_used = time.monotonic()
+
+        self._engine = engine
+        self._lock = threading.Lock()
+
+        self._checkouts = 0
+        self._saturated_checkouts = 0
+        self._peak_checked_out = 0
+        self._quiet_windows = 0
+
+        if capacity != self.capacity:
+            self.resize(capacity)
+
+    @property
+    def pool(self) -> "QueuePool":
+        # Disposing the engine replaces its pool with one of the same size
+        return self._engine.pool
+
+    def is_saturated(self) -> bool:
+        """Whether a checkout would wait for a connection to be returned"""
+        return self.pool.checkedout() >= self.capacity
+
+    def record_checkout(self, wait_seconds: float, saturated: bool):
+        checked_out = self.pool.checkedout()
+
+        with self._lock:
+            self._checkouts += 1
+            self._peak_checked_out = max(self._peak_checked_out, checked_out)
+
+            if saturated or wait_seconds >= SATURATED_CHECKOUT_WAIT:
+                self._saturated_checkouts += 1
+
+        self.last_used = time.monotonic()
+
+    def take_window(self) -> tuple[int, int, int]:
+        """Checkouts, saturated checkouts and peak of checked out connections since the previous window"""
+        checked_out = self.pool.checkedout()
+
+        with self._lock:
+            window = (self._checkouts, self._saturated_checkouts, max(self._peak_checked_out, checked_out))
+
+            self._checkouts = 0
+            self._saturated_checkouts = 0
+            self._peak_checked_out = checked_out
+
+        return window
+
+    def observe_window(self, saturated_checkouts: int, peak_checked_out: int) -> int:
+        """Capacity the pool should have given its last window, before applying the connection budget"""
+        if saturated_checkouts > 0:
+            self._quiet_windows = 0
+
+            return self.capacity * 2
+
+        if peak_checked_out >= self.capacity:
+            self._quiet_windows = 0
+
+            return self.capacity
+
+        self._quiet_windows += 1
+
+        if self._quiet_windows < SHRINK_AFTER_WINDOWS or self.capacity <= self.baseline_capacity:
+            return self.capacity
+
+        self._quiet_windows = 0
+
+        return max(self.capacity - 1, peak_checked_out, self.baseline_capacity)
+
+    def is_idle(self) -> bool:
+        return self.pool.checkedout() == 0
+
+    def resize(self, capacity: int):
+        """
+        Change the size of the QueuePool in place, SQLAlchemy has no API for it (recreate() would leave the checked
+        out connections to the old pool, while growing is needed most when all of them are checked out). QueuePool
+        counts its open connections as size + overflow, both are moved together under the locks of the overflow and
+        the queue, so checkouts and returns see consistent counts. Tied to the QueuePool of the SQLAlchemy versions
+        of pyproject.toml, see tests/test_pool_manager.py.
+        """
+        pool = self.pool
+
+        max_overflow = min(self.baseline_overflow, capacity - 1)
+        pool_size = capacity - max_overflow
+
+        with pool._overflow_lock, pool._pool.mutex:
+            pool._overflow -= pool_size - pool._pool.maxsize
+            pool._pool.maxsize = pool_size
+            pool._max_overflow = max_overflow
+
+        self.capacity = capacity
+
+        self.close_idle_connections(pool_size)
+
+    def close_idle_connections(self, keep: int = 0) -> int:
+        """Close idle connections beyond keep, as QueuePool does with connections returned to a full pool"""
+        from sqlalchemy.util import queue
+
+        pool = self.pool
+
+        closed = 0
+
+        while pool.checkedin() > keep:
+            try:
+                record = pool._pool.get(False)
+
+            except queue.Empty:
+                break
+
+            try:
+                record.close()
+
+            finally:
+                pool._dec_overflow()
+
+            closed += 1
+
+        return closed
+
+    def get_statistics(self) -> dict:
+        pool = self.pool
+
+        statistics = {
+            "capacity": self.capacity,
+            "baseline_capacity": self.baseline_capacity,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "size": pool.size()
+        }
+
+        return statistics
+
+
+class PoolManager:
+    """
+    Sizes the connection pools of all tenants from their observed usage. A pool saturated during a window (checkouts
+    had to wait for a connection) doubles, a pool used below its capacity for a while shrinks back to the size of its
+    engine options. All pools together stay within the connection budget, once it is exhausted idle tenants give up
+    their connections first (least recently used), pools of busy tenants only grow as far as the budget allows.
+    """
+    _lock: threading.Lock
+    _pools: dict[int, ManagedPool]
+    max_connections: int
+    max_tenant_connections: int
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+        self.max_connections = DEFAULT_MAX_CONNECTIONS
+        self.max_tenant_connections = DEFAULT_MAX_TENANT_CONNECTIONS
+
+    def configure(self, max_connections: int, max_tenant_connections: int):
+        self.max_connections = max(1, max_connections)
+        self.max_tenant_connections = max(1, min(max_tenant_connections, self.max_connections))
+
+    def get_engine_options(self, db_engine_options: Mapping) -> dict:
+        """Engine options of a tenant with its pool options (DB_ENGINE_OPTIONS) capped to the tenant's connections"""
+        engine_options = dict(db_engine_options)
+
+        if "pool_size" in engine_options:
+            engine_options["pool_size"] = max(1, min(int(engine_options["pool_size"]), self.max_tenant_connections))
+
+        if "max_overflow" in engine_options:
+            # -1 (unlimited) is capped as well
+            max_overflow = int(engine_options["max_overflow"])
+            remaining = self.max_tenant_connections - engine_options.get("pool_size", 1)
+
+            if max_overflow < 0 or max_overflow > remaining:
+                engine_options["max_overflow"] = max(0, remaining)
+
+        if engine_options != dict(db_engine_options):
+            logger.warning(f"Pool options capped to {self.max_tenant_connections} connections per tenant, "
+                           f"Options: {engine_options}")
+
+        return engine_options
+
+    def register(self, tenant_id: str, engine: "Engine") -> ManagedPool | None:
+        """Manage the pool of an engine, only QueuePools (the default of most dialects) can be sized"""
+        from sqlalchemy.pool import QueuePool
+
+        if isinstance(engine.pool, QueuePool) and not has_resizable_internals(engine.pool):
+            logger.warning(f"QueuePool of this SQLAlchemy version can't be sized, pool of tenant {tenant_id} keeps "
+                           f"the size of its options")
+
+            return None
+
+        # Pools without an overflow limit open as many connections as requested, they can't be sized
+        if not isinstance(engine.pool, QueuePool) or engine.pool._max_overflow < 0:
+            logger.debug(f"Pool {type(engine.pool).__name__} of tenant {tenant_id} is not managed")
+
+            return None
+
+        with self._lock:
+            baseline_capacity = engine.pool.size() + engine.pool._max_overflow
+
+            available = self._get_available(baseline_capacity)
+
+            if available < baseline_capacity:
+                logger.warning(f"Connection budget of {self.max_connections} connections is exhausted, "
+                               f"pool of tenant {tenant_id} starts with {max(1, available)} connections")
+
+            managed_pool = ManagedPool(tenant_id, engine, max(1, min(available, baseline_capacity)))
+
+            self._pools[id(managed_pool)] = managed_pool
+
+        return managed_pool
+
+    def unregister(self, managed_pool: ManagedPool | None):
+        if managed_pool is None:
+            return
+
+        with self._lock:
+            self._pools.pop(id(managed_pool), None)
+
+    def get_reserved_connections(self) -> int:
+        with self._lock:
+            return sum(managed_pool.capacity for managed_pool in self._pools.values())
+
+    def get_pool_statistics(self) -> dict[str, dict]:
+        """Pool state per tenant (connection id), tenants with multiple engine options are summed up"""
+        with self._lock:
+            managed_pools = list(self._pools.values())
+
+        pool_statistics = {}
+
+        for managed_pool in managed_pools:
+            tenant_statistics = pool_statistics.setdefault(managed_pool.tenant_id, {})
+
+            for key, value in managed_pool.get_statistics().items():
+                tenant_statistics[key] = tenant_statistics.get(key, 0) + value
+
+        return pool_statistics
+
+    def run(self, stop_event: threading.Event):
+        """Adjust the pools every interval until stopped"""
+        logger.info(f"Pool manager started, Connection budget: {self.max_connections}, "
+                    f"Max connections per tenant: {self.max_tenant_connections}")
+
+        while not stop_event.wait(POOL_ADJUST_INTERVAL):
+            try:
+                self.adjust()
+
+            except Exception as ex:
+                logger.warning(f"Failed to adjust the connection pools, Error: {ex}")
+
+        logger.info("Pool manager stopped")
+
+    def adjust(self):
+        with self._lock:
+            managed_pools = list(self._pools.values())
+
+            for managed_pool in managed_pools:
+                _, saturated_checkouts, peak_checked_out = managed_pool.take_window()
+
+                capacity = min(managed_pool.observe_window(saturated_checkouts, peak_checked_out),
+                               self.max_tenant_connections)
+
+                if capacity < managed_pool.capacity:
+                    self._resize(managed_pool, capacity, RESIZE_REASON_SHRINK)
+
+                elif capacity > managed_pool.capacity:
+                    # Growing beyond the budget reclaims the connections of idle tenants first
+                    growth = capacity - managed_pool.capacity
+
+                    capacity = managed_pool.capacity + min(growth, self._get_available(growth, managed_pool))
+
+                    if capacity > managed_pool.capacity:
+                        self._resize(managed_pool, capacity, RESIZE_REASON_GROW)
+
+                    else:
+                        logger.warning(f"Pool of tenant {managed_pool.tenant_id} is saturated, the connection budget "
+                                       f"of {self.max_connections} connections is exhausted")
+
+    def _get_available(self, needed: int, excluded: ManagedPool | None = None) -> int:
+        """Connections left in the budget, evicting idle tenants (least recently used first) until needed are free"""
+        available = self.max_connections - sum(managed_pool.capacity for managed_pool in self._pools.values())
+
+        if available >= needed:
+            return available
+
+        idle_pools = sorted(
+            (
+                managed_pool
+                for managed_pool in self._pools.values()
+                if managed_pool is not excluded and managed_pool.capacity > 1 and managed_pool.is_idle()
+            ),
+            key=lambda managed_pool: managed_pool.last_used
+        )
+
+        for managed_pool in idle_pools:
+            if available >= needed:
+                break
+
+            available += managed_pool.capacity - 1
+
+            self._resize(managed_pool, 1, RESIZE_REASON_EVICT)
+
+            managed_pool.close_idle_connections()
+
+        return available
+
+    @staticmethod
+    def _resize(managed_pool: ManagedPool, capacity: int, reason: str):
+        previous_capacity = managed_pool.capacity
+
+        managed_pool.resize(capacity)
+
+        METRICS.pool_resizes.inc((managed_pool.tenant_id, reason))
+
+        logger.info(f"Pool of tenant {managed_pool.tenant_id} resized ({reason}), "
+                    f"Capacity: {previous_capacity} -> {capacity}")
+
+
+POOL_MANAGER = PoolManager()
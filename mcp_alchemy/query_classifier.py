@@ -0,0 +1,88 @@
+import re
+
+# Comments and quoted literals / identifiers are removed before looking for keywords
+IGNORED_SQL_PARTS = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`", re.DOTALL)
+
+DDL_KEYWORDS = re.compile(r"\b(CREATE|ALTER|DROP|RENAME|TRUNCATE|COMMENT)\b", re.IGNORECASE)
+
+READ_ONLY_FIRST_KEYWORDS = re.compile(r"^\s*\(*\s*(SELECT|WITH|VALUES)\b", re.IGNORECASE)
+
+WRITE_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|UPSERT|REPLACE|CREATE|ALTER|DROP|RENAME|TRUNCATE|COMMENT|GRANT|REVOKE|"
+    r"CALL|EXEC|EXECUTE|DO|INTO|LOCK|SET|COPY|LOAD|VACUUM|ANALYZE|REINDEX|CLUSTER|REFRESH|NEXTVAL|SETVAL)\b",
+    re.IGNORECASE
+)
+
+# String literals and comments are removed, quoted identifiers become a name no function is known by
+IGNORED_SQL_STRINGS = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", re.DOTALL)
+QUOTED_IDENTIFIERS = re.compile(r"\"(?:[^\"]|\"\")*\"|`[^`]*`|\[[^\]]*\]")
+
+# Names followed by a parenthesis, optionally qualified (schema.function)
+FUNCTION_CALLS = re.compile(r"(?<![\w$])((?:[A-Za-z_][\w$]*\s*\.\s*)*[A-Za-z_][\w$]*)\s*\(")
+
+# Keywords and type names (e.g. of CAST) that might be followed by a parenthesis without calling a function
+NON_FUNCTION_NAMES = {
+    "select", "from", "join", "in", "exists", "any", "all", "some", "as", "on", "and", "or", "not", "where", "having",
+    "values", "over", "filter", "group", "by", "when", "then", "else", "case", "union", "intersect", "except",
+    "lateral", "using", "with", "limit", "offset", "between", "like", "ilike", "is", "row", "array", "distinct", "top",
+    "escape", "varchar", "char", "nvarchar", "nchar", "character", "decimal", "numeric", "float", "real", "time",
+    "timestamp", "interval", "bit", "varbinary", "binary"
+}
+
+# Built-in functions without side effects, queries calling any other function (e.g. a user defined function that
+# writes) are not cached
+CACHEABLE_FUNCTIONS = {
+    "count", "count_big", "sum", "avg", "min", "max", "total", "group_concat", "string_agg", "array_agg", "json_agg",
+    "jsonb_agg", "json_group_array", "stddev", "stddev_pop", "stddev_samp", "variance", "var_pop", "var_samp",
+    "bool_and", "bool_or", "every", "row_number", "rank", "dense_rank", "percent_rank", "cume_dist", "ntile", "lag",
+    "lead", "first_value", "last_value", "nth_value", "abs", "round", "floor", "ceil", "ceiling", "trunc", "mod",
+    "power", "sqrt", "exp", "ln", "log", "log10", "sign", "coalesce", "nullif", "ifnull", "nvl", "isnull", "iif",
+    "greatest", "least", "lower", "upper", "length", "len", "char_length", "character_length", "octet_length",
+    "substr", "substring", "trim", "ltrim", "rtrim", "replace", "concat", "concat_ws", "left", "right", "lpad", "rpad",
+    "instr", "position", "strpos", "reverse", "repeat", "initcap", "cast", "convert", "extract", "date_part",
+    "date_trunc", "to_char", "typeof", "hex", "json_extract", "json_array_length", "jsonb_array_length"
+}
+
+
+def strip_sql_literals(query: str) -> str:
+    return IGNORED_SQL_PARTS.sub(" ", query)
+
+
+def is_ddl_query(query: str) -> bool:
+    """Whether the query might change the schema, false positives only cost a metadata cache refresh"""
+    return DDL_KEYWORDS.search(strip_sql_literals(query)) is not None
+
+
+def is_read_only_query(query: str) -> bool:
+    """
+    Whether the query is provably read-only: a single SELECT / WITH / VALUES statement without any keyword that could
+    write (e.g. data modifying CTEs, SELECT INTO, FOR UPDATE locks), false negatives only cost a cache miss
+    """
+    statement = strip_sql_literals(query).strip().rstrip(";")
+
+    if ";" in statement:
+        return False
+
+    if READ_ONLY_FIRST_KEYWORDS.match(statement) is None:
+        return False
+
+    return WRITE_KEYWORDS.search(statement) is None
+
+
+def is_cacheable_query(query: str) -> bool:
+    """
+    Whether the result of the query only depends on the data it reads: a read-only query (see is_read_only_query)
+    calling no functions but the built-in ones without side effects, false negatives only cost a cache miss
+    """
+    if not is_read_only_query(query):
+        return False
+
+    statement = QUOTED_IDENTIFIERS.sub(" quoted_identifier ", IGNORED_SQL_STRINGS.sub(" ", query))
+
+    for function_name in FUNCTION_CALLS.findall(statement):
+        function_name = function_name.lower()
+
+        if function_name not in NON_FUNCTION_NAMES and function_name not in CACHEABLE_FUNCTIONS:
+            return False
+
+    return True
@@ -1,117 +1,69 @@
-import hashlib
-import json
-import os
-import threading
-
-from time import sleep
-from typing import Any
+from typing import TYPE_CHECKING, Any, Mapping
 
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.utilities.logging import get_logger
 from starlette.requests import Request
 
-from mcp_alchemy.database_context import DatabaseContext
-
-logger = get_logger(__name__)
-
-DISPOSE_UNUSED_CONNECTIONS_INTERVAL = 1
-
-PARAM_DB_URL = "DB_URL"
-PARAM_DB_ENGINE_OPTIONS = "DB_ENGINE_OPTIONS"
-PARAM_EXECUTE_QUERY_MAX_CHARS = "EXECUTE_QUERY_MAX_CHARS"
+from mcp_alchemy.engine_registry import ENGINE_REGISTRY
+from mcp_alchemy.tenant_profile import TENANT_PROFILE_CACHE, TenantProfile, SUPPORTED_ENV_VARS, SUPPORTED_HEADERS
 
-SUPPORTED_ENV_VARS = [
-    PARAM_DB_URL,
-    PARAM_DB_ENGINE_OPTIONS,
-    PARAM_EXECUTE_QUERY_MAX_CHARS
-]
+if TYPE_CHECKING:
+    from mcp_alchemy.database_context import DatabaseContext
 
-SUPPORTED_HEADERS = {
-    f"x-{env_var.replace('_', '-')}".lower(): env_var
-    for env_var in SUPPORTED_ENV_VARS
-}
-
-DEFAULT_DB_ENGINE_OPTIONS = "{}"
-DEFAULT_EXECUTE_QUERY_MAX_CHARS = "4000"
-
-DEFAULT_OPTIONS = {
-    'isolation_level': 'AUTOCOMMIT',
-    # Test connections before use (handles MySQL 8hr timeout, network drops)
-    'pool_pre_ping': True,
-    # Keep minimal connections (MCP typically handles one request at a time)
-    'pool_size': 1,
-    # Allow temporary burst capacity for edge cases
-    'max_overflow': 2,
-    # Force refresh connections older than 1hr (well under MySQL's 8hr default)
-    'pool_recycle': 3600
-}
-
-DATABASE_CONTEXT_LIST: dict[str, DatabaseContext] = {}
+logger = get_logger(__name__)
 
 
 class RequestContext:
+    profile: TenantProfile
     db_url: str
-    db_engine_options: dict
+    db_engine_options: Mapping
     execute_query_max_chars: int
+    execute_query_exact_count: bool
+    execute_query_batch_size: int
+    execute_query_format: str
+    execute_query_column_types: bool
+    execute_query_timeout: float
+    connection_id: str
     request: Request | None
     context: Context | None
-    db_context: DatabaseContext | None
+    _db_context: "DatabaseContext | None"
 
     def __init__(self, ctx: Context | None = None):
         self.context = ctx
         self.request = ctx.request_context.request if ctx and ctx.request_context else None
 
         if self.request is None:
-            data = {
-                key: os.environ[key]
-                for key in os.environ
-            }
-
-        else:
-            data = {
-                self.header_key_to_env_var_format(key): self.request.headers[key]
-                for key in self.request.headers
-            }
-
-        self.db_url = data.get(PARAM_DB_URL)
-
-        if self.db_url is None:
-            raise ValueError("DB_URL cannot be None")
-
-        self.execute_query_max_chars = int(data.get(PARAM_EXECUTE_QUERY_MAX_CHARS, DEFAULT_EXECUTE_QUERY_MAX_CHARS))
-
-        db_engine_options = data.get(PARAM_DB_ENGINE_OPTIONS, DEFAULT_DB_ENGINE_OPTIONS)
-
-        user_options = json.loads(db_engine_options)
-
-        db_options = DEFAULT_OPTIONS.copy()
-        db_options.update(user_options)
-
-        self.db_engine_options = db_options
-
-        connection_id = str(hashlib.md5(self.db_url.encode()).hexdigest())
+            self.profile = TENANT_PROFILE_CACHE.get_from_environment()
 
-        db_context: DatabaseContext | None = None
-
-        if connection_id in DATABASE_CONTEXT_LIST:
-            db_context = DATABASE_CONTEXT_LIST[connection_id]
-
-        if db_context is None or not db_context.is_connected():
-            db_context = DatabaseContext(self.db_url, self.db_engine_options)
-
-        self.db_context = db_context
-
-        self.db_context.mark_as_used()
-
-    @staticmethod
-    def header_key_to_env_var_format(key: str) -> str:
-        if key.lower().startswith("x-") and key in SUPPORTED_HEADERS:
-            key  = SUPPORTED_HEADERS.get(key)
-            
         else:
-            key = key.upper()
-
-        return key
+            self.profile = TENANT_PROFILE_CACHE.get_from_headers(self.request.headers)
+
+        self.db_url = self.profile.db_url
+        self.db_engine_options = self.profile.db_engine_options
+        self.execute_query_max_chars = self.profile.execute_query_max_chars
+        self.execute_query_exact_count = self.profile.execute_query_exact_count
+        self.execute_query_batch_size = self.profile.execute_query_batch_size
+        self.execute_query_format = self.profile.execute_query_format
+        self.execute_query_column_types = self.profile.execute_query_column_types
+        self.execute_query_timeout = self.profile.execute_query_timeout
+        self.connection_id = self.profile.connection_id
+
+        self._db_context = None
+
+    @property
+    def db_context(self) -> "DatabaseContext":
+        """
+        Database context of the tenant, resolved on first use. Creating it imports the dialect and the engine, it is
+        only accessed by the work running on the database executor, never on the event loop
+        """
+        if self._db_context is None:
+            self._db_context = ENGINE_REGISTRY.get_database_context(
+                self.db_url,
+                self.db_engine_options,
+                self.profile.registry_key
+            )
+
+        return self._db_context
 
     def get_parameter(self, key: str, value: Any | None):
         if self.request is not None:
@@ -123,26 +75,18 @@ class RequestContext:
 
         return value
 
-    @staticmethod
-    def load(ctx: Context | None = None):
-        return RequestContext(ctx)
-
-    @staticmethod
-    def dispose_unused_connections(stop_event: threading.Event):
-        while not stop_event.is_set():
-            closed_connections = []
-            for connection_id in DATABASE_CONTEXT_LIST:
-                db_context = DATABASE_CONTEXT_LIST[connection_id]
-
-                if db_context.should_close():
-                    db_context.connection.close()
-                    closed_connections.append(connection_id)
-
-            for closed_connection in closed_connections:
-                del DATABASE_CONTEXT_LIST[closed_connection]
-
-            sleep(DISPOSE_UNUSED_CONNECTIONS_INTERVAL)
-
+    def get_statement_timeout(self, timeout: float | None) -> float | None:
+        """Timeout of a call, it can only be lowered below the timeout of the tenant"""
+        timeout = self.get_parameter("timeout", timeout)
 
+        timeouts = [
+            float(value)
+            for value in (timeout, self.execute_query_timeout)
+            if value is not None and float(value) > 0
+        ]
 
+        return min(timeouts) if timeouts else None
 
+    @staticmethod
+    def load(ctx: Context | None = None):
+        return RequestContext(ctx)
@@ -1,58 +1,357 @@
 from datetime import datetime, date
-import json
+import time
+
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable
 
 from mcp.server.fastmcp.utilities.logging import get_logger
 
+from mcp_alchemy.cursor_store import CURSOR_STORE, OpenCursor
+from mcp_alchemy.foreign_key_graph import MAX_JOIN_PATH_TABLES
+from mcp_alchemy.metrics import METRICS, CallMetrics, PHASE_CONNECT, PHASE_EXECUTE, PHASE_FETCH, PHASE_FORMAT
+from mcp_alchemy.query_classifier import is_cacheable_query, is_ddl_query, is_read_only_query
 from mcp_alchemy.request_context import RequestContext
+from mcp_alchemy.result_cache import RESULT_CACHE
+from mcp_alchemy.statement_guard import StatementGuard
+from mcp_alchemy.table_catalog import get_qualified_name
+from mcp_alchemy.tenant_profile import OUTPUT_FORMAT_COLUMNAR, get_output_format
 
 SHOW_KEY_ONLY = {"nullable", "autoincrement"}
 
+SCHEMA_COLUMN_EXCLUDED_KEYS = {"name", "type", "comment"}
+
+MAX_BATCH_STATEMENTS = 100
+
 logger = get_logger(__name__)
 
 
 class ResponseFormatter:
     _request_context: RequestContext
+    _call_metrics: CallMetrics
+    _statement_guard: StatementGuard
+    _value_formatters: dict[type, Callable[[Any], str]] = {}
 
-    def __init__(self, request_context: RequestContext):
+    def __init__(self, request_context: RequestContext, call_metrics: CallMetrics | None = None,
+                 statement_guard: StatementGuard | None = None):
         self._request_context = request_context
 
+        # Measurements of calls without metrics are simply never recorded
+        self._call_metrics = METRICS.start_call("", "") if call_metrics is None else call_metrics
+
+        self._statement_guard = StatementGuard() if statement_guard is None else statement_guard
+
     def get_schema_list_response(self, table_names):
         table_names = self._request_context.get_parameter("table_names", table_names)
 
         logger.info(f"Retrieving schema definition for table names: '{table_names}'")
 
-        table_schema_list = self._request_context.db_context.get_schema_details(table_names)
+        with self._call_metrics.measure(PHASE_EXECUTE):
+            table_schema_list = self._request_context.db_context.get_schema_details(table_names)
 
-        all_schema_response = [
-            self._format_single_schema_response(table_schema)
-            for table_schema in table_schema_list
-        ]
+        with self._call_metrics.measure(PHASE_FORMAT):
+            all_schema_response = [
+                self._format_single_schema_response(table_schema)
+                for table_schema in table_schema_list
+            ]
 
         logger.info(f"{len(table_schema_list):,.0f} schema definitions found for tables '{table_names}'")
         logger.debug(f"Schema definitions: {all_schema_response}")
 
         return all_schema_response
 
-    def get_execute_query_response(self, query, params):
+    def get_join_path_response(self, table_names, max_hops: int, max_paths: int):
+        table_names = self._request_context.get_parameter("table_names", table_names)
+
+        if not table_names or len(table_names) < 2:
+            raise ValueError("At least two table names are required")
+
+        if len(table_names) > MAX_JOIN_PATH_TABLES:
+            raise ValueError(f"Join paths are limited to {MAX_JOIN_PATH_TABLES} tables, got {len(table_names)}")
+
+        logger.info(f"Retrieving join paths between tables: '{table_names}'")
+
+        with self._call_metrics.measure(PHASE_EXECUTE):
+            foreign_key_graph = self._request_context.db_context.get_foreign_key_graph()
+
+        with self._call_metrics.measure(PHASE_FORMAT):
+            tables = {table_name: foreign_key_graph.resolve_table(table_name) for table_name in table_names}
+            found_tables = list(dict.fromkeys(table for table in tables.values() if table is not None))
+
+            join_paths = []
+
+            for index, source in enumerate(found_tables):
+                for target in found_tables[index + 1:]:
+                    paths = foreign_key_graph.find_paths(source, target, max_hops, max_paths)
+
+                    join_paths.append({
+                        "source": source,
+                        "target": target,
+                        "found": len(paths) > 0,
+                        "joins": len(paths[0]) if paths else None,
+                        "paths": [self._format_join_path(source, path) for path in paths]
+                    })
+
+        result = {
+            "join_paths": join_paths,
+            "not_found": [table_name for table_name, table in tables.items() if table is None],
+            "max_hops": max_hops
+        }
+
+        logger.info(f"{sum(1 for join_path in join_paths if join_path['found']):,.0f} of {len(join_paths):,.0f} "
+                    f"join paths found between tables '{table_names}'")
+
+        return result
+
+    @staticmethod
+    def _format_join_path(source: str, path: list[tuple[str, str, dict]]) -> dict:
+        joins = []
+
+        for _, to_table, foreign_key in path:
+            conditions = [
+                f"{foreign_key['table']}.{column} = {foreign_key['referred_table']}.{referred_column}"
+                for column, referred_column in zip(foreign_key["columns"], foreign_key["referred_columns"])
+            ]
+
+            joins.append({
+                "table": to_table,
+                "on": " AND ".join(conditions)
+            })
+
+        return {
+            "tables": [source, *(join["table"] for join in joins)],
+            "joins": joins
+        }
+
+    def get_execute_query_response(self, query, params, output_format=None):
         query = self._request_context.get_parameter("query", query)
         params = self._request_context.get_parameter("params", params)
-            
+        output_format = self._request_context.get_parameter("output_format", output_format)
+
+        result = self._get_statement_response(
+            query,
+            params,
+            self._get_output_format(output_format),
+            self._request_context.execute_query_max_chars
+        )
+
+        return result
+
+    def get_batch_statements(self, statements) -> list[tuple[str, Any]]:
+        """Validate the statements of a batch, each is either a query or an object with a query and its params"""
+        statements = self._request_context.get_parameter("statements", statements)
+
+        if not statements:
+            raise ValueError("At least one statement is required")
+
+        if len(statements) > MAX_BATCH_STATEMENTS:
+            raise ValueError(f"A batch is limited to {MAX_BATCH_STATEMENTS} statements, got {len(statements)}")
+
+        batch_statements = []
+
+        for statement in statements:
+            if isinstance(statement, str):
+                batch_statements.append((statement, None))
+
+            elif isinstance(statement, dict) and statement.get("query"):
+                batch_statements.append((statement["query"], statement.get("params")))
+
+            else:
+                raise ValueError(f"Invalid statement: {statement}, expected a query or an object with query and params")
+
+        return batch_statements
+
+    def get_batch_max_chars(self, statement_count: int) -> int:
+        """The output limit is shared by the statements of a batch"""
+        return max(self._request_context.execute_query_max_chars // statement_count, 1)
+
+    def get_execute_batch_response(self, statements: list[tuple[str, Any]], output_format=None) -> list[dict]:
+        """Run the statements one after another on a single pooled connection"""
+        output_format = self._get_output_format(output_format)
+        execute_query_max_chars = self.get_batch_max_chars(len(statements))
+
+        with self._call_metrics.measure(PHASE_CONNECT):
+            connection = self._request_context.db_context.connect()
+
+        try:
+            results = [
+                self.get_batch_statement_response(query, params, execute_query_max_chars, output_format, connection)
+                for query, params in statements
+            ]
+
+        finally:
+            connection.close()
+
+        return results
+
+    def get_batch_statement_response(self, query, params, execute_query_max_chars: int, output_format=None,
+                                     connection=None) -> dict:
+        """
+        Result of a single statement of a batch, runs on the given connection or checks out one of its own,
+        truncated results are closed rather than kept open for fetch_more
+        """
+        started = time.perf_counter()
+
+        result = self._get_statement_response(
+            query,
+            params,
+            self._get_output_format(output_format),
+            execute_query_max_chars,
+            connection,
+            allow_continuation=False
+        )
+
+        # Copied, the result might be shared with the result cache
+        result = {**result, "duration_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+        return result
+
+    def _get_output_format(self, output_format: str | None) -> str:
+        if output_format:
+            output_format = get_output_format(output_format)
+
+        else:
+            output_format = self._request_context.execute_query_format
+
+        return output_format
+
+    def _get_statement_response(self, query, params, output_format: str, execute_query_max_chars: int,
+                                connection=None, allow_continuation: bool = True) -> dict:
+        """Execute a query on the given connection, or on a connection checked out (and returned) for it"""
         result = {
             "query": query,
             "params": params
         }
 
-        execute_query_max_chars = self._request_context.execute_query_max_chars
+        execute_query_batch_size = self._request_context.execute_query_batch_size
+
+        columnar = output_format == OUTPUT_FORMAT_COLUMNAR
+        include_column_types = columnar and self._request_context.execute_query_column_types
+
+        connection_id = self._request_context.connection_id
+        is_read_only = is_read_only_query(query)
+        is_cacheable = is_cacheable_query(query)
+        is_shared_connection = connection is not None
+        result_cache_key = None
+
+        if is_cacheable and RESULT_CACHE.is_enabled:
+            result_cache_key = RESULT_CACHE.get_key(
+                connection_id,
+                query,
+                params,
+                execute_query_max_chars,
+                self._request_context.execute_query_exact_count,
+                output_format,
+                include_column_types
+            )
+
+            cached_result = RESULT_CACHE.get(result_cache_key)
+
+            if cached_result is not None:
+                logger.info(f"Query '{query}' served from the result cache")
+
+                return {**cached_result, **result, "cached": True}
+
+        # A pending read of the tenant holds locks (e.g. SQLite's shared lock) its writes would wait for
+        if not is_read_only:
+            closed_cursors = CURSOR_STORE.close_tenant(connection_id)
+
+            if closed_cursors:
+                logger.info(f"Closed {closed_cursors:,.0f} open cursors before executing a write statement")
 
         try:
             logger.info(f"Executing query '{query}', params: {params}")
 
-            cursor = self._request_context.db_context.execute_query(query, params)
-            
-            if cursor.returns_rows:
-                data = self._format_query_execution_result(cursor, execute_query_max_chars)
-                
-                result.update(data)
+            db_context = self._request_context.db_context
+
+            if not is_shared_connection:
+                with self._call_metrics.measure(PHASE_CONNECT):
+                    connection = db_context.connect()
+
+            try:
+                with self._statement_guard.run(connection):
+                    with self._call_metrics.measure(PHASE_EXECUTE):
+                        cursor = db_context.execute_query(
+                            connection,
+                            query,
+                            params,
+                            execute_query_batch_size,
+                            is_shared_connection
+                        )
+
+                    if cursor.returns_rows:
+                        data = {}
+                        first_batch = []
+
+                        if columnar:
+                            data["columns"] = list(cursor.keys())
+
+                        if include_column_types:
+                            # Drivers that don't describe the column types (e.g. SQLite) fall back to the values
+                            with self._call_metrics.measure(PHASE_FETCH):
+                                first_batch = cursor.fetchmany(execute_query_batch_size)
+
+                            data["column_types"] = self._get_column_types(cursor, first_batch)
+
+                            self._call_metrics.add_rows(len(first_batch), 0)
+
+                        rows, total_rows, remaining_rows = self._format_query_execution_result(
+                            cursor,
+                            execute_query_max_chars,
+                            execute_query_batch_size,
+                            first_batch,
+                            columnar=columnar
+                        )
+
+                        total_rows += len(first_batch)
+
+                        truncated = len(remaining_rows) > 0
+
+                        data.update({
+                            "rows": rows,
+                            "response_rows": len(rows),
+                            "total_rows": total_rows,
+                            "total_rows_exact": not truncated,
+                            "truncated": truncated
+                        })
+
+                        if truncated and self._request_context.execute_query_exact_count:
+                            if is_shared_connection:
+                                # The rest of the rows are not needed, the connection is free once closed
+                                cursor.close()
+
+                            total_rows = self._count_query_rows(
+                                query,
+                                params,
+                                connection if is_shared_connection else None
+                            )
+
+                            if total_rows is not None:
+                                data["total_rows"] = total_rows
+                                data["total_rows_exact"] = True
+
+                        if truncated and allow_continuation and not is_shared_connection and CURSOR_STORE.is_enabled:
+                            open_cursor = OpenCursor(
+                                self._request_context.connection_id,
+                                connection,
+                                cursor,
+                                remaining_rows,
+                                len(rows),
+                                output_format
+                            )
+
+                            data["continuation_token"] = CURSOR_STORE.add(open_cursor)
+
+                            # The cursor store owns the connection from now on
+                            connection = None
+
+                        else:
+                            cursor.close()
+
+                        result.update(data)
+
+            finally:
+                if connection is not None and not is_shared_connection:
+                    db_context.close_connection(connection)
 
             logger.info(f"Query '{query}' executed successfully")
 
@@ -65,39 +364,267 @@ class ResponseFormatter:
 
             logger.error(f"Error executing query '{query}', params: {params}, Error: {str(e)}")
 
+            # A failed statement aborts the transaction on some databases, the next statements would fail as well
+            if is_shared_connection:
+                self._rollback(connection)
+
+        # Invalidated even on errors, a failing script might have applied some of its statements
+        if is_ddl_query(query):
+            self._request_context.db_context.invalidate_metadata()
+
+        # Functions called by a read-only query (e.g. user defined ones) might write as well
+        if not is_cacheable and RESULT_CACHE.is_enabled:
+            RESULT_CACHE.invalidate(connection_id)
+
+        elif result_cache_key is not None:
+            result["cached"] = False
+
+            # Errors might be transient and continuation tokens can only be used once
+            if "error" not in result and "continuation_token" not in result:
+                RESULT_CACHE.set(result_cache_key, result)
+
         return result
 
-    def _format_query_execution_result(self, cursor, execute_query_max_chars):
-        """Format rows in a clean vertical format"""
+    def _count_query_rows(self, query, params, connection=None) -> int | None:
+        """
+        Exact number of rows of a query, None when it can't be counted (e.g. a PRAGMA or an ORDER BY that is not
+        allowed in a subquery), the rows already fetched are returned with their lower bound instead
+        """
+        db_context = self._request_context.db_context
+
+        try:
+            if connection is not None:
+                return db_context.count_query_rows(connection, query, params)
+
+            # Counted on another connection, some drivers can't run a query while streaming
+            with db_context.connect() as count_connection:
+                with self._statement_guard.run(count_connection):
+                    return db_context.count_query_rows(count_connection, query, params)
+
+        except Exception as ex:
+            logger.warning(f"Failed to count the rows of query '{query}', the total is a lower bound, Error: {ex}")
+
+            # The failed count aborts the transaction on some databases, the next statements of a batch would fail
+            if connection is not None:
+                self._rollback(connection)
+
+            return None
+
+    @staticmethod
+    def _rollback(connection):
+        try:
+            if connection.in_transaction():
+                connection.rollback()
+
+        except Exception as ex:
+            logger.warning(f"Failed to roll back the connection, Error: {ex}")
+
+    def get_invalidate_metadata_cache_response(self):
+        metadata_cache = self._request_context.db_context.metadata_cache
+
+        self._request_context.db_context.invalidate_metadata()
+
+        result = {
+            "invalidated": True,
+            "metadata_cache": metadata_cache.get_statistics()
+        }
+
+        return result
+
+    def get_fetch_more_response(self, continuation_token):
+        continuation_token = self._request_context.get_parameter("continuation_token", continuation_token)
+
+        result = {
+            "continuation_token": continuation_token
+        }
+
+        open_cursor = CURSOR_STORE.pop(continuation_token, self._request_context.connection_id)
+
+        if open_cursor is None:
+            result["error"] = "Unknown or expired continuation token, execute the query again"
+
+            return result
+
+        try:
+            logger.info(f"Fetching more rows from row {open_cursor.row_offset:,.0f}")
+
+            columnar = open_cursor.output_format == OUTPUT_FORMAT_COLUMNAR
+
+            # At least one row is returned, otherwise a row longer than the output limit would never be reached
+            with self._statement_guard.run(open_cursor.connection):
+                rows, _, remaining_rows = self._format_query_execution_result(
+                    open_cursor.cursor,
+                    self._request_context.execute_query_max_chars,
+                    self._request_context.execute_query_batch_size,
+                    open_cursor.pending_rows,
+                    min_rows=1,
+                    columnar=columnar
+                )
+
+            truncated = len(remaining_rows) > 0
+
+            data = {}
+
+            if columnar:
+                data["columns"] = list(open_cursor.cursor.keys())
+
+            data.update({
+                "rows": rows,
+                "response_rows": len(rows),
+                "row_offset": open_cursor.row_offset,
+                "truncated": truncated
+            })
+
+            if truncated:
+                open_cursor.pending_rows = remaining_rows
+                open_cursor.row_offset += len(rows)
+
+                CURSOR_STORE.add(open_cursor, continuation_token)
+
+            else:
+                open_cursor.close()
+
+                data["continuation_token"] = None
+
+            result.update(data)
+
+        except Exception as e:
+            open_cursor.close()
+
+            result["error"] = str(e)
+
+            logger.error(f"Error fetching more rows, Error: {str(e)}")
+
+        return result
+
+    def _format_query_execution_result(self, cursor, execute_query_max_chars, execute_query_batch_size,
+                                       pending_rows: list | None = None, min_rows: int = 0, columnar: bool = False):
+        """
+        Format rows in a clean vertical format (or as arrays of values when columnar, the column names are sent once),
+        fetched in batches and stops once the output limit is reached,
+        returns the formatted rows, the number of rows fetched (excluding pending rows) and the rows fetched but not
+        returned
+        """
         rows = []
         content_length = 0
-        total_rows = 0
+        remaining_rows = []
 
-        while row := cursor.fetchone():
-            total_rows += 1
-            
-            if content_length > execute_query_max_chars:
-                continue
-            
-            row_data = {}
-
-            for col, val in zip(cursor.keys(), row):
-                row_data[col] = self._format_value(val)
-                
-            content_length += len(json.dumps(row_data))
-                
-            if content_length > execute_query_max_chars:
-                continue
-            
-            rows.append(row_data)
-            
-        data = {
-            "rows": rows,
-            "response_rows": len(rows),
-            "total_rows": total_rows,            
-        }        
+        started = time.perf_counter()
+        fetch_duration = 0.0
 
-        return data
+        columns = list(cursor.keys())
+        row_length = self._get_row_json_length_overhead(columns, columnar)
+
+        # The column names are part of the output once, rather than in every row
+        if columnar:
+            content_length = self._get_row_json_length_overhead(columns)
+
+        value_formatters = self._value_formatters
+
+        if pending_rows:
+            batch = pending_rows
+            total_rows = 0
+
+        else:
+            fetch_started = time.perf_counter()
+            batch = cursor.fetchmany(execute_query_batch_size)
+            fetch_duration += time.perf_counter() - fetch_started
+
+            total_rows = len(batch)
+
+        while batch:
+            for index, row in enumerate(batch):
+                row_values = [
+                    (value_formatters.get(val.__class__) or self._get_value_formatter(val.__class__))(val)
+                    for val in row
+                ]
+
+                # Same length as json.dumps of the row, without serializing the whole row again
+                content_length += row_length + sum(map(len, map(encode_basestring_ascii, row_values)))
+
+                if content_length > execute_query_max_chars and len(rows) >= min_rows:
+                    remaining_rows = batch[index:]
+                    break
+
+                rows.append(row_values if columnar else dict(zip(columns, row_values)))
+
+            if remaining_rows:
+                break
+
+            fetch_started = time.perf_counter()
+            batch = cursor.fetchmany(execute_query_batch_size)
+            fetch_duration += time.perf_counter() - fetch_started
+
+            total_rows += len(batch)
+
+        self._call_metrics.add_phase(PHASE_FETCH, fetch_duration)
+        self._call_metrics.add_phase(PHASE_FORMAT, time.perf_counter() - started - fetch_duration)
+
+        self._call_metrics.add_rows(total_rows, len(rows))
+
+        return rows, total_rows, remaining_rows
+
+    @staticmethod
+    def _get_row_json_length_overhead(columns: list[str], columnar: bool = False) -> int:
+        """Length of a row serialized by json.dumps, excluding its values"""
+        braces_length = 2
+        separators_length = 2 * max(len(columns) - 1, 0)
+
+        if columnar:
+            return braces_length + separators_length
+
+        keys_length = sum(len(encode_basestring_ascii(column)) + len(": ") for column in columns)
+
+        return braces_length + separators_length + keys_length
+
+    @staticmethod
+    def _get_column_types(cursor, rows: list) -> list[str | None]:
+        """Column types as described by the driver, otherwise the type of the first value that is not NULL"""
+        description = cursor.cursor.description or []
+
+        column_types = []
+
+        for index, column_description in enumerate(description):
+            type_code = column_description[1]
+
+            if type_code is None:
+                value = next((row[index] for row in rows if row[index] is not None), None)
+
+                column_type = None if value is None else value.__class__.__name__
+
+            elif isinstance(type_code, type):
+                column_type = type_code.__name__
+
+            else:
+                column_type = str(type_code)
+
+            column_types.append(column_type)
+
+        return column_types
+
+    @classmethod
+    def _get_value_formatter(cls, value_type: type) -> Callable[[Any], str]:
+        """Resolve the formatter of a value type once, equivalent to _format_value"""
+        if value_type is type(None):
+            formatter = cls._format_null
+
+        elif issubclass(value_type, (datetime, date)):
+            formatter = cls._format_iso
+
+        else:
+            formatter = str
+
+        cls._value_formatters[value_type] = formatter
+
+        return formatter
+
+    @staticmethod
+    def _format_null(_val) -> str:
+        return "NULL"
+
+    @staticmethod
+    def _format_iso(val) -> str:
+        return val.isoformat()
 
     @staticmethod
     def _format_value(val) -> str:
@@ -126,12 +653,10 @@ class ResponseFormatter:
             data["relationships"] = []
 
             # Process columns
+            # Columns are not modified, they might be shared by the metadata cache
             for column in columns:
-                if "comment" in column:
-                    del column["comment"]
+                name = column["name"]
 
-                name = column.pop("name")
-                
                 column_data = {
                     "name": name
                 }
@@ -139,9 +664,12 @@ class ResponseFormatter:
                 if name in primary_keys:
                     column_data["primary_key"] = True
 
-                column_data["type"] = str(column.pop("type"))
-                
+                column_data["type"] = str(column["type"])
+
                 for key, value in column.items():
+                    if key in SCHEMA_COLUMN_EXCLUDED_KEYS:
+                        continue
+
                     if value:
                         column_data[key] = value
 
@@ -152,7 +680,7 @@ class ResponseFormatter:
                 data["relationships"] = [
                     {
                         "constrained_columns": fk['constrained_columns'],
-                        "referred_table": fk['referred_table'],
+                        "referred_table": get_qualified_name(fk.get('referred_schema'), fk['referred_table']),
                         "referred_columns": fk['referred_columns']
                     }
                     for fk in foreign_keys
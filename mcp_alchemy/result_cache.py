@@ -0,0 +1,136 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Hashable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.serialization import dumps
+
+logger = get_logger(__name__)
+
+DEFAULT_RESULT_CACHE_TTL = 0
+DEFAULT_RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class QueryResultCache:
+    """
+    LRU cache of execute_query responses for cacheable queries (see is_cacheable_query), bounded by the size of the
+    cached responses, all entries of a tenant are invalidated once it runs a statement that might write
+    """
+    _lock: threading.Lock
+    _entries: OrderedDict[Hashable, tuple[float, int, dict]]
+    _size: int
+    ttl: int
+    max_bytes: int
+    _hits: int
+    _misses: int
+    _evictions: int
+    _invalidations: int
+
+    def __init__(self, ttl: int = DEFAULT_RESULT_CACHE_TTL, max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def configure(self, ttl: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def get_key(connection_id: str, query: str, params, *options) -> Hashable:
+        """The exact query text, whitespace within string literals and quoted identifiers is significant"""
+        normalized_params = dumps(params, sort_keys=True)
+
+        return connection_id, query, normalized_params, options
+
+    def get(self, key: Hashable) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expires_at, _, result = entry
+
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+
+                    return result
+
+                self._remove(key)
+
+            self._misses += 1
+
+        return None
+
+    def set(self, key: Hashable, result: dict):
+        size = len(dumps(result))
+
+        # A single response larger than the whole cache would evict everything else
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, size, result)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                evicted_key = next(iter(self._entries))
+
+                self._remove(evicted_key)
+                self._evictions += 1
+
+    def invalidate(self, connection_id: str):
+        with self._lock:
+            tenant_keys = [
+                key
+                for key in self._entries
+                if key[0] == connection_id
+            ]
+
+            for key in tenant_keys:
+                self._remove(key)
+
+            self._invalidations += 1
+
+        if tenant_keys:
+            logger.info(f"Invalidated {len(tenant_keys):,.0f} cached query results")
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+
+        self._size -= size
+
+    def get_statistics(self) -> dict:
+        with self._lock:
+            statistics = {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+        return statistics
+
+
+RESULT_CACHE = QueryResultCache()
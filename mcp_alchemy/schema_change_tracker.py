@@ -0,0 +1,192 @@
+import threading
+
+from typing import Callable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+from sqlalchemy import Connection, bindparam, text
+
+logger = get_logger(__name__)
+
+# Tables looked up per catalog query, Oracle limits IN lists to 1,000 items
+STAMP_QUERY_BATCH_SIZE = 500
+
+# Columns, defaults, comments and constraints of a table are catalog rows, any DDL changes the xmin of one of them
+POSTGRESQL_STAMP_QUERY = text("""
+    SELECT c.relname, concat_ws(':',
+        c.xmin::text,
+        (SELECT max(a.xmin::text::bigint) FROM pg_attribute a WHERE a.attrelid = c.oid),
+        (SELECT count(*) || '/' || coalesce(max(d.xmin::text::bigint), 0)
+         FROM pg_attrdef d WHERE d.adrelid = c.oid),
+        (SELECT count(*) || '/' || coalesce(max(o.xmin::text::bigint), 0)
+         FROM pg_constraint o WHERE o.conrelid = c.oid),
+        (SELECT count(*) || '/' || coalesce(max(s.xmin::text::bigint), 0)
+         FROM pg_description s WHERE s.objoid = c.oid)
+    )
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = coalesce(CAST(:schema AS TEXT), current_schema()) AND c.relname IN :names
+""").bindparams(bindparam("names", expanding=True))
+
+# In-place ALTER TABLE keeps CREATE_TIME, the checksum of the column and foreign key definitions covers it
+MYSQL_STAMP_QUERY = text("""
+    SELECT t.TABLE_NAME, CONCAT_WS(':',
+        t.CREATE_TIME,
+        (SELECT CONCAT(COUNT(*), '/', SUM(CRC32(CONCAT_WS('|', c.COLUMN_NAME, c.ORDINAL_POSITION, c.COLUMN_TYPE,
+                                                          c.IS_NULLABLE, c.COLUMN_DEFAULT, c.EXTRA, c.COLUMN_COMMENT))))
+         FROM information_schema.COLUMNS c
+         WHERE c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME),
+        (SELECT CONCAT(COUNT(*), '/', COALESCE(SUM(CRC32(CONCAT_WS('|', k.CONSTRAINT_NAME, k.COLUMN_NAME,
+                                                                   k.REFERENCED_TABLE_NAME,
+                                                                   k.REFERENCED_COLUMN_NAME))), 0))
+         FROM information_schema.KEY_COLUMN_USAGE k
+         WHERE k.TABLE_SCHEMA = t.TABLE_SCHEMA AND k.TABLE_NAME = t.TABLE_NAME)
+    )
+    FROM information_schema.TABLES t
+    WHERE t.TABLE_SCHEMA = COALESCE(:schema, DATABASE()) AND t.TABLE_NAME IN :names
+""").bindparams(bindparam("names", expanding=True))
+
+ORACLE_STAMP_QUERY = text("""
+    SELECT OBJECT_NAME, TO_CHAR(MAX(LAST_DDL_TIME), 'YYYY-MM-DD HH24:MI:SS')
+    FROM ALL_OBJECTS
+    WHERE OWNER = COALESCE(:schema, SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'))
+      AND OBJECT_TYPE IN ('TABLE', 'VIEW', 'MATERIALIZED VIEW') AND OBJECT_NAME IN :names
+    GROUP BY OBJECT_NAME
+""").bindparams(bindparam("names", expanding=True))
+
+MSSQL_STAMP_QUERY = text("""
+    SELECT o.name, CONVERT(VARCHAR(30), o.modify_date, 126)
+    FROM sys.objects o JOIN sys.schemas s ON s.schema_id = o.schema_id
+    WHERE s.name = COALESCE(:schema, SCHEMA_NAME()) AND o.type IN ('U', 'V') AND o.name IN :names
+""").bindparams(bindparam("names", expanding=True))
+
+
+class SchemaChangeTracker:
+    """
+    Change stamps of the reflected tables, read from the catalog of the database (e.g. PostgreSQL's xmin of the
+    catalog rows, SQLite's schema_version, Oracle's LAST_DDL_TIME). Expired metadata whose stamp did not change is
+    kept, only changed tables are reflected again. Dialects without change stamps reflect all expired tables.
+    """
+    _lock: threading.Lock
+    _stamps: dict[str, str]
+    _is_supported: bool
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stamps = {}
+        self._is_supported = True
+
+    def get_recorded_stamp(self, table_name: str) -> str | None:
+        return self._stamps.get(table_name)
+
+    def record(self, stamps: dict[str, str]):
+        with self._lock:
+            self._stamps.update(stamps)
+
+    def clear(self):
+        with self._lock:
+            self._stamps.clear()
+
+    def get_stamps(self, connection: Connection,
+                   table_keys: dict[str, tuple[str | None, str]]) -> dict[str, str] | None:
+        """Current stamps of the tables, None when the dialect has none, missing tables have no stamp"""
+        if not self._is_supported or not table_keys:
+            return None
+
+        get_schema_stamps = self._get_stamp_function(connection)
+
+        if get_schema_stamps is None:
+            self._is_supported = False
+
+            logger.debug(f"Change stamps are not supported by dialect {connection.dialect.name}")
+
+            return None
+
+        schema_table_names = {}
+
+        for table_name, (schema, name) in table_keys.items():
+            schema_table_names.setdefault(schema, {})[name] = table_name
+
+        stamps = {}
+
+        try:
+            for schema, names in schema_table_names.items():
+                schema_stamps = get_schema_stamps(connection, schema, list(names.keys()))
+
+                stamps.update({
+                    names[name]: stamp
+                    for name, stamp in schema_stamps.items()
+                    if name in names and stamp is not None
+                })
+
+        except Exception as ex:
+            # e.g. no access to the catalog, the failed statement must not break the reflection on this connection
+            self._is_supported = False
+
+            if connection.in_transaction():
+                connection.rollback()
+
+            logger.warning(f"Failed to read the change stamps, expired tables are reflected again, Error: {ex}")
+
+            return None
+
+        return stamps
+
+    def _get_stamp_function(self, connection: Connection) -> Callable | None:
+        stamp_functions = {
+            "sqlite": self._get_sqlite_stamps,
+            "postgresql": self._get_postgresql_stamps,
+            "mysql": self._get_mysql_stamps,
+            "mariadb": self._get_mysql_stamps,
+            "oracle": self._get_oracle_stamps,
+            "mssql": self._get_mssql_stamps
+        }
+
+        return stamp_functions.get(connection.dialect.name)
+
+    @staticmethod
+    def _get_sqlite_stamps(connection: Connection, schema: str | None, names: list[str]) -> dict[str, str]:
+        # Incremented by any schema change of the database file, its tables share the stamp
+        quoted_schema = connection.dialect.identifier_preparer.quote(schema or "main")
+
+        schema_version = connection.exec_driver_sql(f"PRAGMA {quoted_schema}.schema_version").scalar()
+
+        return {name: str(schema_version) for name in names}
+
+    @staticmethod
+    def _get_postgresql_stamps(connection: Connection, schema: str | None, names: list[str]) -> dict[str, str]:
+        return SchemaChangeTracker._query_stamps(connection, POSTGRESQL_STAMP_QUERY, schema, names)
+
+    @staticmethod
+    def _get_mysql_stamps(connection: Connection, schema: str | None, names: list[str]) -> dict[str, str]:
+        return SchemaChangeTracker._query_stamps(connection, MYSQL_STAMP_QUERY, schema, names)
+
+    @staticmethod
+    def _get_oracle_stamps(connection: Connection, schema: str | None, names: list[str]) -> dict[str, str]:
+        # Oracle stores unquoted names in upper case, SQLAlchemy reports them in lower case
+        dialect = connection.dialect
+
+        denormalized_names = {dialect.denormalize_name(name): name for name in names}
+        denormalized_schema = None if schema is None else dialect.denormalize_name(schema)
+
+        stamps = SchemaChangeTracker._query_stamps(
+            connection, ORACLE_STAMP_QUERY, denormalized_schema, list(denormalized_names.keys())
+        )
+
+        return {denormalized_names[name]: stamp for name, stamp in stamps.items()}
+
+    @staticmethod
+    def _get_mssql_stamps(connection: Connection, schema: str | None, names: list[str]) -> dict[str, str]:
+        return SchemaChangeTracker._query_stamps(connection, MSSQL_STAMP_QUERY, schema, names)
+
+    @staticmethod
+    def _query_stamps(connection: Connection, query, schema: str | None, names: list[str]) -> dict[str, str]:
+        stamps = {}
+
+        for index in range(0, len(names), STAMP_QUERY_BATCH_SIZE):
+            rows = connection.execute(query, {
+                "schema": schema,
+                "names": names[index:index + STAMP_QUERY_BATCH_SIZE]
+            })
+
+            stamps.update({name: None if stamp is None else str(stamp) for name, stamp in rows})
+
+        return stamps
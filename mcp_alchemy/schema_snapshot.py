@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from contextlib import closing
+from typing import Any
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.serialization import dumps
+
+logger = get_logger(__name__)
+
+SNAPSHOT_KEY_TABLE_NAMES = "table_names"
+SNAPSHOT_KEY_TABLE_CATALOG = "table_catalog"
+SNAPSHOT_KEY_TABLE_SCHEMA_PREFIX = "table_schema:"
+SNAPSHOT_KEY_TABLE_STAMP_PREFIX = "table_stamp:"
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Seconds to wait for another process (e.g. a worker) writing the same snapshot
+SNAPSHOT_LOCK_TIMEOUT = 5
+
+# Keys looked up per query, below the variable limit of older SQLite versions
+SNAPSHOT_QUERY_BATCH_SIZE = 500
+
+
+def get_table_schema_key(table_name: str) -> str:
+    return f"{SNAPSHOT_KEY_TABLE_SCHEMA_PREFIX}{table_name}"
+
+
+def get_table_stamp_key(table_name: str) -> str:
+    return f"{SNAPSHOT_KEY_TABLE_STAMP_PREFIX}{table_name}"
+
+
+class SchemaSnapshot:
+    """
+    Reflected metadata of a database persisted in a local SQLite file, so a new process (e.g. each stdio session)
+    starts with the schema of the previous one instead of reflecting it again. Values are stored as JSON, column types
+    and defaults as their SQL text, which is all the responses use.
+    """
+    path: str
+    _lock: threading.Lock
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshot_entries "
+                "(key TEXT PRIMARY KEY, version INTEGER NOT NULL, value TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        # Connections are short-lived, snapshots are used from the worker threads and the background validation
+        return closing(sqlite3.connect(self.path, timeout=SNAPSHOT_LOCK_TIMEOUT, isolation_level=None))
+
+    def get(self, key: str) -> Any:
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT value FROM snapshot_entries WHERE key = ? AND version = ?",
+                    (key, SNAPSHOT_FORMAT_VERSION)
+                ).fetchone()
+
+            return None if row is None else json.loads(row[0])
+
+        except (sqlite3.Error, ValueError) as ex:
+            # A corrupt snapshot is treated as empty, the metadata is reflected from the database instead
+            logger.warning(f"Failed to read from the schema snapshot {self.path}, Error: {ex}")
+
+            return None
+
+    def get_table_schemas(self, limit: int) -> dict[str, dict]:
+        """Schemas of the most recently saved tables"""
+        try:
+            with self._connect() as connection:
+                rows = connection.execute(
+                    "SELECT key, value FROM snapshot_entries WHERE key LIKE ? AND version = ? "
+                    "ORDER BY saved_at DESC LIMIT ?",
+                    (f"{SNAPSHOT_KEY_TABLE_SCHEMA_PREFIX}%", SNAPSHOT_FORMAT_VERSION, max(0, limit))
+                ).fetchall()
+
+            table_schemas = {
+                key[len(SNAPSHOT_KEY_TABLE_SCHEMA_PREFIX):]: json.loads(value)
+                for key, value in rows
+            }
+
+        except (sqlite3.Error, ValueError) as ex:
+            logger.warning(f"Failed to read the table schemas of the schema snapshot {self.path}, Error: {ex}")
+
+            return {}
+
+        return table_schemas
+
+    def get_table_stamps(self, table_names: list[str]) -> dict[str, str]:
+        """Change stamps of the tables when their schemas were saved, see SchemaChangeTracker"""
+        table_stamps = {}
+
+        try:
+            with self._connect() as connection:
+                for index in range(0, len(table_names), SNAPSHOT_QUERY_BATCH_SIZE):
+                    keys = [
+                        get_table_stamp_key(table_name)
+                        for table_name in table_names[index:index + SNAPSHOT_QUERY_BATCH_SIZE]
+                    ]
+
+                    placeholders = ", ".join("?" * len(keys))
+
+                    rows = connection.execute(
+                        f"SELECT key, value FROM snapshot_entries WHERE version = ? AND key IN ({placeholders})",
+                        (SNAPSHOT_FORMAT_VERSION, *keys)
+                    ).fetchall()
+
+                    table_stamps.update({
+                        key[len(SNAPSHOT_KEY_TABLE_STAMP_PREFIX):]: json.loads(value)
+                        for key, value in rows
+                    })
+
+        except (sqlite3.Error, ValueError) as ex:
+            # Without stamps the tables of the snapshot are reflected again while validating it
+            logger.warning(f"Failed to read the table stamps of the schema snapshot {self.path}, Error: {ex}")
+
+            return {}
+
+        return table_stamps
+
+    def save(self, entries: dict[str, Any]):
+        if not entries:
+            return
+
+        saved_at = time.time()
+
+        rows = [
+            (key, SNAPSHOT_FORMAT_VERSION, dumps(value), saved_at)
+            for key, value in entries.items()
+        ]
+
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute("BEGIN")
+                connection.executemany("INSERT OR REPLACE INTO snapshot_entries VALUES (?, ?, ?, ?)", rows)
+                connection.execute("COMMIT")
+
+        except sqlite3.Error as ex:
+            logger.warning(f"Failed to save the schema snapshot {self.path}, Error: {ex}")
+
+    def delete(self, keys: list[str]):
+        if not keys:
+            return
+
+        try:
+            with self._lock, self._connect() as connection:
+                connection.executemany("DELETE FROM snapshot_entries WHERE key = ?", [(key,) for key in keys])
+
+        except sqlite3.Error as ex:
+            logger.warning(f"Failed to delete from the schema snapshot {self.path}, Error: {ex}")
+
+    def clear(self):
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute("DELETE FROM snapshot_entries")
+
+        except sqlite3.Error as ex:
+            logger.warning(f"Failed to clear the schema snapshot {self.path}, Error: {ex}")
+
+
+class SchemaSnapshotStore:
+    """Directory of the schema snapshots, a file per database named by the hash of its URL"""
+    directory: str | None
+
+    def __init__(self):
+        self.directory = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.directory)
+
+    def configure(self, directory: str | None):
+        self.directory = os.path.expanduser(directory) if directory else None
+
+    def get_snapshot(self, connection_id: str) -> SchemaSnapshot | None:
+        if not self.is_enabled:
+            return None
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            return SchemaSnapshot(os.path.join(self.directory, f"{connection_id}.sqlite"))
+
+        except (OSError, sqlite3.Error) as ex:
+            logger.warning(f"Schema snapshots are not available in {self.directory}, Error: {ex}")
+
+            return None
+
+
+SCHEMA_SNAPSHOT_STORE = SchemaSnapshotStore()
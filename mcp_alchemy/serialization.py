@@ -0,0 +1,93 @@
+import json
+
+from datetime import date, datetime, time
+from typing import Any
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+JSON_BACKEND_ORJSON = "orjson"
+JSON_BACKEND_MSGSPEC = "msgspec"
+JSON_BACKEND_JSON = "json"
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+
+except ImportError:
+    msgspec = None
+
+
+def _default(value: Any) -> Any:
+    """
+    Values the JSON backends don't serialize natively, formatted as the values of execute_query rows (ISO dates,
+    otherwise str). Tools format their values before (e.g. ResponseFormatter), this only covers the remaining ones
+    such as the SQLAlchemy types of reflected schemas.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    return str(value)
+
+
+def _dumps_json(data: Any, sort_keys: bool = False) -> str:
+    # Compact and not escaping non-ASCII characters, the same output as orjson and msgspec
+    return json.dumps(data, default=_default, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":"))
+
+
+JSON_BACKENDS = {
+    JSON_BACKEND_JSON: _dumps_json
+}
+
+if orjson is not None:
+    # Datetimes are formatted by _default like with the other backends, orjson would format them itself
+    _ORJSON_OPTION = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _dumps_orjson(data: Any, sort_keys: bool = False) -> str:
+        option = _ORJSON_OPTION | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+        try:
+            return orjson.dumps(data, default=_default, option=option).decode()
+
+        # e.g. integers beyond 64 bits
+        except orjson.JSONEncodeError:
+            return _dumps_json(data, sort_keys)
+
+    JSON_BACKENDS[JSON_BACKEND_ORJSON] = _dumps_orjson
+
+if msgspec is not None:
+    _ENCODER = msgspec.json.Encoder(enc_hook=_default, decimal_format="string")
+    _SORTED_ENCODER = msgspec.json.Encoder(enc_hook=_default, decimal_format="string", order="sorted")
+
+    def _dumps_msgspec(data: Any, sort_keys: bool = False) -> str:
+        encoder = _SORTED_ENCODER if sort_keys else _ENCODER
+
+        try:
+            return encoder.encode(data).decode()
+
+        except (msgspec.EncodeError, OverflowError, TypeError):
+            return _dumps_json(data, sort_keys)
+
+    JSON_BACKENDS[JSON_BACKEND_MSGSPEC] = _dumps_msgspec
+
+JSON_BACKEND = next(
+    json_backend
+    for json_backend in (JSON_BACKEND_ORJSON, JSON_BACKEND_MSGSPEC, JSON_BACKEND_JSON)
+    if json_backend in JSON_BACKENDS
+)
+
+_dumps = JSON_BACKENDS[JSON_BACKEND]
+
+
+def dumps(data: Any, sort_keys: bool = False) -> str:
+    """Serialize to JSON with the fastest installed backend (orjson, msgspec or the standard library)"""
+    return _dumps(data, sort_keys)
@@ -1,13 +1,32 @@
-import json
+import asyncio
+import os
+import sys
 import threading
+import time
 
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.fastmcp.utilities.logging import get_logger
-
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from mcp_alchemy.cursor_store import CURSOR_STORE, WORKER_INDEX_ENV_VAR
+from mcp_alchemy.admission_controller import AdmissionController
+from mcp_alchemy.database_executor import DatabaseExecutor
+from mcp_alchemy.engine_registry import ENGINE_REGISTRY
+from mcp_alchemy.foreign_key_graph import DEFAULT_JOIN_PATH_MAX_HOPS, DEFAULT_JOIN_PATH_MAX_PATHS
 from mcp_alchemy.mcp_args import MCPServerArguments
 from mcp_alchemy.mcp_tools import MCPTool
+from mcp_alchemy.metrics import METRICS, CONTENT_TYPE, PHASE_SERIALIZE, CallbackGauge, CallMetrics
+from mcp_alchemy.pool_manager import POOL_MANAGER
+from mcp_alchemy.query_classifier import is_read_only_query
 from mcp_alchemy.request_context import RequestContext, SUPPORTED_HEADERS, SUPPORTED_ENV_VARS
 from mcp_alchemy.response_formatter import ResponseFormatter
+from mcp_alchemy.result_cache import RESULT_CACHE
+from mcp_alchemy.schema_snapshot import SCHEMA_SNAPSHOT_STORE
+from mcp_alchemy.serialization import JSON_BACKEND, dumps
+from mcp_alchemy.statement_guard import StatementGuard
+from mcp_alchemy.table_catalog import DEFAULT_TABLE_SEARCH_LIMIT
+from mcp_alchemy.tenant_profile import PARAM_DB_URL
 
 def tests_set_global(k, v):
     globals()[k] = v
@@ -22,9 +41,109 @@ ARGS = MCPServerArguments.load(IS_ENTRYPOINT)
 
 mcp = FastMCP(ARGS.name, host=ARGS.host, port=ARGS.port, debug=ARGS.debug, stateless_http=ARGS.stateless_http)
 
+ADMISSION_CONTROLLER = AdmissionController(
+    ARGS.max_workers,
+    ARGS.max_tenant_concurrency,
+    ARGS.max_queue_size,
+    ARGS.max_tenant_queue_size,
+    ARGS.queue_timeout
+)
+
+DATABASE_EXECUTOR = DatabaseExecutor(ARGS.max_workers, ADMISSION_CONTROLLER)
+
+ENGINE_REGISTRY.configure_metadata_cache(ARGS.metadata_cache_ttl, ARGS.metadata_cache_max_size)
+ENGINE_REGISTRY.configure_idle_timeout(ARGS.close_unused_connections_interval)
+
+SCHEMA_SNAPSHOT_STORE.configure(ARGS.schema_snapshot_dir)
+
+POOL_MANAGER.configure(ARGS.max_connections, ARGS.max_tenant_connections)
+
+CURSOR_STORE.configure(
+    ARGS.cursor_ttl,
+    ARGS.max_open_cursors,
+    ARGS.max_open_cursors_per_tenant,
+    os.environ.get(WORKER_INDEX_ENV_VAR)
+)
+
+RESULT_CACHE.configure(ARGS.result_cache_ttl, ARGS.result_cache_max_bytes)
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_pool_checked_out_connections",
+    "Pooled connections currently checked out",
+    ("tenant",),
+    lambda: {
+        (connection_id,): pool_statistics["checked_out"]
+        for connection_id, pool_statistics in ENGINE_REGISTRY.get_pool_statistics().items()
+    }
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_pool_size",
+    "Size of the connection pools",
+    ("tenant",),
+    lambda: {
+        (connection_id,): pool_statistics["size"]
+        for connection_id, pool_statistics in ENGINE_REGISTRY.get_pool_statistics().items()
+    }
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_pool_capacity",
+    "Maximum open connections of the connection pools, sized by the pool manager",
+    ("tenant",),
+    lambda: {
+        (connection_id,): pool_statistics["capacity"]
+        for connection_id, pool_statistics in POOL_MANAGER.get_pool_statistics().items()
+    }
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_pool_idle_connections",
+    "Open connections waiting in the connection pools",
+    ("tenant",),
+    lambda: {
+        (connection_id,): pool_statistics["idle"]
+        for connection_id, pool_statistics in POOL_MANAGER.get_pool_statistics().items()
+    }
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_pool_reserved_connections",
+    "Capacity of all managed connection pools, kept within --max-connections",
+    (),
+    lambda: {(): POOL_MANAGER.get_reserved_connections()}
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_admission_queue_depth",
+    "Database calls waiting in the admission queue",
+    ("tenant",),
+    lambda: {(connection_id,): depth for connection_id, depth in ADMISSION_CONTROLLER.get_queue_depth().items()}
+))
+
+METRICS.register(CallbackGauge(
+    "mcp_alchemy_admission_active_calls",
+    "Database calls currently running",
+    ("tenant",),
+    lambda: {(connection_id,): active for connection_id, active in ADMISSION_CONTROLLER.get_active_calls().items()}
+))
+
 logger.info(f"Starting MCP Alchemy [{ARGS.name}], Version: {VERSION}")
 logger.info(f"Transport: {ARGS.transport}")
-logger.info(f"DB Context clean interval (seconds): {ARGS.close_unused_connections_interval}")
+logger.info(f"DB Context idle timeout (seconds): {ARGS.close_unused_connections_interval}")
+logger.info(f"Database workers: {ARGS.max_workers}, Max concurrency per tenant: {ARGS.max_tenant_concurrency}")
+logger.info(f"Admission queue size: {ARGS.max_queue_size}, Per tenant: {ARGS.max_tenant_queue_size}, "
+            f"Timeout (seconds): {ARGS.queue_timeout}")
+logger.info(f"Max connections: {POOL_MANAGER.max_connections}, "
+            f"Per tenant: {POOL_MANAGER.max_tenant_connections}")
+logger.info(f"Metadata cache TTL (seconds): {ARGS.metadata_cache_ttl}, Max size: {ARGS.metadata_cache_max_size}")
+if SCHEMA_SNAPSHOT_STORE.is_enabled:
+    logger.info(f"Schema snapshot directory: {SCHEMA_SNAPSHOT_STORE.directory}")
+
+logger.info(f"Cursor TTL (seconds): {ARGS.cursor_ttl}, Max open cursors: {ARGS.max_open_cursors}, "
+            f"Max open cursors per tenant: {ARGS.max_open_cursors_per_tenant}")
+logger.info(f"JSON serialization: {JSON_BACKEND}")
+logger.info(f"Result cache TTL (seconds): {ARGS.result_cache_ttl}, Max bytes: {ARGS.result_cache_max_bytes:,.0f}")
 
 if ARGS.transport != "stdio":
     logger.info(f"Host: {ARGS.host}, Port: {ARGS.port}")
@@ -38,34 +157,72 @@ else:
 if ARGS.debug:
     logger.info(f"Running in debug mode")
 
+if ARGS.warm_up:
+    logger.info(f"Warm up enabled")
+
+
+def serialize_response(call_metrics: CallMetrics, data: dict) -> str:
+    with call_metrics.measure(PHASE_SERIALIZE):
+        result = dumps(data)
+
+    call_metrics.response_size = len(result)
+
+    # Database errors are reported within the response rather than raised
+    call_metrics.failed = "error" in data
+
+    return result
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(METRICS.render(), media_type=CONTENT_TYPE)
+
 
 @mcp.tool(description=MCPTool.all_table_names.to_description())
-def all_table_names(ctx: Context | None = None) -> str:
+async def all_table_names(ctx: Context | None = None) -> str:
     logger.info("Retrieving all table names")
 
     request_context = RequestContext.load(ctx)
 
-    all_tables = request_context.db_context.get_tables()
+    with METRICS.start_call(MCPTool.all_table_names, request_context.connection_id) as call_metrics:
+        all_tables = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            lambda: request_context.db_context.get_tables()
+        )
 
-    logger.info(f"{len(all_tables):,.0f} table available")
+        logger.info(f"{len(all_tables):,.0f} table available")
 
-    result = json.dumps({"tables": all_tables, "count": len(all_tables)})
+        result = serialize_response(call_metrics, {"tables": all_tables, "count": len(all_tables)})
 
     return result
 
 @mcp.tool(description=MCPTool.filter_table_names.to_description())
-def filter_table_names(q: str, ctx: Context | None = None) -> str:
+async def filter_table_names(q: str, limit: int = DEFAULT_TABLE_SEARCH_LIMIT, fuzzy: bool = False,
+                             ctx: Context | None = None) -> str:
     request_context = RequestContext.load(ctx)
 
     query = request_context.get_parameter("q", q)
 
     logger.info(f"Retrieving all table names containing '{query}'")
 
-    filtered_tables = request_context.db_context.get_tables(query)
-
-    logger.info(f"{len(filtered_tables):,.0f} table names containing '{query}'")
-
-    result = json.dumps({"tables": filtered_tables, "count": len(filtered_tables), "query": query})
+    with METRICS.start_call(MCPTool.filter_table_names, request_context.connection_id) as call_metrics:
+        filtered_tables, total_count = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            lambda: request_context.db_context.search_tables(query, limit, fuzzy)
+        )
+
+        logger.info(f"{total_count:,.0f} table names containing '{query}'")
+
+        result = serialize_response(
+            call_metrics,
+            {
+                "tables": filtered_tables,
+                "count": len(filtered_tables),
+                "total_count": total_count,
+                "truncated": total_count > len(filtered_tables),
+                "query": query
+            }
+        )
 
     return result
 
@@ -74,34 +231,216 @@ def filter_table_names(q: str, ctx: Context | None = None) -> str:
 async def schema_definitions(table_names: list[str], ctx: Context | None = None) -> str:
     request_context = RequestContext.load(ctx)
 
-    response_parser = ResponseFormatter(request_context)
+    with METRICS.start_call(MCPTool.schema_definitions, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics)
 
-    data = response_parser.get_schema_list_response(table_names)
-    
-    result = json.dumps(data)
+        data = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            response_parser.get_schema_list_response,
+            table_names
+        )
+
+        result = serialize_response(call_metrics, data)
+
+    return result
+
+@mcp.tool(description=MCPTool.join_path.to_description())
+async def join_path(table_names: list[str], max_hops: int = DEFAULT_JOIN_PATH_MAX_HOPS,
+                    max_paths: int = DEFAULT_JOIN_PATH_MAX_PATHS, ctx: Context | None = None) -> str:
+    request_context = RequestContext.load(ctx)
+
+    with METRICS.start_call(MCPTool.join_path, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics)
+
+        data = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            response_parser.get_join_path_response,
+            table_names,
+            max_hops,
+            max_paths
+        )
+
+        result = serialize_response(call_metrics, data)
 
     return result
 
 @mcp.tool(description=MCPTool.execute_query.to_description())
-async def execute_query(query: str, params, ctx: Context | None = None) -> str:
+async def execute_query(query: str, params, output_format: str | None = None, timeout: float | None = None,
+                        ctx: Context | None = None) -> str:
     request_context = RequestContext.load(ctx)
 
-    response_parser = ResponseFormatter(request_context)
+    statement_guard = StatementGuard(request_context.get_statement_timeout(timeout))
 
-    data = response_parser.get_execute_query_response(query, params)
-    
-    result = json.dumps(data)
+    with METRICS.start_call(MCPTool.execute_query, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics, statement_guard)
+
+        data = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            response_parser.get_execute_query_response,
+            query,
+            params,
+            output_format,
+            on_cancel=statement_guard.cancel
+        )
+
+        result = serialize_response(call_metrics, data)
 
     return result
 
+@mcp.tool(description=MCPTool.execute_batch.to_description())
+async def execute_batch(statements: list[dict | str], parallel: bool = False, output_format: str | None = None,
+                        timeout: float | None = None, ctx: Context | None = None) -> str:
+    request_context = RequestContext.load(ctx)
+
+    statement_guard = StatementGuard(request_context.get_statement_timeout(timeout))
+
+    with METRICS.start_call(MCPTool.execute_batch, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics, statement_guard)
+
+        batch_statements = response_parser.get_batch_statements(statements)
+
+        # Statements might depend on the changes of the previous ones, only read-only batches run in parallel
+        run_parallel = parallel and all(is_read_only_query(query) for query, _ in batch_statements)
+
+        started = time.perf_counter()
+
+        if run_parallel:
+            execute_query_max_chars = response_parser.get_batch_max_chars(len(batch_statements))
+
+            # Bounded by the tenant's concurrency, a large batch must not fill the admission queue by itself
+            batch_semaphore = asyncio.Semaphore(ADMISSION_CONTROLLER.max_tenant_concurrency)
+
+            async def run_statement(query: str, params: dict | None):
+                async with batch_semaphore:
+                    return await DATABASE_EXECUTOR.run(
+                        request_context.connection_id,
+                        response_parser.get_batch_statement_response,
+                        query,
+                        params,
+                        execute_query_max_chars,
+                        output_format,
+                        on_cancel=statement_guard.cancel
+                    )
+
+            results = await asyncio.gather(*[
+                run_statement(query, params)
+                for query, params in batch_statements
+            ])
+
+        else:
+            results = await DATABASE_EXECUTOR.run(
+                request_context.connection_id,
+                response_parser.get_execute_batch_response,
+                batch_statements,
+                output_format,
+                on_cancel=statement_guard.cancel
+            )
+
+        data = {
+            "results": list(results),
+            "statements": len(results),
+            "errors": sum(1 for statement_result in results if "error" in statement_result),
+            "parallel": run_parallel,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+        result = serialize_response(call_metrics, data)
+
+    return result
+
+@mcp.tool(description=MCPTool.fetch_more.to_description())
+async def fetch_more(continuation_token: str, ctx: Context | None = None) -> str:
+    request_context = RequestContext.load(ctx)
+
+    statement_guard = StatementGuard(request_context.get_statement_timeout(None))
+
+    with METRICS.start_call(MCPTool.fetch_more, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics, statement_guard)
+
+        data = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            response_parser.get_fetch_more_response,
+            continuation_token,
+            on_cancel=statement_guard.cancel
+        )
+
+        result = serialize_response(call_metrics, data)
+
+    return result
+
+@mcp.tool(description=MCPTool.invalidate_metadata_cache.to_description())
+async def invalidate_metadata_cache(ctx: Context | None = None) -> str:
+    request_context = RequestContext.load(ctx)
+
+    with METRICS.start_call(MCPTool.invalidate_metadata_cache, request_context.connection_id) as call_metrics:
+        response_parser = ResponseFormatter(request_context, call_metrics)
+
+        data = await DATABASE_EXECUTOR.run(
+            request_context.connection_id,
+            response_parser.get_invalidate_metadata_cache_response
+        )
+
+        result = serialize_response(call_metrics, data)
+
+    return result
+
+
+def warm_up():
+    """Connect and load the table names and schemas of the DB_URL environment variable into the metadata cache"""
+    started = time.perf_counter()
+
+    try:
+        request_context = RequestContext.load()
+        db_context = request_context.db_context
+
+        table_names = db_context.get_tables()
+
+        # Schemas beyond the metadata cache size would only evict each other
+        db_context.get_schema_details(table_names[:max(ARGS.metadata_cache_max_size - 1, 0)])
+
+        duration = time.perf_counter() - started
+
+        logger.info(f"Warm up completed, Tables: {len(table_names):,.0f}, Duration (seconds): {duration:,.3f}")
+
+    except Exception as ex:
+        logger.warning(f"Warm up failed, Error: {ex}")
+
+def run_workers():
+    # Imported only here, a single process server does not need the HTTP client
+    from mcp_alchemy.worker_router import WorkerRouter, get_worker_args
+
+    logger.info(f"Workers: {ARGS.workers}")
+
+    router = WorkerRouter(ARGS.workers, get_worker_args(sys.argv[1:]), ARGS.max_workers)
+
+    try:
+        router.run(ARGS.host, ARGS.port)
+
+    except KeyboardInterrupt:
+        logger.info("KeyboardInterrupt received")
 
 def main():
+    if ARGS.workers > 1:
+        if ARGS.transport == "streamable-http":
+            run_workers()
+
+            return
+
+        logger.warning("Multiple workers are only supported by the streamable-http transport, running a single one")
+
     stop_event = threading.Event()
     
-    thread = threading.Thread(target=RequestContext.dispose_unused_connections, args=(stop_event,), daemon=True)
+    thread = threading.Thread(target=ENGINE_REGISTRY.run_reaper, args=(stop_event,), daemon=True)
+    cursor_thread = threading.Thread(target=CURSOR_STORE.run_expiry, args=(stop_event,), daemon=True)
+    pool_thread = threading.Thread(target=POOL_MANAGER.run, args=(stop_event,), daemon=True)
             
     try:
         thread.start()
+        cursor_thread.start()
+        pool_thread.start()
+
+        if ARGS.warm_up and os.environ.get(PARAM_DB_URL):
+            threading.Thread(target=warm_up, daemon=True).start()
         
         mcp.run(transport=ARGS.transport)
             
@@ -110,7 +449,12 @@ def main():
     
     finally:    
         stop_event.set()
+        ENGINE_REGISTRY.wake_reaper()
         thread.join()
+        cursor_thread.join()
+        pool_thread.join()
+
+        DATABASE_EXECUTOR.shutdown()
     
 
 if IS_ENTRYPOINT:
@@ -0,0 +1,207 @@
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy import Connection
+
+logger = get_logger(__name__)
+
+# Statement timeout currently set on a pooled (DBAPI) connection, kept in its info so it is only changed when needed
+CONNECTION_INFO_STATEMENT_TIMEOUT = "mcp_alchemy_statement_timeout"
+
+# SQLite virtual machine instructions between checks of the deadline
+SQLITE_PROGRESS_HANDLER_INSTRUCTIONS = 10_000
+
+
+class StatementTimeoutError(Exception):
+    pass
+
+
+class StatementCancelledError(Exception):
+    pass
+
+
+class StatementGuard:
+    """
+    Limits the duration of the statements of a tool call and cancels them once the call is cancelled (e.g. the client
+    disconnected), using the native statement timeout of the dialect and the driver's cancel otherwise
+    """
+    timeout: float | None
+    _lock: threading.Lock
+    _connections: set
+    _cancelled: bool
+
+    def __init__(self, timeout: float | None = None):
+        self.timeout = timeout if timeout else None
+
+        self._lock = threading.Lock()
+        self._connections = set()
+        self._cancelled = False
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    @contextmanager
+    def run(self, connection: "Connection"):
+        """Guard the statements executed (and rows fetched) on the connection within the context"""
+        if self._cancelled:
+            raise StatementCancelledError("The query was cancelled")
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        with self._lock:
+            self._connections.add(connection)
+
+        reset_timeout = self._apply_timeout(connection, deadline)
+
+        try:
+            yield
+
+        except (StatementTimeoutError, StatementCancelledError):
+            raise
+
+        except Exception as ex:
+            if self._cancelled:
+                raise StatementCancelledError("The query was cancelled") from ex
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise StatementTimeoutError(f"The query exceeded the timeout of {self.timeout:g} seconds") from ex
+
+            raise
+
+        finally:
+            with self._lock:
+                self._connections.discard(connection)
+
+            reset_timeout()
+
+    def cancel(self):
+        """Cancel the running statements, safe to call from any thread"""
+        with self._lock:
+            self._cancelled = True
+
+            connections = list(self._connections)
+
+        for connection in connections:
+            self._cancel_statement(connection)
+
+        if connections:
+            logger.info(f"Cancelled {len(connections):,.0f} running statements")
+
+    def _apply_timeout(self, connection: "Connection", deadline: float | None) -> Callable[[], None]:
+        dialect = connection.dialect
+
+        if dialect.name == "sqlite":
+            return self._apply_sqlite_timeout(connection, deadline)
+
+        if dialect.name == "postgresql":
+            timeout_ms = None if self.timeout is None else max(1, int(self.timeout * 1000))
+
+            if getattr(connection.connection.dbapi_connection, "autocommit", False):
+                self._set_session_timeout(connection, "statement_timeout", timeout_ms)
+
+            else:
+                self._set_transaction_timeout(connection, "statement_timeout", timeout_ms)
+
+        elif dialect.name in ("mysql", "mariadb"):
+            # MariaDB limits any statement in seconds, MySQL only SELECT statements in milliseconds
+            if getattr(dialect, "is_mariadb", False):
+                self._set_session_timeout(connection, "SESSION max_statement_time", self.timeout)
+
+            else:
+                timeout_ms = None if self.timeout is None else max(1, int(self.timeout * 1000))
+
+                self._set_session_timeout(connection, "SESSION MAX_EXECUTION_TIME", timeout_ms)
+
+        elif deadline is not None:
+            # No native statement timeout, the statement is cancelled through the driver once the deadline passed
+            timer = threading.Timer(deadline - time.monotonic(), self._cancel_statement, (connection,))
+            timer.daemon = True
+            timer.start()
+
+            return timer.cancel
+
+        return lambda: None
+
+    @staticmethod
+    def _set_session_timeout(connection: "Connection", setting: str, value):
+        """Set the session's timeout, only when changed since the pooled connection keeps it between checkouts"""
+        current_value = connection.info.get(CONNECTION_INFO_STATEMENT_TIMEOUT)
+
+        if current_value == value:
+            return
+
+        connection.exec_driver_sql(f"SET {setting} = {'DEFAULT' if value is None else value}")
+
+        connection.info[CONNECTION_INFO_STATEMENT_TIMEOUT] = value
+
+    @staticmethod
+    def _set_transaction_timeout(connection: "Connection", setting: str, value):
+        """
+        Set the timeout for the current transaction, on every call as the transaction rolls back a SET of the session,
+        it also overrides the session's timeout set while the connection was in autocommit mode
+        """
+        if value is None and connection.info.get(CONNECTION_INFO_STATEMENT_TIMEOUT) is None:
+            return
+
+        connection.exec_driver_sql(f"SET LOCAL {setting} = {'DEFAULT' if value is None else value}")
+
+    def _apply_sqlite_timeout(self, connection: "Connection", deadline: float | None) -> Callable[[], None]:
+        dbapi_connection = connection.connection.dbapi_connection
+
+        # Also stops statements once cancelled, SQLite runs them while fetching the rows
+        def progress_handler() -> int:
+            return int(self._cancelled or (deadline is not None and time.monotonic() >= deadline))
+
+        dbapi_connection.set_progress_handler(progress_handler, SQLITE_PROGRESS_HANDLER_INSTRUCTIONS)
+
+        def reset_timeout():
+            dbapi_connection.set_progress_handler(None, 0)
+
+        return reset_timeout
+
+    @staticmethod
+    def _cancel_statement(connection: "Connection"):
+        try:
+            dbapi_connection = connection.connection.dbapi_connection
+
+            if dbapi_connection is None:
+                return
+
+            if connection.dialect.name == "sqlite":
+                dbapi_connection.interrupt()
+
+            elif connection.dialect.name in ("mysql", "mariadb") and hasattr(dbapi_connection, "thread_id"):
+                # MySQL drivers can't cancel, the statement is killed from another connection. It is not checked out
+                # of the tenant's pool, which might be saturated, but opened by a pool of its own with the same options
+                kill_pool = connection.engine.pool.recreate()
+
+                try:
+                    kill_connection = kill_pool.connect()
+
+                    try:
+                        kill_cursor = kill_connection.cursor()
+                        kill_cursor.execute(f"KILL QUERY {int(dbapi_connection.thread_id())}")
+                        kill_cursor.close()
+
+                    finally:
+                        kill_connection.close()
+
+                finally:
+                    kill_pool.dispose()
+
+            elif hasattr(dbapi_connection, "cancel"):
+                # e.g. psycopg, psycopg2, oracledb
+                dbapi_connection.cancel()
+
+            else:
+                logger.warning(f"Cancelling statements is not supported by the {connection.dialect.driver} driver")
+
+        except Exception as ex:
+            logger.warning(f"Failed to cancel statement, Error: {ex}")
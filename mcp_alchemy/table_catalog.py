@@ -0,0 +1,276 @@
+import bisect
+import heapq
+import threading
+import time
+
+from collections import Counter
+from typing import Callable
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TABLE_SEARCH_LIMIT = 100
+
+# Minimum share of the query's trigrams a fuzzy match contains, as word_similarity of PostgreSQL's pg_trgm
+FUZZY_SIMILARITY_THRESHOLD = 0.5
+
+TRIGRAM_LENGTH = 3
+
+
+def get_trigrams(value: str, padded: bool = False) -> set[str]:
+    """Trigrams of a value, padded ones include the start and end of the value (like PostgreSQL's pg_trgm)"""
+    if padded:
+        value = f"  {value} "
+
+    return {value[index:index + TRIGRAM_LENGTH] for index in range(len(value) - TRIGRAM_LENGTH + 1)}
+
+
+def get_qualified_name(schema: str | None, table_name: str) -> str:
+    """Tables of the default schema keep their plain name, the others are prefixed with their schema"""
+    return table_name if schema is None else f"{schema}.{table_name}"
+
+
+class TableCatalogIndex:
+    """
+    Immutable search index of table names, swapped as a whole once a refreshed catalog was loaded.
+    Names are ordered once (shortest first), so ranking the matches of a search only compares integers.
+    """
+    names: list[str]
+    tables: dict[str, tuple[str | None, str]]
+    schemas: set[str]
+    _keys: list[str]
+    _exact: dict[str, list[int]]
+    _prefixes: list[tuple[str, int]]
+    _trigrams: dict[str, list[int]]
+
+    def __init__(self, tables: list[tuple[str | None, str]]):
+        qualified_tables = {
+            get_qualified_name(schema, table_name): (schema, table_name)
+            for schema, table_name in tables
+        }
+
+        # Name ids are the positions in the search order, shortest first and alphabetically
+        self.names = sorted(qualified_tables, key=lambda name: (len(name), name.lower(), name))
+        self.tables = qualified_tables
+        self.schemas = {schema for schema, _ in qualified_tables.values() if schema is not None}
+
+        self._keys = [name.lower() for name in self.names]
+
+        self._exact = {}
+        self._trigrams = {}
+
+        prefixes = []
+
+        for name_id, (name, key) in enumerate(zip(self.names, self._keys)):
+            table_key = qualified_tables[name][1].lower()
+
+            # The table name alone counts as well, e.g. both "sales.or" and "or" are prefixes of sales.orders
+            for match_key in {key, table_key}:
+                self._exact.setdefault(match_key, []).append(name_id)
+
+                prefixes.append((match_key, name_id))
+
+            # Padded, a substring query looks up its trigrams without padding, fuzzy queries with it
+            for trigram in get_trigrams(key, padded=True):
+                self._trigrams.setdefault(trigram, []).append(name_id)
+
+        prefixes.sort()
+
+        self._prefixes = prefixes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int | None = None, fuzzy: bool = False) -> tuple[list[str], int]:
+        """Names containing the query (case-insensitive), exact and prefix matches first, and the number of matches"""
+        key = query.lower()
+
+        if limit is None:
+            limit = len(self.names)
+
+        limit = max(0, limit)
+
+        if not key:
+            return self.names[:limit], len(self.names)
+
+        matches = self._get_substring_matches(key)
+
+        exact_ids = self._exact.get(key, [])
+        prefix_ids = sorted(set(self._get_prefix_matches(key)).difference(exact_ids))
+
+        # Exact and prefix matches are substring matches as well, the rest is taken from the shortest of the others
+        ranked_ids = exact_ids + prefix_ids
+        ranked_id_set = set(ranked_ids)
+
+        if len(ranked_ids) < limit:
+            remaining = heapq.nsmallest(limit - len(ranked_ids) + len(ranked_id_set), matches)
+
+            ranked_ids.extend(name_id for name_id in remaining if name_id not in ranked_id_set)
+
+        total = len(matches)
+
+        if fuzzy:
+            fuzzy_ids = self._get_fuzzy_matches(key, set(matches))
+
+            total += len(fuzzy_ids)
+
+            ranked_ids.extend(fuzzy_ids)
+
+        return [self.names[name_id] for name_id in ranked_ids[:limit]], total
+
+    def _get_substring_matches(self, key: str) -> list[int]:
+        # Too short for trigrams, a scan of the names is still a matter of milliseconds
+        if len(key) < TRIGRAM_LENGTH:
+            return [name_id for name_id, name_key in enumerate(self._keys) if key in name_key]
+
+        postings = sorted((self._trigrams.get(trigram, []) for trigram in get_trigrams(key)), key=len)
+
+        candidates = set(postings[0])
+
+        for posting in postings[1:]:
+            if not candidates:
+                break
+
+            candidates.intersection_update(posting)
+
+        # A trigram query is its own single trigram, longer ones might have their trigrams apart
+        if len(key) == TRIGRAM_LENGTH:
+            return list(candidates)
+
+        return [name_id for name_id in candidates if key in self._keys[name_id]]
+
+    def _get_prefix_matches(self, key: str) -> list[int]:
+        name_ids = []
+
+        for prefix_key, name_id in self._prefixes[bisect.bisect_left(self._prefixes, (key,)):]:
+            if not prefix_key.startswith(key):
+                break
+
+            name_ids.append(name_id)
+
+        return name_ids
+
+    def _get_fuzzy_matches(self, key: str, excluded: set[int]) -> list[int]:
+        """Names containing most trigrams of the query (e.g. typos), most similar first"""
+        query_trigrams = get_trigrams(key, padded=True)
+
+        shared = Counter()
+
+        for trigram in query_trigrams:
+            shared.update(self._trigrams.get(trigram, []))
+
+        min_shared = FUZZY_SIMILARITY_THRESHOLD * len(query_trigrams)
+
+        scored_matches = [
+            (-shared_count, name_id)
+            for name_id, shared_count in shared.items()
+            if shared_count >= min_shared and name_id not in excluded
+        ]
+
+        scored_matches.sort()
+
+        return [name_id for _, name_id in scored_matches]
+
+
+class TableCatalog:
+    """
+    In-memory catalog of the tables of all schemas of a database, indexed for fast search. Loaded on first use and
+    refreshed in the background once older than the TTL, searches keep using the previous index meanwhile.
+    """
+    _lock: threading.Lock
+    _refresh_lock: threading.Lock
+    _loader: Callable[[], list[tuple[str | None, str]]]
+    _index: TableCatalogIndex | None
+    _loaded_at: float
+    _refreshing: bool
+    ttl: int
+
+    def __init__(self, loader: Callable[[], list[tuple[str | None, str]]], ttl: int):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._loader = loader
+        self._index = None
+        self._loaded_at = 0
+        self._refreshing = False
+
+        self.ttl = ttl
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index is not None
+
+    def get_index(self) -> TableCatalogIndex:
+        index = self._index
+
+        if index is None or self.ttl <= 0:
+            return self._load()
+
+        if time.monotonic() - self._loaded_at > self.ttl:
+            self._start_refresh()
+
+        return index
+
+    def search(self, query: str, limit: int | None = None, fuzzy: bool = False) -> tuple[list[str], int]:
+        return self.get_index().search(query, limit, fuzzy)
+
+    def seed(self, tables: list[tuple[str | None, str]]):
+        """Start with a previously loaded catalog (e.g. a snapshot), it is refreshed in the background on first use"""
+        self._index = TableCatalogIndex(tables)
+        self._loaded_at = float("-inf")
+
+    def get_table(self, name: str) -> tuple[str | None, str] | None:
+        """Schema and table name of a catalog name, only once the catalog was loaded"""
+        index = self._index
+
+        return None if index is None else index.tables.get(name)
+
+    def invalidate(self):
+        """The next search loads the catalog again, e.g. after tables were created or dropped"""
+        self._index = None
+
+    def _load(self) -> TableCatalogIndex:
+        # A single load at a time, concurrent searches wait for it instead of loading the catalog as well
+        with self._lock:
+            if self._index is not None and self.ttl > 0:
+                return self._index
+
+            return self._refresh()
+
+    def _refresh(self) -> TableCatalogIndex:
+        started = time.perf_counter()
+
+        loaded_at = time.monotonic()
+
+        index = TableCatalogIndex(self._loader())
+
+        self._index = index
+        self._loaded_at = loaded_at
+
+        duration = time.perf_counter() - started
+
+        logger.info(f"Table catalog loaded, Tables: {len(index):,.0f}, Schemas: {len(index.schemas):,.0f}, "
+                    f"Duration (seconds): {duration:,.3f}")
+
+        return index
+
+    def _start_refresh(self):
+        # Not the lock of loading, that is held while refreshing and searches would wait for the refresh
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+
+            self._refreshing = True
+
+        threading.Thread(target=self._run_refresh, daemon=True, name="mcp-alchemy-table-catalog").start()
+
+    def _run_refresh(self):
+        try:
+            with self._lock:
+                self._refresh()
+
+        except Exception as ex:
+            logger.warning(f"Failed to refresh the table catalog, Error: {ex}")
+
+        finally:
+            self._refreshing = False
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+
+from mcp_alchemy.engine_registry import EngineRegistry
+
+logger = get_logger(__name__)
+
+PARAM_DB_URL = "DB_URL"
+PARAM_DB_ENGINE_OPTIONS = "DB_ENGINE_OPTIONS"
+PARAM_EXECUTE_QUERY_MAX_CHARS = "EXECUTE_QUERY_MAX_CHARS"
+PARAM_EXECUTE_QUERY_EXACT_COUNT = "EXECUTE_QUERY_EXACT_COUNT"
+PARAM_EXECUTE_QUERY_BATCH_SIZE = "EXECUTE_QUERY_BATCH_SIZE"
+PARAM_EXECUTE_QUERY_FORMAT = "EXECUTE_QUERY_FORMAT"
+PARAM_EXECUTE_QUERY_COLUMN_TYPES = "EXECUTE_QUERY_COLUMN_TYPES"
+PARAM_EXECUTE_QUERY_TIMEOUT = "EXECUTE_QUERY_TIMEOUT"
+
+SUPPORTED_ENV_VARS = [
+    PARAM_DB_URL,
+    PARAM_DB_ENGINE_OPTIONS,
+    PARAM_EXECUTE_QUERY_MAX_CHARS,
+    PARAM_EXECUTE_QUERY_EXACT_COUNT,
+    PARAM_EXECUTE_QUERY_BATCH_SIZE,
+    PARAM_EXECUTE_QUERY_FORMAT,
+    PARAM_EXECUTE_QUERY_COLUMN_TYPES,
+    PARAM_EXECUTE_QUERY_TIMEOUT
+]
+
+SUPPORTED_HEADERS = {
+    f"x-{env_var.replace('_', '-')}".lower(): env_var
+    for env_var in SUPPORTED_ENV_VARS
+}
+
+# Headers are accepted either prefixed (X-DB-URL) or named as the environment variable (DB_URL)
+HEADER_NAMES = [
+    (header, env_var.lower())
+    for header, env_var in SUPPORTED_HEADERS.items()
+]
+
+DEFAULT_DB_ENGINE_OPTIONS = "{}"
+DEFAULT_EXECUTE_QUERY_MAX_CHARS = "4000"
+DEFAULT_EXECUTE_QUERY_EXACT_COUNT = "false"
+DEFAULT_EXECUTE_QUERY_BATCH_SIZE = "100"
+DEFAULT_EXECUTE_QUERY_COLUMN_TYPES = "false"
+# Seconds, 0 means no timeout
+DEFAULT_EXECUTE_QUERY_TIMEOUT = "0"
+
+# Rows as objects keyed by the column names, or the column names once and rows as arrays of values
+OUTPUT_FORMAT_ROWS = "rows"
+OUTPUT_FORMAT_COLUMNAR = "columnar"
+
+OUTPUT_FORMATS = [OUTPUT_FORMAT_ROWS, OUTPUT_FORMAT_COLUMNAR]
+
+DEFAULT_EXECUTE_QUERY_FORMAT = OUTPUT_FORMAT_ROWS
+
+DEFAULT_OPTIONS = {
+    'isolation_level': 'AUTOCOMMIT',
+    # Test connections before use (handles MySQL 8hr timeout, network drops)
+    'pool_pre_ping': True,
+    # Start with minimal connections, the pool manager grows the pools of tenants with concurrent calls
+    'pool_size': 1,
+    # Allow temporary burst capacity, overflow connections are closed once returned
+    'max_overflow': 2,
+    # Force refresh connections older than 1hr (well under MySQL's 8hr default)
+    'pool_recycle': 3600
+}
+
+MAX_TENANT_PROFILES = 1024
+
+
+def get_output_format(output_format: str) -> str:
+    output_format = output_format.strip().lower()
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}', supported formats: {OUTPUT_FORMATS}")
+
+    return output_format
+
+
+@dataclass(frozen=True)
+class TenantProfile:
+    """Configuration of a tenant, resolved once from its headers / environment variables"""
+    db_url: str
+    db_engine_options: Mapping
+    execute_query_max_chars: int
+    execute_query_exact_count: bool
+    execute_query_batch_size: int
+    execute_query_format: str
+    execute_query_column_types: bool
+    execute_query_timeout: float
+    connection_id: str
+    registry_key: str
+
+    @staticmethod
+    def create(data: dict) -> "TenantProfile":
+        db_url = data.get(PARAM_DB_URL)
+
+        if db_url is None:
+            raise ValueError("DB_URL cannot be None")
+
+        execute_query_max_chars = int(data.get(PARAM_EXECUTE_QUERY_MAX_CHARS) or DEFAULT_EXECUTE_QUERY_MAX_CHARS)
+
+        execute_query_exact_count = data.get(PARAM_EXECUTE_QUERY_EXACT_COUNT) or DEFAULT_EXECUTE_QUERY_EXACT_COUNT
+
+        execute_query_batch_size = int(data.get(PARAM_EXECUTE_QUERY_BATCH_SIZE) or DEFAULT_EXECUTE_QUERY_BATCH_SIZE)
+
+        execute_query_format = get_output_format(data.get(PARAM_EXECUTE_QUERY_FORMAT) or DEFAULT_EXECUTE_QUERY_FORMAT)
+
+        execute_query_column_types = data.get(PARAM_EXECUTE_QUERY_COLUMN_TYPES) or DEFAULT_EXECUTE_QUERY_COLUMN_TYPES
+
+        execute_query_timeout = float(data.get(PARAM_EXECUTE_QUERY_TIMEOUT) or DEFAULT_EXECUTE_QUERY_TIMEOUT)
+
+        db_engine_options = data.get(PARAM_DB_ENGINE_OPTIONS) or DEFAULT_DB_ENGINE_OPTIONS
+
+        user_options = json.loads(db_engine_options)
+
+        db_options = DEFAULT_OPTIONS.copy()
+        db_options.update(user_options)
+
+        profile = TenantProfile(
+            db_url=sys.intern(db_url),
+            db_engine_options=MappingProxyType(db_options),
+            execute_query_max_chars=execute_query_max_chars,
+            execute_query_exact_count=execute_query_exact_count.lower() in ("1", "true", "yes"),
+            execute_query_batch_size=max(1, execute_query_batch_size),
+            execute_query_format=execute_query_format,
+            execute_query_column_types=execute_query_column_types.lower() in ("1", "true", "yes"),
+            execute_query_timeout=max(0.0, execute_query_timeout),
+            connection_id=sys.intern(str(hashlib.md5(db_url.encode()).hexdigest())),
+            registry_key=sys.intern(EngineRegistry.get_registry_key(db_url, db_options))
+        )
+
+        return profile
+
+
+class TenantProfileCache:
+    """Tenant profiles cached by the raw values of the supported headers / environment variables"""
+    _lock: threading.Lock
+    _profiles: OrderedDict[tuple, TenantProfile]
+    max_size: int
+
+    def __init__(self, max_size: int = MAX_TENANT_PROFILES):
+        self._lock = threading.Lock()
+        self._profiles = OrderedDict()
+
+        self.max_size = max_size
+
+    def get_from_headers(self, headers: Mapping) -> TenantProfile:
+        raw_values = tuple(
+            headers.get(header) or headers.get(env_var_header)
+            for header, env_var_header in HEADER_NAMES
+        )
+
+        return self._get(raw_values)
+
+    def get_from_environment(self) -> TenantProfile:
+        raw_values = tuple(
+            os.environ.get(env_var)
+            for env_var in SUPPORTED_ENV_VARS
+        )
+
+        return self._get(raw_values)
+
+    def _get(self, raw_values: tuple) -> TenantProfile:
+        with self._lock:
+            profile = self._profiles.get(raw_values)
+
+            if profile is not None:
+                self._profiles.move_to_end(raw_values)
+
+                return profile
+
+        profile = TenantProfile.create(dict(zip(SUPPORTED_ENV_VARS, raw_values)))
+
+        with self._lock:
+            self._profiles[raw_values] = profile
+
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+        return profile
+
+
+TENANT_PROFILE_CACHE = TenantProfileCache()
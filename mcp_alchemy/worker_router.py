@@ -0,0 +1,384 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+import httpx
+import uvicorn
+
+from mcp.server.fastmcp.utilities.logging import get_logger
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from mcp_alchemy.cursor_store import WORKER_INDEX_ENV_VAR, get_token_worker_index
+from mcp_alchemy.metrics import CONTENT_TYPE
+
+logger = get_logger(__name__)
+
+# Every forwarded request would be logged otherwise
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Header identifying the tenant, requests without it use the DB_URL environment variable of the workers
+TENANT_HEADERS = ("x-db-url", "db_url")
+
+# Options of the router itself, the workers get their own host and port
+ROUTER_OPTIONS = ("--workers", "--host", "--port")
+
+# Headers that only apply to a single connection and are not forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers", "transfer-encoding",
+    "upgrade", "host", "content-length"
+}
+
+WORKER_IN_FLIGHT_METRIC = "mcp_alchemy_worker_in_flight_requests"
+
+WORKER_HOST = "127.0.0.1"
+WORKER_START_TIMEOUT = 30
+WORKER_CHECK_INTERVAL = 1
+
+
+class WorkerProcess:
+    index: int
+    port: int
+    process: subprocess.Popen | None
+    in_flight: int
+
+    def __init__(self, index: int, port: int):
+        self.index = index
+        self.port = port
+        self.process = None
+        self.in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{WORKER_HOST}:{self.port}"
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, worker_args: list[str]):
+        self.process = subprocess.Popen([
+            sys.executable, "-m", "mcp_alchemy.server",
+            *worker_args,
+            "--host", WORKER_HOST,
+            "--port", str(self.port)
+        ], env={**os.environ, WORKER_INDEX_ENV_VAR: str(self.index)})
+
+        logger.info(f"Started worker #{self.index} (PID: {self.process.pid}) on port {self.port}")
+
+    def wait_until_ready(self):
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+
+        while time.monotonic() < deadline:
+            if not self.is_running:
+                raise RuntimeError(f"Worker #{self.index} exited with code {self.process.returncode}")
+
+            try:
+                with socket.create_connection((WORKER_HOST, self.port), timeout=0.5):
+                    return
+
+            except OSError:
+                time.sleep(0.1)
+
+        raise RuntimeError(f"Worker #{self.index} did not listen on port {self.port} within {WORKER_START_TIMEOUT}s")
+
+    def stop(self):
+        if not self.is_running:
+            return
+
+        self.process.terminate()
+
+        try:
+            self.process.wait(timeout=10)
+
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class WorkerRouter:
+    """
+    Front listener of a multi-worker streamable-http server, forwarding each request to one of the worker processes.
+    Requests of a tenant (DB URL) go to the same worker, so its engine, pool and caches stay warm, unless that worker
+    is saturated, then the least loaded worker serves it. fetch_more always goes to the worker holding the cursor of
+    its continuation token.
+    """
+    _workers: list[WorkerProcess]
+    _worker_args: list[str]
+    _max_worker_in_flight: int
+    _client: httpx.AsyncClient | None
+
+    def __init__(self, workers: int, worker_args: list[str], max_worker_in_flight: int):
+        self._workers = [WorkerProcess(index, get_free_port()) for index in range(max(1, workers))]
+        self._worker_args = worker_args
+        self._max_worker_in_flight = max(1, max_worker_in_flight)
+        self._client = None
+
+    def select_worker(self, tenant_key: str) -> WorkerProcess:
+        digest = hashlib.md5(tenant_key.encode()).digest()
+        worker = self._workers[int.from_bytes(digest[:8], "big") % len(self._workers)]
+
+        if worker.in_flight >= self._max_worker_in_flight or not worker.is_running:
+            least_loaded = min(
+                (candidate for candidate in self._workers if candidate.is_running),
+                key=lambda candidate: candidate.in_flight,
+                default=worker
+            )
+
+            if least_loaded.in_flight < worker.in_flight or not worker.is_running:
+                worker = least_loaded
+
+        return worker
+
+    def get_token_worker(self, token: str | None) -> WorkerProcess | None:
+        """Worker holding the cursor of a continuation token, the cursor only exists in that worker's memory"""
+        worker_index = None if token is None else get_token_worker_index(token)
+
+        if worker_index is None or worker_index >= len(self._workers):
+            return None
+
+        return self._workers[worker_index]
+
+    def start(self):
+        for worker in self._workers:
+            worker.start(self._worker_args)
+
+        for worker in self._workers:
+            worker.wait_until_ready()
+
+    def stop(self):
+        for worker in self._workers:
+            worker.stop()
+
+    def run(self, host: str, port: int):
+        self.start()
+
+        try:
+            uvicorn.run(self._create_app(), host=host, port=port, log_level="warning")
+
+        finally:
+            self.stop()
+
+    def _create_app(self) -> Starlette:
+        @asynccontextmanager
+        async def lifespan(_):
+            # Streams (SSE) stay open as long as the worker keeps them, only connecting is limited
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5), limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=self._max_worker_in_flight * len(self._workers)
+            ))
+
+            supervisor = asyncio.create_task(self._supervise())
+
+            try:
+                yield
+
+            finally:
+                supervisor.cancel()
+
+                await self._client.aclose()
+
+                # Uvicorn re-raises the shutdown signal once the app stopped, the workers are stopped before that
+                await asyncio.to_thread(self.stop)
+
+        return Starlette(
+            routes=[
+                Route("/metrics", self._metrics, methods=["GET"]),
+                Route("/{path:path}", self._forward, methods=["GET", "POST", "DELETE"])
+            ],
+            lifespan=lifespan
+        )
+
+    async def _forward(self, request: Request) -> Response:
+        body = await request.body()
+
+        tenant_key = next((request.headers[header] for header in TENANT_HEADERS if header in request.headers), "")
+
+        worker = self.get_token_worker(get_continuation_token(request, body)) or self.select_worker(tenant_key)
+        worker.in_flight += 1
+
+        try:
+            worker_request = self._client.build_request(
+                request.method,
+                f"{worker.url}{request.url.path}",
+                params=request.query_params,
+                headers=[(key, value) for key, value in request.headers.items() if key not in HOP_BY_HOP_HEADERS],
+                content=body
+            )
+
+            worker_response = await self._client.send(worker_request, stream=True)
+
+        except Exception as ex:
+            worker.in_flight -= 1
+
+            logger.error(f"Failed to forward request to worker #{worker.index}, Error: {ex}")
+
+            return PlainTextResponse(f"Worker #{worker.index} is unavailable", status_code=503)
+
+        async def release():
+            worker.in_flight -= 1
+
+            await worker_response.aclose()
+
+        return WorkerResponse(
+            worker_response,
+            release,
+            headers={
+                key: value
+                for key, value in worker_response.headers.items()
+                if key not in HOP_BY_HOP_HEADERS
+            }
+        )
+
+    async def _metrics(self, _: Request) -> Response:
+        responses = await asyncio.gather(*[
+            self._client.get(f"{worker.url}/metrics")
+            for worker in self._workers
+        ], return_exceptions=True)
+
+        # Lines of each metric, its HELP / TYPE lines once and then the samples of all workers together
+        metric_lines = {
+            WORKER_IN_FLIGHT_METRIC: [
+                f"# HELP {WORKER_IN_FLIGHT_METRIC} Requests forwarded to the worker and not answered yet",
+                f"# TYPE {WORKER_IN_FLIGHT_METRIC} gauge",
+                *(
+                    f'{WORKER_IN_FLIGHT_METRIC}{{worker="{worker.index}"}} {worker.in_flight}'
+                    for worker in self._workers
+                )
+            ]
+        }
+
+        # The samples of all workers, labeled with the worker they came from
+        for worker, response in zip(self._workers, responses):
+            if isinstance(response, Exception) or response.status_code != 200:
+                continue
+
+            lines = None
+
+            for line in response.text.splitlines():
+                if line.startswith("#"):
+                    # e.g. "# HELP name description", the samples of a metric follow its HELP / TYPE lines
+                    metric_name = line.split(" ", 3)[2] if line.count(" ") >= 2 else ""
+
+                    lines = metric_lines.setdefault(metric_name, [])
+
+                    if line not in lines:
+                        lines.append(line)
+
+                    continue
+
+                if lines is None or not line:
+                    continue
+
+                name, separator, rest = line.partition("{")
+
+                if separator:
+                    lines.append(f'{name}{{worker="{worker.index}",{rest}')
+
+                else:
+                    name, _, value = line.partition(" ")
+
+                    lines.append(f'{name}{{worker="{worker.index}"}} {value}')
+
+        return PlainTextResponse(
+            "".join(f"{line}\n" for lines in metric_lines.values() for line in lines),
+            media_type=CONTENT_TYPE
+        )
+
+    async def _supervise(self):
+        """Restart workers that exited"""
+        while True:
+            await asyncio.sleep(WORKER_CHECK_INTERVAL)
+
+            for worker in self._workers:
+                if worker.is_running:
+                    continue
+
+                logger.warning(f"Worker #{worker.index} exited with code {worker.process.returncode}, restarting")
+
+                # Starting the process blocks, the requests of the other workers are still forwarded meanwhile
+                await asyncio.to_thread(worker.start, self._worker_args)
+
+
+class WorkerResponse(StreamingResponse):
+    """
+    Response of a worker streamed to the client. The worker's request is released once the response was sent, also
+    when sending failed or was never started (e.g. the client disconnected)
+    """
+    _release: Callable[[], Awaitable[None]]
+
+    def __init__(self, worker_response: httpx.Response, release: Callable[[], Awaitable[None]], headers: dict):
+        super().__init__(worker_response.aiter_raw(), status_code=worker_response.status_code, headers=headers)
+
+        self._release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+
+        finally:
+            await self._release()
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind((WORKER_HOST, 0))
+
+        return s.getsockname()[1]
+
+
+def get_continuation_token(request: Request, body: bytes) -> str | None:
+    """Continuation token of a fetch_more call, passed as its argument or as a query parameter / header"""
+    token = request.query_params.get("continuation_token") or request.headers.get("continuation_token")
+
+    # Only messages that mention a token are parsed
+    if token is not None or b"continuation_token" not in body:
+        return token
+
+    try:
+        messages = json.loads(body)
+
+    except ValueError:
+        return None
+
+    # A JSON-RPC message or a batch of them
+    for message in messages if isinstance(messages, list) else [messages]:
+        params = message.get("params") if isinstance(message, dict) else None
+        arguments = params.get("arguments") if isinstance(params, dict) else None
+
+        if isinstance(arguments, dict) and isinstance(arguments.get("continuation_token"), str):
+            return arguments["continuation_token"]
+
+    return None
+
+def get_worker_args(argv: list[str]) -> list[str]:
+    """Command line of the workers, the server's arguments without those of the router"""
+    worker_args = []
+    skip_value = False
+
+    for arg in argv:
+        if skip_value:
+            skip_value = False
+
+            continue
+
+        option = arg.split("=", 1)[0]
+
+        if option in ROUTER_OPTIONS:
+            skip_value = "=" not in arg
+
+            continue
+
+        worker_args.append(arg)
+
+    return worker_args
@@ -0,0 +1,153 @@
+"""
+Cold start benchmark of stdio launches: import time of the server module and the latency from spawning the server to
+the first tool call result (with and without --warm-up), fails when the budgets are exceeded.
+
+Clients (LLMs) take a while to pick the first tool after the handshake, that think time is excluded from the first
+call latency but gives --warm-up the chance to connect and load the schema in the meantime.
+
+Usage:
+    python -m tests.benchmark_cold_start [--runs 5] [--think-time 1.0] [--import-budget 1.0] [--first-call-budget 2.0]
+"""
+import argparse, asyncio, json, os, statistics, subprocess, sys, time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+DEFAULT_RUNS = 5
+DEFAULT_IMPORT_BUDGET = 1.0
+DEFAULT_FIRST_CALL_BUDGET = 2.0
+DEFAULT_THINK_TIME = 1.0
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DB_URL = f"sqlite:///{os.path.join(PROJECT_ROOT, 'tests', 'Chinook_Sqlite.sqlite')}"
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import mcp_alchemy.server
+duration = time.perf_counter() - started
+print(duration, "sqlalchemy" in sys.modules)
+"""
+
+def h1(s):
+    print(s)
+    print("=" * len(s))
+    print()
+
+def get_server_env():
+    env = os.environ.copy()
+    env["DB_URL"] = DB_URL
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+
+    return env
+
+def measure_import():
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=PROJECT_ROOT,
+        env=get_server_env(),
+        stderr=subprocess.DEVNULL
+    )
+
+    duration, sqlalchemy_imported = output.decode().split()
+
+    return float(duration), sqlalchemy_imported == "True"
+
+async def measure_first_call(server_args, tool, arguments, think_time):
+    server = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_alchemy.server", "--transport", "stdio", *server_args],
+        env=get_server_env(),
+        cwd=PROJECT_ROOT
+    )
+
+    started = time.perf_counter()
+
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(server, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                handshake = time.perf_counter() - started
+
+                await asyncio.sleep(think_time)
+
+                call_started = time.perf_counter()
+
+                result = await session.call_tool(tool, arguments)
+
+                call = time.perf_counter() - call_started
+
+    if result.isError or "error" in json.loads(result.content[0].text):
+        raise RuntimeError(f"{tool} failed: {result.content[0].text}")
+
+    return handshake, call
+
+def main():
+    p = argparse.ArgumentParser(description="Cold start benchmark of MCP Alchemy")
+    p.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    p.add_argument("--think-time", type=float, default=DEFAULT_THINK_TIME, help="Seconds")
+    p.add_argument("--import-budget", type=float, default=DEFAULT_IMPORT_BUDGET, help="Seconds")
+    p.add_argument("--first-call-budget", type=float, default=DEFAULT_FIRST_CALL_BUDGET, help="Seconds")
+    args = p.parse_args()
+
+    failures = []
+
+    h1("Import")
+
+    imports = [measure_import() for _ in range(args.runs)]
+
+    import_duration = statistics.median(duration for duration, _ in imports)
+    sqlalchemy_imported = any(imported for _, imported in imports)
+
+    print(f"mcp_alchemy.server: {import_duration * 1000:.1f}ms (median of {args.runs}), "
+          f"SQLAlchemy imported: {sqlalchemy_imported}")
+    print()
+
+    if import_duration > args.import_budget:
+        failures.append(f"Import took {import_duration:.3f}s, budget {args.import_budget:.3f}s")
+
+    if sqlalchemy_imported:
+        failures.append("SQLAlchemy is imported at startup")
+
+    h1(f"First call (spawn -> handshake, think time {args.think_time:.1f}s excluded, call -> result)")
+
+    scenarios = [
+        ("all_table_names", [], "all_table_names", {}),
+        ("all_table_names --warm-up", ["--warm-up"], "all_table_names", {}),
+        ("schema_definitions", [], "schema_definitions", {"table_names": ["Album", "Track"]}),
+        ("schema_definitions --warm-up", ["--warm-up"], "schema_definitions", {"table_names": ["Album", "Track"]}),
+        ("execute_query", [], "execute_query", {"query": "SELECT * FROM Album LIMIT 10", "params": None}),
+    ]
+
+    for name, server_args, tool, arguments in scenarios:
+        measurements = [
+            asyncio.run(measure_first_call(server_args, tool, arguments, args.think_time))
+            for _ in range(args.runs)
+        ]
+
+        handshake = statistics.median(handshake for handshake, _ in measurements)
+        call = statistics.median(call for _, call in measurements)
+        first_call = handshake + call
+
+        print(f"{name:<32} handshake: {handshake * 1000:8.1f}ms, call: {call * 1000:8.1f}ms, "
+              f"total: {first_call * 1000:8.1f}ms")
+
+        if first_call > args.first_call_budget:
+            failures.append(f"First {name} took {first_call:.3f}s, budget {args.first_call_budget:.3f}s")
+
+    print()
+
+    if failures:
+        h1("Budget exceeded")
+
+        for failure in failures:
+            print(f"- {failure}")
+
+        sys.exit(1)
+
+    print("All within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark of the per-call overhead of resolving the tenant configuration (RequestContext.load).
+
+Usage:
+    python -m tests.benchmark_request_context [calls]
+"""
+import hashlib, json, os, sys, time
+
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from mcp_alchemy.engine_registry import ENGINE_REGISTRY
+from mcp_alchemy.request_context import RequestContext
+from mcp_alchemy.tenant_profile import DEFAULT_OPTIONS, SUPPORTED_HEADERS
+
+DEFAULT_CALLS = 100_000
+
+DB_URL = "sqlite:///tests/Chinook_Sqlite.sqlite"
+
+HEADERS = {
+    "x-db-url": DB_URL,
+    "x-db-engine-options": json.dumps({"pool_size": 5}),
+    "x-execute-query-max-chars": "8000",
+    # Headers a typical MCP client sends along
+    "accept": "application/json, text/event-stream",
+    "content-type": "application/json",
+    "user-agent": "python-httpx/0.28.1",
+    "mcp-protocol-version": "2025-06-18",
+    "host": "localhost:8000",
+}
+
+def h1(s):
+    print(s)
+    print("=" * len(s))
+    print()
+
+def create_context(headers):
+    scope = {
+        "type": "http",
+        "headers": [(key.encode(), value.encode()) for key, value in headers.items()],
+        "query_string": b"",
+    }
+
+    return SimpleNamespace(request_context=SimpleNamespace(request=Request(scope)))
+
+def load_legacy(ctx):
+    """Tenant configuration resolution as done before tenant profiles, kept as the baseline"""
+    request = ctx.request_context.request if ctx and ctx.request_context else None
+
+    if request is None:
+        data = {key: os.environ[key] for key in os.environ}
+
+    else:
+        data = {}
+
+        for key in request.headers:
+            env_var = SUPPORTED_HEADERS.get(key) if key.lower().startswith("x-") and key in SUPPORTED_HEADERS else key.upper()
+
+            data[env_var] = request.headers[key]
+
+    db_url = data.get("DB_URL")
+    int(data.get("EXECUTE_QUERY_MAX_CHARS", "4000"))
+
+    db_options = DEFAULT_OPTIONS.copy()
+    db_options.update(json.loads(data.get("DB_ENGINE_OPTIONS", "{}")))
+
+    hashlib.md5(db_url.encode()).hexdigest()
+
+    return ENGINE_REGISTRY.get_database_context(db_url, db_options)
+
+def measure(func, ctx, calls):
+    started = time.perf_counter()
+
+    for _ in range(calls):
+        func(ctx)
+
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS
+
+    os.environ["DB_URL"] = DB_URL
+
+    for name, ctx in [("Environment (stdio)", None), ("Headers (streamable-http)", create_context(HEADERS))]:
+        legacy = measure(load_legacy, ctx, calls)
+        # The database context is resolved on first use, included to compare the same work
+        profile = measure(lambda call_ctx: RequestContext.load(call_ctx).db_context, ctx, calls)
+
+        h1(name)
+        print(f"Legacy:          {legacy:8.2f}us per call")
+        print(f"Tenant profiles: {profile:8.2f}us per call")
+        print(f"Speedup:         {legacy / profile:8.2f}x")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark of ResponseFormatter row formatting against a generated SQLite table.
+
+Usage:
+    python -m tests.benchmark_response_formatter [rows]
+"""
+import json, os, sys, tempfile, time
+
+from sqlalchemy import create_engine, text
+
+from mcp_alchemy.request_context import RequestContext
+from mcp_alchemy.response_formatter import ResponseFormatter
+
+DEFAULT_ROWS = 1_000_000
+
+# Large enough for every row to be formatted, the benchmark measures formatting, not truncation
+MAX_CHARS = sys.maxsize
+
+BATCH_SIZE = 100
+
+def h1(s):
+    print(s)
+    print("=" * len(s))
+    print()
+
+def create_table(engine, rows):
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, price NUMERIC, created_at TEXT, note TEXT)")
+        connection.exec_driver_sql(f"""
+            WITH RECURSIVE seq(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM seq WHERE x < {rows})
+            INSERT INTO item
+            SELECT x, 'item ' || x, x * 1.25, datetime(x, 'unixepoch'), CASE WHEN x % 3 = 0 THEN NULL ELSE 'n' END
+            FROM seq
+        """)
+
+def format_legacy(cursor, execute_query_max_chars):
+    """Row by row formatting as done before batching, kept as the baseline"""
+    rows = []
+    content_length = 0
+
+    while row := cursor.fetchone():
+        row_data = {}
+
+        for col, val in zip(cursor.keys(), row):
+            row_data[col] = ResponseFormatter._format_value(val)
+
+        content_length += len(json.dumps(row_data))
+
+        if content_length > execute_query_max_chars:
+            break
+
+        rows.append(row_data)
+
+    return rows
+
+def format_batched(cursor, execute_query_max_chars):
+    formatter = ResponseFormatter(RequestContext.load())
+
+    rows, _, _ = formatter._format_query_execution_result(cursor, execute_query_max_chars, BATCH_SIZE)
+
+    return rows
+
+def measure(engine, func):
+    with engine.connect() as connection:
+        cursor = connection.execute(text("SELECT * FROM item"))
+
+        started = time.perf_counter()
+        rows = func(cursor, MAX_CHARS)
+        elapsed = time.perf_counter() - started
+
+    return rows, elapsed
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'benchmark.sqlite')}"
+        engine = create_engine(db_url)
+
+        # The formatter is created for the benchmark database, as for a tool call
+        os.environ["DB_URL"] = db_url
+
+        h1(f"Generating {rows:,.0f} rows")
+        create_table(engine, rows)
+
+        legacy_rows, legacy_elapsed = measure(engine, format_legacy)
+        batched_rows, batched_elapsed = measure(engine, format_batched)
+
+        engine.dispose()
+
+    if legacy_rows != batched_rows:
+        print("Batched formatting output differs from the legacy output")
+        sys.exit(1)
+
+    h1("Results")
+    print(f"Legacy:  {legacy_elapsed:.3f}s ({rows / legacy_elapsed:,.0f} rows/s)")
+    print(f"Batched: {batched_elapsed:.3f}s ({rows / batched_elapsed:,.0f} rows/s)")
+    print(f"Speedup: {legacy_elapsed / batched_elapsed:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark of schema reflection, per table versus bulk (get_multi_*), for 10, 100 and 1000 tables, and of the
+change stamp check that keeps unchanged expired schemas instead of reflecting them again.
+
+Usage:
+    python -m tests.benchmark_schema_reflection [db_url]
+
+Without a DB URL the tables are generated in temporary SQLite databases, with a DB URL (e.g. the PostgreSQL
+container of tests/docker-compose.yml) the tables are created in, and dropped from, that database.
+"""
+import os, sys, tempfile, time
+
+from sqlalchemy import create_engine, event, inspect
+
+from mcp_alchemy.database_context import DatabaseContext
+from mcp_alchemy.response_formatter import ResponseFormatter
+from mcp_alchemy.schema_change_tracker import SchemaChangeTracker
+
+TABLE_COUNTS = [10, 100, 1000]
+
+TABLE_PREFIX = "bench_reflection_"
+
+def h1(s):
+    print(s)
+    print("=" * len(s))
+    print()
+
+def create_tables(engine, table_count):
+    with engine.begin() as connection:
+        for index in range(table_count):
+            reference = f", parent_id INTEGER REFERENCES {TABLE_PREFIX}{index - 1} (id)" if index > 0 else ""
+
+            connection.exec_driver_sql(
+                f"CREATE TABLE {TABLE_PREFIX}{index} (id INTEGER PRIMARY KEY, name VARCHAR(50){reference})")
+
+def drop_tables(engine, table_count):
+    with engine.begin() as connection:
+        for index in reversed(range(table_count)):
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE_PREFIX}{index}")
+
+def measure(engine, table_names, reflect):
+    statements = []
+
+    def count_statement(*_args):
+        statements.append(1)
+
+    with engine.connect() as connection:
+        event.listen(engine, "before_cursor_execute", count_statement)
+
+        started = time.perf_counter()
+        table_schemas = reflect(inspect(connection), table_names)
+        elapsed = time.perf_counter() - started
+
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    return table_schemas, len(statements), elapsed
+
+def format_table_schemas(table_schemas):
+    return [
+        ResponseFormatter._format_single_schema_response(table_schema)
+        for table_schema in table_schemas.values()
+    ]
+
+def get_table_keys(table_names):
+    return {table_name: (None, table_name) for table_name in table_names}
+
+def reflect_per_table(inspector, table_names):
+    return {
+        table_name: DatabaseContext._reflect_table_schema(inspector, table_name, table_key)
+        for table_name, table_key in get_table_keys(table_names).items()
+    }
+
+def reflect_bulk(inspector, table_names):
+    return DatabaseContext._reflect_table_schemas_bulk(inspector, get_table_keys(table_names))
+
+def get_stamps(inspector, table_names):
+    return SchemaChangeTracker().get_stamps(inspector.bind, get_table_keys(table_names))
+
+def benchmark(db_url, table_count):
+    engine = create_engine(db_url)
+    table_names = [f"{TABLE_PREFIX}{index}" for index in range(table_count)]
+
+    try:
+        create_tables(engine, table_count)
+
+        per_table, per_table_statements, per_table_elapsed = measure(engine, table_names, reflect_per_table)
+        bulk, bulk_statements, bulk_elapsed = measure(engine, table_names, reflect_bulk)
+        stamps, stamp_statements, stamp_elapsed = measure(engine, table_names, get_stamps)
+
+    finally:
+        drop_tables(engine, table_count)
+        engine.dispose()
+
+    if format_table_schemas(per_table) != format_table_schemas(bulk):
+        print(f"Bulk reflection differs from per table reflection for {table_count} tables")
+        sys.exit(1)
+
+    if stamps is None or len(stamps) != table_count:
+        print(f"Change stamps are missing for {table_count} tables")
+        sys.exit(1)
+
+    print(f"{table_count:>5} tables | per table: {per_table_statements:>6} queries, {per_table_elapsed:8.3f}s"
+          f" | bulk: {bulk_statements:>6} queries, {bulk_elapsed:8.3f}s"
+          f" | change stamps: {stamp_statements:>6} queries, {stamp_elapsed:8.3f}s")
+
+def main():
+    db_url = sys.argv[1] if len(sys.argv) > 1 else None
+
+    h1(f"Schema reflection ({db_url or 'generated SQLite'})")
+
+    for table_count in TABLE_COUNTS:
+        if db_url is None:
+            with tempfile.TemporaryDirectory() as tmp:
+                benchmark(f"sqlite:///{os.path.join(tmp, 'benchmark.sqlite')}", table_count)
+
+        else:
+            benchmark(db_url, table_count)
+
+if __name__ == "__main__":
+    main()
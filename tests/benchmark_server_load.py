@@ -0,0 +1,369 @@
+"""
+Load test of the MCP server, started under each transport and driven by concurrent MCP clients.
+
+Every client runs a mix of table listing, schema reflection, small lookups and large scans against generated SQLite
+databases of increasing size (and optionally PostgreSQL, e.g. the container in tests/docker-compose.yml, the tables
+are created in the given database).
+
+Reports p50 / p95 / p99 latency, calls per second and the peak RSS of the server as JSON, so releases can be compared.
+
+Usage:
+    python -m tests.benchmark_server_load [--transports stdio sse streamable-http] [--clients 4] [--calls 50]
+                                          [--rows 1000 100000] [--postgres-url URL] [--output results.json]
+                                          [--workers 1]
+
+--workers runs the streamable-http server with multiple processes, all clients use the same DB URL so requests spread
+to the other workers once the tenant's worker is saturated (more clients than --max-workers of the server).
+"""
+import argparse, asyncio, json, os, platform, random, resource, socket, subprocess, sys, tempfile, time, tomllib
+
+from contextlib import asynccontextmanager
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Numeric, String, Table, create_engine, insert
+
+TRANSPORTS = ["stdio", "sse", "streamable-http"]
+
+DEFAULT_CLIENTS = 4
+DEFAULT_CALLS = 50
+DEFAULT_ROWS = [1_000, 100_000]
+
+EXTRA_TABLES = 50
+INSERT_BATCH_SIZE = 10_000
+SERVER_START_TIMEOUT = 30
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Operation name, weight, tool name, arguments (the lookup id is filled in per call)
+OPERATIONS = [
+    ("all_table_names", 1, "all_table_names", {}),
+    ("schema_definitions", 1, "schema_definitions", {"table_names": ["customers", "orders"]}),
+    ("small_lookup", 6, "execute_query", {"query": "SELECT * FROM orders WHERE id = :id", "params": {}}),
+    ("large_scan", 2, "execute_query", {"query": "SELECT * FROM orders ORDER BY id", "params": None}),
+]
+
+def get_version():
+    # Importing the server module would start configuring it, the version is taken from the project instead
+    with open(os.path.join(PROJECT_ROOT, "pyproject.toml"), "rb") as f:
+        return tomllib.load(f)["project"]["version"]
+
+def h1(s):
+    print(s, file=sys.stderr)
+    print("=" * len(s), file=sys.stderr)
+    print(file=sys.stderr)
+
+def generate_database(db_url, rows):
+    metadata = MetaData()
+
+    customers = Table(
+        "customers", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(100), nullable=False),
+        Column("email", String(200)),
+    )
+
+    orders = Table(
+        "orders", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("customer_id", Integer, ForeignKey("customers.id"), nullable=False),
+        Column("status", String(20)),
+        Column("total", Numeric(10, 2)),
+        Column("notes", String(200)),
+    )
+
+    # Only there to make table listing realistic
+    for index in range(EXTRA_TABLES):
+        Table(f"extra_table_{index:03d}", metadata, Column("id", Integer, primary_key=True), Column("value", String(50)))
+
+    engine = create_engine(db_url)
+
+    customer_count = max(1, rows // 10)
+
+    with engine.begin() as connection:
+        metadata.drop_all(connection)
+        metadata.create_all(connection)
+
+        for start in range(0, customer_count, INSERT_BATCH_SIZE):
+            connection.execute(insert(customers), [
+                {"id": index + 1, "name": f"Customer {index + 1}", "email": f"customer{index + 1}@example.com"}
+                for index in range(start, min(start + INSERT_BATCH_SIZE, customer_count))
+            ])
+
+        for start in range(0, rows, INSERT_BATCH_SIZE):
+            connection.execute(insert(orders), [
+                {
+                    "id": index + 1,
+                    "customer_id": index % customer_count + 1,
+                    "status": ("new", "paid", "shipped", "cancelled")[index % 4],
+                    "total": f"{(index % 1000) + 0.99:.2f}",
+                    "notes": f"Order number {index + 1}"
+                }
+                for index in range(start, min(start + INSERT_BATCH_SIZE, rows))
+            ])
+
+    engine.dispose()
+
+def get_free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+
+        return s.getsockname()[1]
+
+def get_server_env(db_url):
+    env = os.environ.copy()
+    env["DB_URL"] = db_url
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+
+    return env
+
+def wait_for_port(port, process):
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError(f"Server did not start listening on port {port} within {SERVER_START_TIMEOUT} seconds")
+
+@asynccontextmanager
+async def open_session(transport, db_url, port):
+    if transport == "stdio":
+        server = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "mcp_alchemy.server", "--transport", "stdio"],
+            env=get_server_env(db_url),
+            cwd=PROJECT_ROOT
+        )
+
+        with open(os.devnull, "w") as errlog:
+            async with stdio_client(server, errlog=errlog) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+
+                    yield session
+
+    elif transport == "sse":
+        async with sse_client(f"http://127.0.0.1:{port}/sse", headers={"x-db-url": db_url}) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                yield session
+
+    else:
+        async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp", headers={"x-db-url": db_url}) as streams:
+            read, write, _ = streams
+
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                yield session
+
+async def run_client(transport, db_url, port, calls, rows, seed, latencies):
+    rnd = random.Random(seed)
+
+    names = [operation[0] for operation in OPERATIONS]
+    weights = [operation[1] for operation in OPERATIONS]
+    operations = {operation[0]: operation for operation in OPERATIONS}
+
+    errors = 0
+
+    async with open_session(transport, db_url, port) as session:
+        for _ in range(calls):
+            name = rnd.choices(names, weights)[0]
+            _, _, tool, arguments = operations[name]
+
+            if name == "small_lookup":
+                arguments = {**arguments, "params": {"id": rnd.randint(1, rows)}}
+
+            started = time.perf_counter()
+
+            result = await session.call_tool(tool, arguments)
+
+            latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+            if result.isError or '"error"' in result.content[0].text:
+                errors += 1
+
+    return errors
+
+def percentile(values, p):
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+def summarize_latencies(latencies):
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3)
+    }
+
+async def run_clients(transport, db_url, port, clients, calls, rows):
+    latencies = {}
+
+    started = time.perf_counter()
+
+    errors = await asyncio.gather(*[
+        run_client(transport, db_url, port, calls, rows, seed, latencies)
+        for seed in range(clients)
+    ])
+
+    duration = time.perf_counter() - started
+
+    return latencies, sum(errors), duration
+
+def run_scenario(transport, db_url, clients, calls, rows, workers):
+    """Runs in a process of its own, so the peak RSS of terminated children is only the server(s) of this scenario"""
+    process = None
+    port = None
+
+    if transport != "stdio":
+        port = get_free_port()
+
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "mcp_alchemy.server", "--transport", transport, "--port", str(port),
+                *(["--workers", str(workers)] if transport == "streamable-http" else [])
+            ],
+            env=get_server_env(db_url),
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+    try:
+        if process is not None:
+            wait_for_port(port, process)
+
+        latencies, errors, duration = asyncio.run(run_clients(transport, db_url, port, clients, calls, rows))
+
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    all_latencies = [latency for operation_latencies in latencies.values() for latency in operation_latencies]
+
+    # Kilobytes on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    if sys.platform != "darwin":
+        peak_rss *= 1024
+
+    result = {
+        "calls": len(all_latencies),
+        "errors": errors,
+        "duration_seconds": round(duration, 3),
+        "calls_per_second": round(len(all_latencies) / duration, 2),
+        "latency": summarize_latencies(all_latencies),
+        "operations": {
+            name: summarize_latencies(operation_latencies)
+            for name, operation_latencies in sorted(latencies.items())
+        },
+        "peak_rss_mb": round(peak_rss / 1024 / 1024, 1)
+    }
+
+    return result
+
+def run_scenario_process(transport, db_url, clients, calls, rows, workers):
+    output = subprocess.check_output(
+        [
+            sys.executable, "-m", "tests.benchmark_server_load",
+            "--scenario", transport, db_url,
+            "--clients", str(clients),
+            "--calls", str(calls),
+            "--rows", str(rows),
+            "--workers", str(workers)
+        ],
+        cwd=PROJECT_ROOT,
+        env=get_server_env(db_url)
+    )
+
+    return json.loads(output)
+
+def main():
+    p = argparse.ArgumentParser(description="Load test of MCP Alchemy")
+    p.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=TRANSPORTS)
+    p.add_argument("--clients", type=int, default=DEFAULT_CLIENTS)
+    p.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="Calls per client")
+    p.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Rows of the generated databases")
+    p.add_argument("--postgres-url", default=os.environ.get("BENCHMARK_POSTGRES_URL"))
+    p.add_argument("--workers", type=int, default=1, help="Server processes of the streamable-http transport")
+    p.add_argument("--output", help="Write the JSON report to a file rather than stdout")
+    p.add_argument("--scenario", nargs=2, metavar=("TRANSPORT", "DB_URL"), help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.scenario is not None:
+        transport, db_url = args.scenario
+
+        print(json.dumps(run_scenario(transport, db_url, args.clients, args.calls, args.rows[0], args.workers)))
+
+        return
+
+    report = {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "clients": args.clients,
+        "calls_per_client": args.calls,
+        "workers": args.workers,
+        "results": []
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        databases = [
+            ("sqlite", f"sqlite:///{os.path.join(directory, f'benchmark_{rows}.sqlite')}", rows)
+            for rows in args.rows
+        ]
+
+        if args.postgres_url:
+            databases.extend(("postgresql", args.postgres_url, rows) for rows in args.rows)
+
+        for database, db_url, rows in databases:
+            h1(f"{database}, {rows:,} rows")
+
+            generate_database(db_url, rows)
+
+            for transport in args.transports:
+                result = run_scenario_process(transport, db_url, args.clients, args.calls, rows, args.workers)
+
+                print(
+                    f"{transport:<16} {result['calls_per_second']:>8.1f} calls/s, "
+                    f"p50 {result['latency']['p50_ms']:.1f}ms, p95 {result['latency']['p95_ms']:.1f}ms, "
+                    f"p99 {result['latency']['p99_ms']:.1f}ms, peak RSS {result['peak_rss_mb']:.1f}MB, "
+                    f"errors {result['errors']}",
+                    file=sys.stderr
+                )
+
+                report["results"].append({
+                    "transport": transport,
+                    "database": database,
+                    "rows": rows,
+                    **result
+                })
+
+            print(file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Checks the admission of database calls: round-robin between tenants, the queue limits, the queue timeout and the
+release of the slots of cancelled calls.
+"""
+import asyncio, threading
+
+import pytest
+
+from mcp_alchemy.admission_controller import (
+    REJECTION_REASON_QUEUE_FULL,
+    REJECTION_REASON_QUEUE_TIMEOUT,
+    REJECTION_REASON_TENANT_QUEUE_FULL,
+    AdmissionController,
+    AdmissionRejectedError
+)
+from mcp_alchemy.database_executor import DatabaseExecutor
+
+def create_admission_controller(max_concurrency: int = 1, max_tenant_concurrency: int = 1, max_queue_size: int = 100,
+                                max_tenant_queue_size: int = 100, queue_timeout: float = 0) -> AdmissionController:
+    return AdmissionController(max_concurrency, max_tenant_concurrency, max_queue_size, max_tenant_queue_size,
+                               queue_timeout)
+
+async def hold_slot(admission_controller: AdmissionController, tenant_id: str, released: asyncio.Event):
+    async with admission_controller.admit(tenant_id):
+        await released.wait()
+
+async def start(coroutine) -> asyncio.Task:
+    """Run the task until it waits, e.g. holds a slot or is queued"""
+    task = asyncio.create_task(coroutine)
+
+    await asyncio.sleep(0)
+
+    return task
+
+def test_tenants_are_served_round_robin():
+    async def main():
+        admission_controller = create_admission_controller()
+        released = asyncio.Event()
+        admitted = []
+
+        async def call(tenant_id: str):
+            async with admission_controller.admit(tenant_id):
+                admitted.append(tenant_id)
+
+        holder = await start(hold_slot(admission_controller, "a", released))
+
+        # Tenant a floods the queue before tenant b queues its calls
+        calls = [await start(call("a")) for _ in range(4)] + [await start(call("b")) for _ in range(2)]
+
+        assert admission_controller.get_queue_depth() == {"a": 4, "b": 2}
+
+        released.set()
+
+        await asyncio.gather(holder, *calls)
+
+        return admitted
+
+    assert asyncio.run(main()) == ["a", "b", "a", "b", "a", "a"]
+
+def test_tenant_concurrency_leaves_slots_to_other_tenants():
+    async def main():
+        admission_controller = create_admission_controller(max_concurrency=2, max_tenant_concurrency=1)
+        released = asyncio.Event()
+
+        holder = await start(hold_slot(admission_controller, "a", released))
+        queued = await start(hold_slot(admission_controller, "a", released))
+        other_tenant = await start(hold_slot(admission_controller, "b", released))
+
+        assert admission_controller.get_active_calls() == {"a": 1, "b": 1}
+        assert admission_controller.get_queue_depth() == {"a": 1}
+
+        released.set()
+
+        await asyncio.gather(holder, queued, other_tenant)
+
+        assert admission_controller.get_active_calls() == {}
+
+    asyncio.run(main())
+
+def test_full_queues_reject_calls():
+    async def main():
+        admission_controller = create_admission_controller(max_queue_size=2, max_tenant_queue_size=1)
+        released = asyncio.Event()
+
+        holder = await start(hold_slot(admission_controller, "a", released))
+        queued = [await start(hold_slot(admission_controller, "a", released))]
+
+        with pytest.raises(AdmissionRejectedError) as tenant_rejection:
+            async with admission_controller.admit("a"):
+                pass
+
+        # Other tenants still queue until the queue is full
+        queued.append(await start(hold_slot(admission_controller, "b", released)))
+
+        with pytest.raises(AdmissionRejectedError) as rejection:
+            async with admission_controller.admit("c"):
+                pass
+
+        released.set()
+
+        await asyncio.gather(holder, *queued)
+
+        return tenant_rejection.value.reason, rejection.value.reason
+
+    assert asyncio.run(main()) == (REJECTION_REASON_TENANT_QUEUE_FULL, REJECTION_REASON_QUEUE_FULL)
+
+def test_queue_timeout_rejects_waiting_calls():
+    async def main():
+        admission_controller = create_admission_controller(queue_timeout=0.05)
+        released = asyncio.Event()
+
+        holder = await start(hold_slot(admission_controller, "a", released))
+
+        with pytest.raises(AdmissionRejectedError) as rejection:
+            async with admission_controller.admit("b"):
+                pass
+
+        assert rejection.value.reason == REJECTION_REASON_QUEUE_TIMEOUT
+        assert admission_controller.get_queue_depth() == {}
+
+        released.set()
+
+        await holder
+
+        assert admission_controller.get_active_calls() == {}
+
+    asyncio.run(main())
+
+def test_cancelled_queued_call_is_removed():
+    async def main():
+        admission_controller = create_admission_controller()
+        released = asyncio.Event()
+
+        holder = await start(hold_slot(admission_controller, "a", released))
+        queued = await start(hold_slot(admission_controller, "b", released))
+
+        queued.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert admission_controller.get_queue_depth() == {}
+
+        released.set()
+
+        await holder
+
+        assert admission_controller.get_active_calls() == {}
+
+    asyncio.run(main())
+
+def test_cancelled_call_holds_its_slot_until_the_worker_returns():
+    async def main():
+        admission_controller = create_admission_controller()
+        database_executor = DatabaseExecutor(2, admission_controller)
+
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def work():
+            started.set()
+
+            # Stands for a running statement, stopped by on_cancel (e.g. the statement guard's cancel)
+            stopped.wait(5)
+
+        try:
+            call = asyncio.create_task(database_executor.run("a", work, on_cancel=stopped.set))
+
+            await asyncio.to_thread(started.wait, 5)
+
+            queued = await start(database_executor.run("b", lambda: "b"))
+
+            call.cancel()
+
+            await asyncio.sleep(0)
+
+            # The worker still runs until the cancel reached it, the queued call waits for the slot
+            assert admission_controller.get_active_calls() == {"a": 1}
+
+            with pytest.raises(asyncio.CancelledError):
+                await call
+
+            assert stopped.is_set()
+            assert await queued == "b"
+            assert admission_controller.get_active_calls() == {}
+
+        finally:
+            database_executor.shutdown()
+
+    asyncio.run(main())
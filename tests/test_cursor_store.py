@@ -0,0 +1,155 @@
+"""
+Checks the open cursors kept for fetch_more: expiry, least recently used eviction and isolation between tenants.
+"""
+import shutil, sqlite3, time
+
+import pytest
+
+from sqlalchemy import create_engine, text
+
+from mcp_alchemy.cursor_store import CursorStore, OpenCursor, get_token_worker_index
+
+CHINOOK_PATH = "tests/Chinook_Sqlite.sqlite"
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+
+    yield engine
+
+    engine.dispose()
+
+def open_cursor(engine, connection_id: str = "tenant-a") -> OpenCursor:
+    connection = engine.connect()
+    cursor = connection.execute(text("SELECT 1 UNION ALL SELECT 2"))
+
+    return OpenCursor(connection_id, connection, cursor, [], 0, "rows")
+
+def test_disabled_by_default():
+    assert not CursorStore().is_enabled
+
+def test_pop_returns_cursor_once(engine):
+    cursor_store = CursorStore(ttl=60)
+    cursor = open_cursor(engine)
+
+    token = cursor_store.add(cursor)
+
+    assert cursor_store.pop(token, "tenant-a") is cursor
+    assert cursor_store.pop(token, "tenant-a") is None
+
+    cursor.close()
+
+def test_expired_cursor_is_closed_on_pop(engine):
+    cursor_store = CursorStore(ttl=60)
+    cursor = open_cursor(engine)
+
+    token = cursor_store.add(cursor)
+    cursor.expires_at = time.monotonic() - 1
+
+    assert cursor_store.pop(token, "tenant-a") is None
+    assert cursor.connection.closed
+
+def test_close_expired_keeps_live_cursors(engine):
+    cursor_store = CursorStore(ttl=60, max_open_cursors_per_tenant=2)
+    expired_cursor = open_cursor(engine)
+    live_cursor = open_cursor(engine)
+
+    cursor_store.add(expired_cursor)
+    live_token = cursor_store.add(live_cursor)
+    expired_cursor.expires_at = time.monotonic() - 1
+
+    assert cursor_store.close_expired() == 1
+    assert expired_cursor.connection.closed
+    assert not live_cursor.connection.closed
+    assert cursor_store.pop(live_token, "tenant-a") is live_cursor
+
+    live_cursor.close()
+
+def test_tenant_limit_evicts_least_recently_added(engine):
+    cursor_store = CursorStore(ttl=60, max_open_cursors_per_tenant=2)
+    cursors = [open_cursor(engine) for _ in range(3)]
+
+    tokens = [cursor_store.add(cursor) for cursor in cursors]
+
+    assert cursors[0].connection.closed
+    assert cursor_store.pop(tokens[0], "tenant-a") is None
+    assert [cursor_store.pop(token, "tenant-a") for token in tokens[1:]] == cursors[1:]
+
+    for cursor in cursors[1:]:
+        cursor.close()
+
+def test_global_limit_evicts_least_recently_used(engine):
+    cursor_store = CursorStore(ttl=60, max_open_cursors=2, max_open_cursors_per_tenant=2)
+    first_cursor = open_cursor(engine, "tenant-a")
+    second_cursor = open_cursor(engine, "tenant-b")
+    third_cursor = open_cursor(engine, "tenant-c")
+
+    first_token = cursor_store.add(first_cursor)
+    second_token = cursor_store.add(second_cursor)
+
+    # Fetched again, the second cursor becomes the least recently used one
+    cursor_store.add(cursor_store.pop(first_token, "tenant-a"), first_token)
+    cursor_store.add(third_cursor)
+
+    assert second_cursor.connection.closed
+    assert cursor_store.pop(second_token, "tenant-b") is None
+    assert cursor_store.pop(first_token, "tenant-a") is first_cursor
+
+    first_cursor.close()
+    cursor_store.close_all()
+
+    assert third_cursor.connection.closed
+
+def test_tenants_are_isolated(engine):
+    cursor_store = CursorStore(ttl=60)
+    tenant_a_cursor = open_cursor(engine, "tenant-a")
+    tenant_b_cursor = open_cursor(engine, "tenant-b")
+
+    tenant_a_token = cursor_store.add(tenant_a_cursor)
+    tenant_b_token = cursor_store.add(tenant_b_cursor)
+
+    # Another tenant neither gets the cursor nor consumes the token
+    assert cursor_store.pop(tenant_a_token, "tenant-b") is None
+    assert not tenant_a_cursor.connection.closed
+
+    assert cursor_store.close_tenant("tenant-a") == 1
+    assert tenant_a_cursor.connection.closed
+    assert not tenant_b_cursor.connection.closed
+    assert cursor_store.pop(tenant_b_token, "tenant-b") is tenant_b_cursor
+
+    tenant_b_cursor.close()
+
+def test_tokens_name_their_worker(engine):
+    cursor_store = CursorStore()
+    cursor_store.configure(60, 32, 1, "3")
+
+    single_process_cursor_store = CursorStore(ttl=60)
+
+    assert get_token_worker_index(cursor_store.add(open_cursor(engine))) == 3
+    assert get_token_worker_index(single_process_cursor_store.add(open_cursor(engine))) is None
+
+    cursor_store.close_all()
+    single_process_cursor_store.close_all()
+
+def test_truncated_result_releases_database_lock_by_default(tmp_path, monkeypatch):
+    db_path = tmp_path / "chinook.sqlite"
+    shutil.copyfile(CHINOOK_PATH, db_path)
+
+    monkeypatch.setenv("DB_URL", f"sqlite:///{db_path}")
+
+    from mcp_alchemy.cursor_store import CURSOR_STORE
+    from mcp_alchemy.request_context import RequestContext
+    from mcp_alchemy.response_formatter import ResponseFormatter
+
+    request_context = RequestContext.load()
+
+    result = ResponseFormatter(request_context).get_execute_query_response("SELECT * FROM Track", None)
+
+    assert not CURSOR_STORE.is_enabled
+    assert result["truncated"]
+    assert "continuation_token" not in result
+    assert request_context.db_context.engine.pool.checkedout() == 0
+
+    # Another process writing to the database is not blocked by the truncated read
+    with sqlite3.connect(db_path, timeout=0) as connection:
+        connection.execute("UPDATE Track SET Name = Name WHERE TrackId = 1")
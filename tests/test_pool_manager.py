@@ -0,0 +1,234 @@
+"""
+Checks the pools sized by the pool manager. ManagedPool.resize changes the internals of QueuePool, these tests keep
+its counts (checked out, checked in, overflow) consistent with the connections actually open, also while checkouts
+and returns run concurrently with resizes.
+"""
+import random, threading, time
+
+import pytest
+
+from sqlalchemy import create_engine, event, exc, text
+
+from mcp_alchemy.pool_manager import ManagedPool, PoolManager
+
+CHECKOUT_THREADS = 8
+CHECKOUTS_PER_THREAD = 50
+
+def create_file_engine(tmp_path, pool_timeout: float = 5):
+    # A file database, SQLite in memory uses a single connection (StaticPool / SingletonThreadPool)
+    return create_engine(f"sqlite:///{tmp_path / 'pool.sqlite'}", pool_size=2, max_overflow=4,
+                         pool_timeout=pool_timeout)
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_file_engine(tmp_path)
+
+    yield engine
+
+    engine.dispose()
+
+@pytest.fixture
+def open_connections(engine) -> dict:
+    """DBAPI connections opened and not closed yet, counted by the pool's events"""
+    counts = {"open": 0}
+    lock = threading.Lock()
+
+    def on_connect(*_):
+        with lock:
+            counts["open"] += 1
+
+    def on_close(*_):
+        with lock:
+            counts["open"] -= 1
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "close", on_close)
+    event.listen(engine, "close_detached", on_close)
+
+    return counts
+
+def assert_consistent(managed_pool: ManagedPool, open_connections: dict, checked_out: int):
+    pool = managed_pool.pool
+
+    assert pool.checkedout() == checked_out
+    assert pool.checkedin() + pool.checkedout() == open_connections["open"]
+    assert pool.size() + pool.overflow() == open_connections["open"]
+    assert pool.size() + pool._max_overflow == managed_pool.capacity
+    assert open_connections["open"] <= max(managed_pool.capacity, checked_out)
+
+def check_out(engine, count: int) -> list:
+    connections = [engine.connect() for _ in range(count)]
+
+    for connection in connections:
+        connection.execute(text("SELECT 1"))
+
+    return connections
+
+def test_resize_keeps_the_counts_of_the_pool(engine, open_connections):
+    managed_pool = ManagedPool("tenant", engine, 6)
+
+    connections = check_out(engine, 6)
+
+    assert_consistent(managed_pool, open_connections, 6)
+
+    # Shrinking below the checked out connections closes them once returned
+    managed_pool.resize(3)
+
+    assert_consistent(managed_pool, open_connections, 6)
+
+    for connection in connections:
+        connection.close()
+
+    assert_consistent(managed_pool, open_connections, 0)
+    assert engine.pool.checkedin() <= engine.pool.size()
+
+    managed_pool.resize(8)
+
+    connections = check_out(engine, 8)
+
+    assert_consistent(managed_pool, open_connections, 8)
+
+    for connection in connections:
+        connection.close()
+
+    assert_consistent(managed_pool, open_connections, 0)
+
+def test_capacity_limits_checkouts(tmp_path):
+    engine = create_file_engine(tmp_path, pool_timeout=0.1)
+    managed_pool = ManagedPool("tenant", engine, 2)
+
+    try:
+        connections = check_out(engine, 2)
+
+        assert managed_pool.is_saturated()
+
+        with pytest.raises(exc.TimeoutError, match="QueuePool limit"):
+            engine.connect()
+
+        managed_pool.resize(3)
+
+        connections.append(engine.connect())
+
+        assert engine.pool.checkedout() == 3
+
+        for connection in connections:
+            connection.close()
+
+    finally:
+        engine.dispose()
+
+def test_close_idle_connections(engine, open_connections):
+    managed_pool = ManagedPool("tenant", engine, 6)
+
+    for connection in check_out(engine, 2):
+        connection.close()
+
+    assert engine.pool.checkedin() == 2
+
+    assert managed_pool.close_idle_connections() == 2
+    assert open_connections["open"] == 0
+
+    assert_consistent(managed_pool, open_connections, 0)
+
+def test_concurrent_checkouts_and_resizes(engine, open_connections):
+    managed_pool = ManagedPool("tenant", engine, 6)
+
+    lock = threading.Lock()
+    errors = []
+    stopped = threading.Event()
+
+    def check_out_repeatedly():
+        try:
+            for _ in range(CHECKOUTS_PER_THREAD):
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+
+                    time.sleep(random.random() / 1000)
+
+        except Exception as ex:
+            errors.append(ex)
+
+    def resize_repeatedly():
+        while not stopped.is_set():
+            managed_pool.resize(random.randint(1, 8))
+
+            if random.random() < 0.3:
+                managed_pool.close_idle_connections(random.randint(0, 2))
+
+            time.sleep(random.random() / 1000)
+
+    threads = [threading.Thread(target=check_out_repeatedly) for _ in range(CHECKOUT_THREADS)]
+    resizer = threading.Thread(target=resize_repeatedly)
+
+    resizer.start()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(30)
+
+    stopped.set()
+    resizer.join(5)
+
+    assert errors == []
+
+    managed_pool.resize(3)
+
+    assert_consistent(managed_pool, open_connections, 0)
+    assert engine.pool.checkedin() <= engine.pool.size()
+
+    # After all resizes the pool still opens exactly its capacity, further checkouts wait
+    peak = {"checked_out": 0, "current": 0}
+    released = threading.Event()
+
+    def hold_connection():
+        with engine.connect():
+            with lock:
+                peak["current"] += 1
+                peak["checked_out"] = max(peak["checked_out"], peak["current"])
+
+            released.wait(5)
+
+            with lock:
+                peak["current"] -= 1
+
+    holders = [threading.Thread(target=hold_connection) for _ in range(6)]
+
+    for holder in holders:
+        holder.start()
+
+    time.sleep(0.2)
+
+    assert engine.pool.checkedout() == 3
+    assert open_connections["open"] == 3
+
+    released.set()
+
+    for holder in holders:
+        holder.join(10)
+
+    assert peak["checked_out"] == 3
+    assert_consistent(managed_pool, open_connections, 0)
+
+def test_pool_manager_manages_queue_pools_only(engine):
+    pool_manager = PoolManager()
+    pool_manager.configure(4, 4)
+
+    managed_pool = pool_manager.register("tenant", engine)
+
+    # Started within the connection budget
+    assert managed_pool.capacity == 4
+    assert engine.pool.size() + engine.pool._max_overflow == 4
+
+    memory_engine = create_engine("sqlite://")
+
+    try:
+        assert pool_manager.register("memory-tenant", memory_engine) is None
+
+    finally:
+        memory_engine.dispose()
+
+    pool_manager.unregister(managed_pool)
+
+    assert pool_manager.get_reserved_connections() == 0
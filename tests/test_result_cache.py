@@ -0,0 +1,96 @@
+"""
+Checks the keys of the query result cache and which queries are cached.
+"""
+import shutil
+
+import pytest
+
+from mcp_alchemy.query_classifier import is_cacheable_query
+from mcp_alchemy.result_cache import DEFAULT_RESULT_CACHE_MAX_BYTES, QueryResultCache
+
+CHINOOK_PATH = "tests/Chinook_Sqlite.sqlite"
+
+@pytest.fixture
+def request_context(tmp_path, monkeypatch):
+    db_path = tmp_path / "chinook.sqlite"
+    shutil.copyfile(CHINOOK_PATH, db_path)
+
+    monkeypatch.setenv("DB_URL", f"sqlite:///{db_path}")
+
+    from mcp_alchemy.request_context import RequestContext
+    from mcp_alchemy.result_cache import RESULT_CACHE
+
+    RESULT_CACHE.configure(60, DEFAULT_RESULT_CACHE_MAX_BYTES)
+
+    try:
+        yield RequestContext.load()
+
+    finally:
+        RESULT_CACHE.configure(0, DEFAULT_RESULT_CACHE_MAX_BYTES)
+
+def execute_query(request_context, query: str) -> dict:
+    from mcp_alchemy.response_formatter import ResponseFormatter
+
+    return ResponseFormatter(request_context).get_execute_query_response(query, None)
+
+def test_key_is_the_exact_query_text():
+    get_key = QueryResultCache.get_key
+
+    assert get_key("tenant", "SELECT 'a  b' AS v", None) != get_key("tenant", "SELECT 'a b' AS v", None)
+    assert get_key("tenant", 'SELECT 1 AS "a  b"', None) != get_key("tenant", 'SELECT 1 AS "a b"', None)
+    assert get_key("tenant", "SELECT 1 -- x\n, 2", None) != get_key("tenant", "SELECT 1 -- x , 2", None)
+
+def test_key_depends_on_tenant_params_and_options():
+    get_key = QueryResultCache.get_key
+
+    assert get_key("tenant", "SELECT :id", {"id": 1, "x": 2}) == get_key("tenant", "SELECT :id", {"x": 2, "id": 1})
+    assert get_key("tenant", "SELECT :id", {"id": 1}) != get_key("tenant", "SELECT :id", {"id": 2})
+    assert get_key("tenant", "SELECT 1", None) != get_key("other-tenant", "SELECT 1", None)
+    assert get_key("tenant", "SELECT 1", None, 100) != get_key("tenant", "SELECT 1", None, 200)
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM Track",
+    "SELECT count(*), max(Milliseconds) FROM Track WHERE Name LIKE 'a%'",
+    "SELECT lower(Name), coalesce(Composer, 'unknown') FROM Track WHERE AlbumId IN (1, 2)",
+    "SELECT CAST(UnitPrice AS DECIMAL(10, 2)) FROM Track",
+    "WITH t AS (SELECT TrackId FROM Track) SELECT * FROM t WHERE EXISTS (SELECT 1)",
+    "SELECT row_number() OVER (PARTITION BY AlbumId ORDER BY TrackId) FROM Track",
+    "SELECT 'audit_log(1)' AS v",
+    "SELECT 1 -- nextval('seq')",
+])
+def test_cacheable_queries(query):
+    assert is_cacheable_query(query)
+
+@pytest.mark.parametrize("query", [
+    "SELECT audit_log(1)",
+    "SELECT some_writing_function()",
+    "SELECT nextval('seq')",
+    "SELECT setval('seq', 1)",
+    "SELECT app.audit_log(1)",
+    'SELECT "audit_log"(1)',
+    "SELECT random()",
+    "UPDATE Track SET Name = 'x'",
+    "SELECT 1; DELETE FROM Track",
+])
+def test_queries_that_are_not_cached(query):
+    assert not is_cacheable_query(query)
+
+def test_whitespace_within_literals_is_not_served_from_the_cache(request_context):
+    first_result = execute_query(request_context, "SELECT 'a  b' AS v")
+    second_result = execute_query(request_context, "SELECT 'a b' AS v")
+
+    assert first_result["rows"] == [{"v": "a  b"}]
+    assert second_result["rows"] == [{"v": "a b"}]
+    assert not second_result["cached"]
+    assert execute_query(request_context, "SELECT 'a b' AS v")["cached"]
+
+def test_function_calls_are_executed_every_time(request_context):
+    execute_query(request_context, "SELECT count(*) AS n FROM Album")
+
+    result = execute_query(request_context, "SELECT random() AS v")
+
+    assert "cached" not in result
+    assert "cached" not in execute_query(request_context, "SELECT random() AS v")
+
+    # A function might have written, the cached results of the tenant are invalidated
+    assert not execute_query(request_context, "SELECT count(*) AS n FROM Album")["cached"]
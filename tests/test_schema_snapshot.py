@@ -0,0 +1,145 @@
+"""
+Checks the table schemas persisted in the schema snapshot: a new process serves them in the shape of reflected ones,
+and the change stamps (SQLite's PRAGMA schema_version) decide which tables are reflected again.
+"""
+import shutil, sqlite3, threading
+
+import pytest
+
+from mcp_alchemy.database_context import CACHE_KEY_TABLE_SCHEMA, DatabaseContext
+from mcp_alchemy.metadata_cache import MetadataCache
+from mcp_alchemy.schema_snapshot import SCHEMA_SNAPSHOT_STORE
+
+CHINOOK_PATH = "tests/Chinook_Sqlite.sqlite"
+
+TABLE_NAMES = ["Track", "Invoice", "InvoiceLine", "Missing"]
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    db_path = tmp_path / "chinook.sqlite"
+    shutil.copyfile(CHINOOK_PATH, db_path)
+
+    monkeypatch.setattr(SCHEMA_SNAPSHOT_STORE, "directory", str(tmp_path / "snapshots"))
+
+    return db_path
+
+@pytest.fixture
+def reflections(monkeypatch):
+    """Tables reflected from the database, by any database context"""
+    reflected_table_names = []
+    reflect_table_schemas = DatabaseContext._reflect_table_schemas
+
+    def counting_reflect_table_schemas(inspector, table_keys):
+        reflected_table_names.extend(table_keys)
+
+        return reflect_table_schemas(inspector, table_keys)
+
+    monkeypatch.setattr(DatabaseContext, "_reflect_table_schemas", staticmethod(counting_reflect_table_schemas))
+
+    return reflected_table_names
+
+def create_db_context(db_path) -> DatabaseContext:
+    """Database context of a new process, it only shares the snapshot with the previous ones"""
+    return DatabaseContext(f"sqlite:///{db_path}", {}, MetadataCache(ttl=60, max_size=100))
+
+def wait_for_validation():
+    for thread in threading.enumerate():
+        if thread.name == "mcp-alchemy-schema-snapshot":
+            thread.join(5)
+
+def get_columns(table_schema: dict) -> list[str]:
+    return [column["name"] for column in table_schema["columns"]]
+
+def test_snapshot_schemas_have_the_shape_of_reflected_ones(db_path, reflections):
+    db_context = create_db_context(db_path)
+    reflected_table_schemas = db_context.get_schema_details(TABLE_NAMES)
+    db_context.dispose()
+
+    assert reflections == TABLE_NAMES
+    assert reflected_table_schemas[0]["primary_keys"] == {"TrackId"}
+    assert all(
+        isinstance(column["type"], str)
+        for table_schema in reflected_table_schemas[:3]
+        for column in table_schema["columns"]
+    )
+
+    snapshot_db_context = create_db_context(db_path)
+
+    try:
+        assert snapshot_db_context.get_schema_details(TABLE_NAMES) == reflected_table_schemas
+
+        wait_for_validation()
+
+        # Unchanged stamps, the snapshot was neither reflected again while serving nor while validating it
+        assert reflections == TABLE_NAMES
+        assert snapshot_db_context.get_schema_details(TABLE_NAMES) == reflected_table_schemas
+
+    finally:
+        snapshot_db_context.dispose()
+
+def test_changed_schema_version_replaces_snapshot_schemas(db_path, reflections):
+    db_context = create_db_context(db_path)
+    db_context.get_schema_details(["Track", "Invoice"])
+    db_context.dispose()
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("ALTER TABLE Track ADD COLUMN Rating INTEGER")
+
+    reflections.clear()
+
+    snapshot_db_context = create_db_context(db_path)
+
+    try:
+        # Served from the snapshot right away, the validation finds the changed stamp
+        assert "Rating" not in get_columns(snapshot_db_context.get_schema_details(["Track"])[0])
+
+        wait_for_validation()
+
+        # SQLite's tables share the stamp of the database file, all of them are reflected again
+        assert sorted(reflections) == ["Invoice", "Track"]
+        assert "Rating" in get_columns(snapshot_db_context.get_schema_details(["Track"])[0])
+
+    finally:
+        snapshot_db_context.dispose()
+
+    reflections.clear()
+
+    # The validation saved the new schema and stamp for the next process
+    next_db_context = create_db_context(db_path)
+
+    try:
+        assert "Rating" in get_columns(next_db_context.get_schema_details(["Track"])[0])
+
+        wait_for_validation()
+
+        assert reflections == []
+
+    finally:
+        next_db_context.dispose()
+
+def test_expired_schemas_are_renewed_until_the_schema_version_changes(db_path, reflections):
+    db_context = create_db_context(db_path)
+
+    def expire_table_schemas():
+        for key, (_, value) in list(db_context.metadata_cache._entries.items()):
+            if key[0] == CACHE_KEY_TABLE_SCHEMA:
+                db_context.metadata_cache._entries[key] = (0, value)
+
+    try:
+        table_schemas = db_context.get_schema_details(["Track", "Invoice"])
+
+        expire_table_schemas()
+
+        assert db_context.get_schema_details(["Track", "Invoice"]) == table_schemas
+        assert reflections == ["Track", "Invoice"]
+
+        with sqlite3.connect(db_path) as connection:
+            connection.execute("ALTER TABLE Track ADD COLUMN Rating INTEGER")
+
+        expire_table_schemas()
+
+        assert "Rating" in get_columns(db_context.get_schema_details(["Track"])[0])
+        assert reflections == ["Track", "Invoice", "Track"]
+
+    finally:
+        db_context.dispose()
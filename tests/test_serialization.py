@@ -0,0 +1,81 @@
+"""
+Checks that the JSON backends (orjson, msgspec and the standard library) serialize tool responses identically.
+"""
+import decimal, datetime, json, shutil
+
+import pytest
+
+from sqlalchemy import Integer, Numeric
+
+from mcp_alchemy.serialization import JSON_BACKEND_JSON, JSON_BACKENDS
+
+CHINOOK_PATH = "tests/Chinook_Sqlite.sqlite"
+
+@pytest.fixture
+def request_context(tmp_path, monkeypatch):
+    db_path = tmp_path / "chinook.sqlite"
+    shutil.copyfile(CHINOOK_PATH, db_path)
+
+    monkeypatch.setenv("DB_URL", f"sqlite:///{db_path}")
+
+    from mcp_alchemy.request_context import RequestContext
+
+    return RequestContext.load()
+
+def assert_identical(data) -> dict[tuple[str, bool], str]:
+    if len(JSON_BACKENDS) < 2:
+        pytest.skip("Neither orjson nor msgspec is installed")
+
+    outputs = {
+        (json_backend, sort_keys): dumps(data, sort_keys)
+        for json_backend, dumps in JSON_BACKENDS.items()
+        for sort_keys in (False, True)
+    }
+
+    for (json_backend, sort_keys), output in outputs.items():
+        assert output == outputs[JSON_BACKEND_JSON, sort_keys], json_backend
+
+    return outputs
+
+def test_json_types():
+    assert_identical({
+        "text": "ASCII, æøå, 😀,  , quotes \" and \\, control \x01\b\f\n\t",
+        "integers": [0, -1, 2 ** 63 - 1, 2 ** 70],
+        "floats": [0.1, 2.5, 1234.567, -0.0],
+        "nested": {"rows": [{"a": None, "b": True, "c": False}], "empty": []}
+    })
+
+def test_values_formatted_by_default():
+    assert_identical({
+        "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5, 678),
+        "date": datetime.date(2024, 1, 2),
+        "time": datetime.time(3, 4, 5),
+        "decimal": decimal.Decimal("1234.50"),
+        "primary_keys": {"id"},
+        "types": [Integer(), Numeric(10, 2)]
+    })
+
+def test_execute_query_response(request_context):
+    from mcp_alchemy.response_formatter import ResponseFormatter
+
+    result = ResponseFormatter(request_context).get_execute_query_response(
+        "SELECT TrackId, Name, UnitPrice, Milliseconds / 1000.0 AS seconds, Composer, "
+        "CAST(Name AS BLOB) AS name_bytes, 'æøå 😀' AS unicode FROM Track ORDER BY TrackId LIMIT 5",
+        None
+    )
+
+    assert "error" not in result, result["error"]
+
+    # Values are formatted for display before, the same type comes out the same in every response
+    assert all(isinstance(value, str) for row in result["rows"] for value in row.values())
+
+    assert_identical(result)
+
+def test_schema_definitions_response(request_context):
+    from mcp_alchemy.response_formatter import ResponseFormatter
+
+    result = ResponseFormatter(request_context).get_schema_list_response(["Track", "Invoice", "Missing"])
+
+    outputs = assert_identical(result)
+
+    assert json.loads(outputs[JSON_BACKEND_JSON, False]) == json.loads(json.dumps(result, default=str))
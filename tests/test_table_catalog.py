@@ -0,0 +1,192 @@
+"""
+Checks the search of table names: ranking (exact, then prefix, then substring matches), limits and totals,
+schema-qualified names and searches while the catalog is refreshed in the background.
+"""
+import asyncio, json, shutil, threading, time
+
+import pytest
+
+from mcp_alchemy.table_catalog import TableCatalog, TableCatalogIndex
+
+CHINOOK_PATH = "tests/Chinook_Sqlite.sqlite"
+
+TABLES = [
+    (None, "order_items"),
+    (None, "orders"),
+    (None, "customer_orders"),
+    (None, "order"),
+    (None, "reorder_log"),
+    ("sales", "orders"),
+    ("sales", "refunds"),
+    ("archive", "orders_2019")
+]
+
+@pytest.fixture
+def request_context(tmp_path, monkeypatch):
+    db_path = tmp_path / "chinook.sqlite"
+    shutil.copyfile(CHINOOK_PATH, db_path)
+
+    monkeypatch.setenv("DB_URL", f"sqlite:///{db_path}")
+
+    from mcp_alchemy.request_context import RequestContext
+
+    return RequestContext.load()
+
+def test_exact_then_prefix_then_substring_matches():
+    names, total = TableCatalogIndex(TABLES).search("order")
+
+    assert names == [
+        # Exact match
+        "order",
+        # Prefixes of the name or of the table name within its schema, shortest first
+        "orders",
+        "order_items",
+        "sales.orders",
+        "archive.orders_2019",
+        # Substrings, shortest first
+        "reorder_log",
+        "customer_orders"
+    ]
+    assert total == 7
+
+def test_search_is_case_insensitive():
+    index = TableCatalogIndex([(None, "Invoice"), (None, "InvoiceLine"), (None, "Customer")])
+
+    assert index.search("INVOICE") == (["Invoice", "InvoiceLine"], 2)
+    assert index.search("voice") == (["Invoice", "InvoiceLine"], 2)
+    assert index.search("oi") == (["Invoice", "InvoiceLine"], 2)
+    assert index.search("missing") == ([], 0)
+
+def test_limit_keeps_the_best_matches_and_counts_all():
+    index = TableCatalogIndex(TABLES)
+
+    assert index.search("order", limit=3) == (["order", "orders", "order_items"], 7)
+    assert index.search("order", limit=0) == ([], 7)
+
+    # Only substring matches, the shortest ones are kept
+    assert index.search("der", limit=2) == (["order", "orders"], 7)
+
+    # An empty query matches every table
+    assert index.search("", limit=2) == (["order", "orders"], len(TABLES))
+
+def test_schema_qualified_names():
+    index = TableCatalogIndex(TABLES)
+
+    assert index.schemas == {"sales", "archive"}
+    assert index.search("sales.") == (["sales.orders", "sales.refunds"], 2)
+    assert index.search("refunds") == (["sales.refunds"], 1)
+
+    catalog = TableCatalog(lambda: TABLES, ttl=60)
+
+    assert catalog.get_table("sales.orders") is None
+
+    catalog.search("orders")
+
+    assert catalog.get_table("sales.orders") == ("sales", "orders")
+    assert catalog.get_table("orders") == (None, "orders")
+
+def test_fuzzy_matches_follow_substring_matches():
+    index = TableCatalogIndex(TABLES)
+
+    assert index.search("ordersx") == ([], 0)
+
+    # Most shared trigrams first, e.g. a typo of orders
+    names, total = index.search("ordersx", fuzzy=True)
+
+    assert names[:2] == ["orders", "order"]
+    assert total == len(names)
+
+    assert index.search("orders", fuzzy=True) == ([
+        "orders",
+        "sales.orders",
+        "archive.orders_2019",
+        "customer_orders",
+        # Fuzzy matches
+        "order",
+        "order_items"
+    ], 6)
+
+def test_search_during_background_refresh():
+    loaded = threading.Event()
+    released = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(time.monotonic())
+
+        if len(loads) > 1:
+            loaded.set()
+            released.wait(5)
+
+            return [*TABLES, (None, "orders_new")]
+
+        return TABLES
+
+    catalog = TableCatalog(loader, ttl=60)
+
+    assert catalog.search("orders_")[0] == ["archive.orders_2019"]
+
+    # Older than the TTL, the next search starts the refresh and does not wait for it
+    catalog._loaded_at = time.monotonic() - 61
+
+    assert catalog.search("orders_")[0] == ["archive.orders_2019"]
+    assert loaded.wait(5)
+
+    # Searches keep using the previous catalog while it loads, without starting another refresh
+    assert catalog.search("orders_")[0] == ["archive.orders_2019"]
+    assert len(loads) == 2
+
+    released.set()
+
+    deadline = time.monotonic() + 5
+
+    while catalog.search("orders_")[0] != ["orders_new", "archive.orders_2019"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert catalog.search("orders_")[0] == ["orders_new", "archive.orders_2019"]
+    assert len(loads) == 2
+
+def test_concurrent_first_searches_load_once():
+    loads = []
+    released = threading.Event()
+
+    def loader():
+        loads.append(True)
+        released.wait(5)
+
+        return TABLES
+
+    catalog = TableCatalog(loader, ttl=60)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(catalog.search("order"))) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.05)
+    released.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert len(loads) == 1
+    assert len(results) == 4 and all(result == results[0] for result in results)
+
+def test_filter_table_names_response(request_context):
+    from mcp_alchemy import server
+
+    result = json.loads(asyncio.run(server.filter_table_names("invoice", limit=1)))
+
+    assert result == {
+        "tables": ["Invoice"],
+        "count": 1,
+        "total_count": 2,
+        "truncated": True,
+        "query": "invoice"
+    }
+
+    result = json.loads(asyncio.run(server.filter_table_names("invoice")))
+
+    assert result["tables"] == ["Invoice", "InvoiceLine"]
+    assert not result["truncated"]
@@ -0,0 +1,236 @@
+"""
+Checks the router of a multi-worker server: routing by tenant and by continuation token, the in-flight requests of
+each worker, restarting workers and the combined metrics.
+"""
+import asyncio, json, threading
+
+import httpx
+import pytest
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+
+from mcp_alchemy import worker_router
+from mcp_alchemy.worker_router import WorkerResponse, WorkerRouter, get_continuation_token, get_worker_args
+
+class RunningProcess:
+    """Stands for the process of a running worker"""
+    pid = 0
+    returncode = None
+
+    def poll(self):
+        return None
+
+class ExitedProcess(RunningProcess):
+    returncode = 1
+
+    def poll(self):
+        return self.returncode
+
+def create_router(workers: int = 2, max_worker_in_flight: int = 2) -> WorkerRouter:
+    router = WorkerRouter(workers, [], max_worker_in_flight)
+
+    for worker in router._workers:
+        worker.process = RunningProcess()
+
+    return router
+
+def create_app(router: WorkerRouter, handler) -> httpx.AsyncClient:
+    """Client of the router's routes, the workers are answered by the handler"""
+    router._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    app = Starlette(routes=[
+        Route("/metrics", router._metrics, methods=["GET"]),
+        Route("/{path:path}", router._forward, methods=["GET", "POST", "DELETE"])
+    ])
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://router")
+
+def create_request(query_string: bytes = b"", headers: list[tuple[bytes, bytes]] = ()) -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/mcp", "query_string": query_string,
+                    "headers": list(headers)})
+
+def fetch_more_message(token: str) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+            "params": {"name": "fetch_more", "arguments": {"continuation_token": token}}}
+
+def test_continuation_token_of_request():
+    body = json.dumps(fetch_more_message("1.abc")).encode()
+    batch = json.dumps([{"jsonrpc": "2.0", "method": "notifications/initialized"}, fetch_more_message("2.abc")])
+
+    assert get_continuation_token(create_request(), body) == "1.abc"
+    assert get_continuation_token(create_request(), batch.encode()) == "2.abc"
+    assert get_continuation_token(create_request(b"continuation_token=3.abc"), b"") == "3.abc"
+    assert get_continuation_token(create_request(headers=[(b"continuation_token", b"4.abc")]), b"") == "4.abc"
+
+    assert get_continuation_token(create_request(), b'{"params": {"arguments": {"query": "SELECT 1"}}}') is None
+    assert get_continuation_token(create_request(), b"continuation_token, not JSON") is None
+
+def test_token_worker():
+    router = create_router(workers=3)
+
+    assert router.get_token_worker("2.abc") is router._workers[2]
+    assert router.get_token_worker("5.abc") is None
+    assert router.get_token_worker("abc") is None
+    assert router.get_token_worker(None) is None
+
+def test_tenant_stays_on_its_worker_until_saturated():
+    router = create_router(workers=4, max_worker_in_flight=2)
+
+    worker = router.select_worker("sqlite:///a.db")
+
+    assert all(router.select_worker("sqlite:///a.db") is worker for _ in range(10))
+
+    worker.in_flight = 2
+
+    assert router.select_worker("sqlite:///a.db") is not worker
+
+    # Every worker is saturated, the tenant's worker still serves it
+    for other_worker in router._workers:
+        other_worker.in_flight = 2
+
+    assert router.select_worker("sqlite:///a.db") is worker
+
+def test_exited_worker_is_not_selected():
+    router = create_router(workers=2)
+
+    worker = router.select_worker("sqlite:///a.db")
+    worker.process = ExitedProcess()
+
+    assert router.select_worker("sqlite:///a.db") is not worker
+
+def test_worker_args_leave_out_router_options():
+    argv = [
+        "--transport", "streamable-http", "--workers", "4", "--host=0.0.0.0", "--port", "3333", "--cursor-ttl", "60"
+    ]
+
+    assert get_worker_args(argv) == ["--transport", "streamable-http", "--cursor-ttl", "60"]
+
+def test_requests_are_forwarded_and_released():
+    router = create_router(workers=3)
+    worker_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        worker_requests.append(request)
+
+        # Every forwarded request is counted while the worker answers it
+        assert sum(worker.in_flight for worker in router._workers) == 1
+
+        # Streamed like the response of a real worker
+        return httpx.Response(200, stream=httpx.ByteStream(json.dumps({"port": request.url.port}).encode()))
+
+    async def main():
+        async with create_app(router, handler) as client:
+            response = await client.post("/mcp", json=fetch_more_message("2.abc"), headers={"x-db-url": "sqlite://"})
+
+        return response
+
+    response = asyncio.run(main())
+
+    assert response.json() == {"port": router._workers[2].port}
+    assert worker_requests[0].headers["x-db-url"] == "sqlite://"
+    assert json.loads(worker_requests[0].content) == fetch_more_message("2.abc")
+    assert [worker.in_flight for worker in router._workers] == [0, 0, 0]
+
+def test_unavailable_worker_is_released():
+    router = create_router(workers=1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    async def main():
+        async with create_app(router, handler) as client:
+            return await client.post("/mcp", json={})
+
+    assert asyncio.run(main()).status_code == 503
+    assert router._workers[0].in_flight == 0
+
+def test_worker_response_is_released_when_sending_fails():
+    released = []
+
+    async def release():
+        released.append(True)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(_):
+        raise RuntimeError("Client disconnected")
+
+    async def main():
+        response = WorkerResponse(httpx.Response(200, stream=httpx.ByteStream(b"{}")), release, headers={})
+
+        with pytest.raises(RuntimeError):
+            await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+
+    asyncio.run(main())
+
+    assert released == [True]
+
+def test_exited_worker_is_restarted_off_the_event_loop(monkeypatch):
+    router = create_router(workers=1)
+    worker = router._workers[0]
+    worker.process = ExitedProcess()
+
+    start_threads = []
+
+    def start(_):
+        start_threads.append(threading.current_thread())
+
+        worker.process = RunningProcess()
+
+    monkeypatch.setattr(worker_router, "WORKER_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(worker, "start", start)
+
+    async def main():
+        supervisor = asyncio.create_task(router._supervise())
+
+        while not start_threads:
+            await asyncio.sleep(0.01)
+
+        supervisor.cancel()
+
+    asyncio.run(main())
+
+    assert start_threads[0] is not threading.main_thread()
+
+def test_metrics_of_workers_are_combined():
+    router = create_router(workers=2)
+    router._workers[1].in_flight = 3
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=(
+            "# HELP mcp_alchemy_requests_total Requests\n"
+            "# TYPE mcp_alchemy_requests_total counter\n"
+            f'mcp_alchemy_requests_total{{tool="execute_query"}} {request.url.port % 2}\n'
+            "# HELP mcp_alchemy_open_cursors Open cursors\n"
+            "# TYPE mcp_alchemy_open_cursors gauge\n"
+            "mcp_alchemy_open_cursors 0\n"
+        ))
+
+    async def main():
+        async with create_app(router, handler) as client:
+            return await client.get("/metrics")
+
+    lines = asyncio.run(main()).text.splitlines()
+
+    assert lines[:4] == [
+        "# HELP mcp_alchemy_worker_in_flight_requests Requests forwarded to the worker and not answered yet",
+        "# TYPE mcp_alchemy_worker_in_flight_requests gauge",
+        'mcp_alchemy_worker_in_flight_requests{worker="0"} 0',
+        'mcp_alchemy_worker_in_flight_requests{worker="1"} 3'
+    ]
+
+    # The samples of a metric follow its HELP / TYPE lines, each line once
+    assert lines[4:6] == ["# HELP mcp_alchemy_requests_total Requests", "# TYPE mcp_alchemy_requests_total counter"]
+    assert [line.split(" ")[0] for line in lines[6:8]] == [
+        'mcp_alchemy_requests_total{worker="0",tool="execute_query"}',
+        'mcp_alchemy_requests_total{worker="1",tool="execute_query"}'
+    ]
+    assert lines[8:] == [
+        "# HELP mcp_alchemy_open_cursors Open cursors",
+        "# TYPE mcp_alchemy_open_cursors gauge",
+        'mcp_alchemy_open_cursors{worker="0"} 0',
+        'mcp_alchemy_open_cursors{worker="1"} 0'
+    ]